@@ -0,0 +1,633 @@
+"""
+Reproducible benchmarks for the backend hot paths.
+
+Runs offline: every `DATASET_SPECS` loader is swapped for a seeded synthetic
+dataset shaped like the real one (MNIST-sized images, LFW-sized faces, a
+20 Newsgroups-sized Zipfian word-count matrix), so timings depend only on the
+code and the machine. Each case reports wall-clock seconds over `--repeats`
+timed calls (after one untimed warm-up call, except for cold loads), the
+encoded payload size, and the tracemalloc peak of one extra traced call:
+  get_dataset.cold.<dataset>        first `get_dataset` after clearing the caches
+  get_dataset.cold-store.<dataset>  the same, reading the on-disk store (temp dir)
+  sample_dataset.<dataset>.<count>  in-process sampling + JSON encoding size
+  http.samples.* / http.matrix.*    end-to-end requests through the ASGI app
+  import.main                       a fresh interpreter running `import main`
+
+Results are written as JSON (sorted case names, stable keys) so runs from two
+commits can be diffed directly:
+  python -m benchmarks --output before.json              (from backend/)
+  python -m backend.benchmarks --scale 0.1 --repeats 3   (from repo root, quick run)
+
+`--import-budget [SECONDS]` skips the suite and only checks startup: `import main`
+must finish within the budget and must not load `LAZY_MODULES` (exit status 1
+otherwise), so a top-level scikit-learn import cannot creep back in. The backend's
+render.yaml `buildCommand` runs it, so such a regression fails the deploy.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from contextlib import contextmanager
+import dataclasses
+from datetime import datetime, timezone
+import itertools
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterator, Sequence
+from urllib.parse import urlencode
+
+import numpy as np
+from scipy import sparse
+
+try:
+    from . import datasets
+    from . import main as api
+except ImportError:
+    # Allow `python -m benchmarks` when running from backend/.
+    import datasets  # type: ignore[no-redef]
+    import main as api  # type: ignore[no-redef]
+
+logger = logging.getLogger(__name__)
+
+# Bump when cases are renamed or their parameters change, so stale result files
+# are not compared against new ones.
+BENCHMARK_FORMAT_VERSION = 1
+BENCHMARK_SEED = 0
+DEFAULT_REPEATS = 5
+
+# Synthetic dataset shapes at --scale 1 (the real datasets' row counts and sizes).
+SYNTHETIC_IMAGE_ROWS = {"mnist": 70_000, "fashion-mnist": 70_000, "faces-in-the-wild": 13_233}
+SYNTHETIC_IMAGE_SHAPES = {
+    "mnist": (28, 28),
+    "fashion-mnist": (28, 28),
+    "faces-in-the-wild": (125, 94),
+}
+SYNTHETIC_IMAGE_LABELS = {"mnist": 10, "fashion-mnist": 10, "faces-in-the-wild": 5_749}
+SYNTHETIC_TEXT_ROWS = 18_846
+SYNTHETIC_TEXT_VOCAB = 9_999
+SYNTHETIC_TEXT_LABELS = 20
+# Mean distinct words per document in the real vectorized 20 Newsgroups matrix.
+SYNTHETIC_TEXT_WORDS_PER_ROW = 90
+
+IMAGE_SAMPLE_COUNTS = (1, 24, 64)
+TEXT_SAMPLE_COUNTS = (1, 64, 256)
+MATRIX_SIZES = (3, 32)
+# Random symmetric graph adjacency for the sparse matrix cases (~4 nonzeros per row).
+SPARSE_GRAPH_NODES = 10_000
+SPARSE_GRAPH_EDGES = 20_000
+# Top-level packages `import main` must not load: scikit-learn is imported by the
+# dataset fetchers only, so servers reading the dataset store never pay for it.
+LAZY_MODULES = ("sklearn",)
+# Default `--import-budget`: seconds for `import main` in a fresh interpreter (best of
+# IMPORT_BUDGET_ATTEMPTS, so a cold disk cache does not fail the check).
+IMPORT_BUDGET_SECONDS = 1.5
+IMPORT_BUDGET_ATTEMPTS = 3
+# Text requests that skip the (large, separately cached) vocab payload.
+TEXT_QUERY = {"dataset": "20newsgroups", "count": 256, "includeVocab": "false"}
+
+
+@dataclasses.dataclass(frozen=True)
+class BenchmarkCase:
+    name: str
+    run: Callable[[int], int | None]
+    setup: Callable[[], None] | None = None
+    warm_up: bool = True
+
+
+def run_benchmarks(
+    scale: float = 1.0,
+    repeats: int = DEFAULT_REPEATS,
+    only: Sequence[str] | None = None,
+) -> dict:
+    """
+    Run every benchmark case against synthetic datasets.
+
+    @param scale: Multiplier for synthetic dataset row counts (e.g. 0.1 for a quick run).
+    @param repeats: Timed calls per case.
+    @param only: Optional case-name prefixes to run; defaults to every case.
+    @returns: JSON-ready results: `meta` (environment, parameters) and one entry per case
+        with `seconds` (min/median/mean/max), `payloadBytes` and `peakTracedBytes`.
+    """
+    results = []
+    with _synthetic_datasets(scale), tempfile.TemporaryDirectory() as store_root:
+        for case in _benchmark_cases(Path(store_root)):
+            if only and not any(case.name.startswith(prefix) for prefix in only):
+                continue
+            logger.info("%s", case.name)
+            results.append(_run_case(case, repeats))
+        _reset_dataset_caches()
+
+    return {
+        "meta": {
+            "formatVersion": BENCHMARK_FORMAT_VERSION,
+            "createdAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "scale": scale,
+            "repeats": repeats,
+            "maxRssBytes": datasets._max_rss_bytes(),
+        },
+        "results": sorted(results, key=lambda result: result["name"]),
+    }
+
+
+def _benchmark_cases(store_root: Path) -> Iterator[BenchmarkCase]:
+    client = _ASGIClient(api.app)
+
+    for dataset in datasets.DATASET_SPECS:
+        yield BenchmarkCase(
+            name=f"get_dataset.cold.{dataset}",
+            setup=_reset_dataset_caches,
+            run=lambda _, dataset=dataset: _load_dataset(dataset),
+            warm_up=False,
+        )
+    for dataset in datasets.DATASET_SPECS:
+        # The warm-up load misses the (empty) store and writes it; timed loads read it back.
+        yield BenchmarkCase(
+            name=f"get_dataset.cold-store.{dataset}",
+            setup=_reset_dataset_caches,
+            run=lambda _, dataset=dataset: _load_dataset(dataset, store_root),
+        )
+
+    for dataset, counts in (("mnist", IMAGE_SAMPLE_COUNTS), ("20newsgroups", TEXT_SAMPLE_COUNTS)):
+        for count in counts:
+            yield BenchmarkCase(
+                name=f"sample_dataset.{dataset}.{count:03d}",
+                run=lambda seed, dataset=dataset, count=count: len(
+                    api._encode_json(datasets.sample_dataset(count, dataset=dataset, seed=seed))
+                ),
+            )
+
+    frame_headers = {"accept": api.FRAME_MEDIA_TYPE}
+    http_samples = (
+        ("mnist.json", {"dataset": "mnist", "count": 64}, None),
+        ("mnist.frame", {"dataset": "mnist", "count": 64}, frame_headers),
+        ("20newsgroups.json", {"dataset": "20newsgroups", "count": 256}, None),
+        ("20newsgroups.columns", {**TEXT_QUERY, "textLayout": "columns"}, None),
+        ("20newsgroups.tfidf", {**TEXT_QUERY, "weighting": "tfidf"}, None),
+    )
+    for name, query, headers in http_samples:
+        # Unseeded requests bypass the seeded response cache, so they measure sampling.
+        yield BenchmarkCase(
+            name=f"http.samples.{name}",
+            run=lambda _, query=query, headers=headers: client.get(
+                "/api/v1/datasets/samples", query, headers
+            ),
+        )
+    yield BenchmarkCase(
+        name="http.samples.mnist.json.cached",
+        run=lambda _: client.get(
+            "/api/v1/datasets/samples", {"dataset": "mnist", "count": 64, "seed": 1}
+        ),
+    )
+
+    rng = np.random.default_rng(BENCHMARK_SEED)
+    for size in MATRIX_SIZES:
+        matrix = rng.standard_normal((size, size))
+        vector = rng.standard_normal(size)
+        # P D P^-1 has real eigenvalues but no structure, so it takes the general solver.
+        general = matrix @ np.diag(np.arange(1.0, size + 1)) @ np.linalg.inv(matrix)
+        symmetric = matrix + matrix.T
+        yield BenchmarkCase(
+            name=f"http.matrix.apply.{size:02d}",
+            run=lambda _, body=_json_body({"matrix": matrix, "vector": vector}): client.post(
+                "/api/v1/matrix/apply", body
+            ),
+        )
+        for kind, source in (("general", general), ("symmetric", symmetric)):
+            body = _json_body({"matrix": source})
+            # Clearing the eig cache before each call measures the solver, not the cache.
+            yield BenchmarkCase(
+                name=f"http.matrix.eig.{kind}.{size:02d}",
+                setup=api._eig_cache.clear,
+                run=lambda _, body=body: client.post("/api/v1/matrix/eig", body),
+            )
+            yield BenchmarkCase(
+                name=f"http.matrix.eig.{kind}.{size:02d}.cached",
+                run=lambda _, body=body: client.post("/api/v1/matrix/eig", body),
+            )
+        # Factorize once (cleared registry), then solve against the stored LU factors;
+        # the solve case re-registers the handle untimed in case it was evicted.
+        factorize_body = json.dumps(
+            {"matrix": matrix.tolist(), "kind": "lu", "includeFactors": False},
+            separators=(",", ":"),
+        ).encode("utf-8")
+        solve_body = json.dumps(
+            {"handle": f"lu-{api.array_digest(matrix)}", "vector": vector.tolist()},
+            separators=(",", ":"),
+        ).encode("utf-8")
+        yield BenchmarkCase(
+            name=f"http.matrix.factorize.lu.{size:02d}",
+            setup=api._factorizations.clear,
+            run=lambda _, body=factorize_body: client.post("/api/v1/matrix/factorize", body),
+        )
+        yield BenchmarkCase(
+            name=f"http.matrix.solve.lu.{size:02d}",
+            setup=lambda body=factorize_body: client.post("/api/v1/matrix/factorize", body),
+            run=lambda _, body=solve_body: client.post("/api/v1/matrix/solve", body),
+        )
+
+    edges = rng.integers(0, SPARSE_GRAPH_NODES, size=(2, SPARSE_GRAPH_EDGES))
+    graph = sparse.coo_matrix(
+        (np.ones(SPARSE_GRAPH_EDGES), (edges[0], edges[1])),
+        shape=(SPARSE_GRAPH_NODES, SPARSE_GRAPH_NODES),
+    ).tocsr()
+    graph = (graph + graph.T).tocoo()
+    sparse_matrix = {
+        "format": "coo",
+        "shape": list(graph.shape),
+        "row": graph.row.tolist(),
+        "col": graph.col.tolist(),
+        "data": graph.data.tolist(),
+    }
+    apply_body = json.dumps(
+        {"matrix": sparse_matrix, "vector": np.ones(SPARSE_GRAPH_NODES).tolist()},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    eig_body = json.dumps({"matrix": sparse_matrix, "k": 6}, separators=(",", ":")).encode("utf-8")
+    yield BenchmarkCase(
+        name=f"http.matrix.apply.sparse.{SPARSE_GRAPH_NODES}",
+        run=lambda _: client.post("/api/v1/matrix/apply", apply_body),
+    )
+    yield BenchmarkCase(
+        name=f"http.matrix.eig.sparse.{SPARSE_GRAPH_NODES}",
+        run=lambda _: client.post("/api/v1/matrix/eig/sparse", eig_body),
+    )
+
+    yield BenchmarkCase(name="import.main", run=_import_main)
+
+
+def measure_import() -> dict:
+    """
+    Import the API module in a fresh interpreter (from backend/, like `uvicorn main:app`).
+
+    @returns: `seconds` spent importing `main` and `lazyModulesLoaded`, the
+        `LAZY_MODULES` packages the import pulled in.
+    @throws subprocess.CalledProcessError: The import failed.
+    """
+    probe = (
+        "import json, sys, time\n"
+        "started = time.perf_counter()\n"
+        "import main\n"
+        "seconds = time.perf_counter() - started\n"
+        "packages = {name.partition('.')[0] for name in sys.modules}\n"
+        f"lazy = sorted(packages & set({LAZY_MODULES!r}))\n"
+        "print(json.dumps({'seconds': seconds, 'lazyModulesLoaded': lazy}))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=Path(__file__).resolve().parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def check_import_budget(budget: float) -> int:
+    """
+    Check that `import main` stays within `budget` seconds and loads no `LAZY_MODULES`.
+
+    @param budget: Allowed seconds (best of `IMPORT_BUDGET_ATTEMPTS` fresh imports).
+    @returns: Process exit code (0 when within budget).
+    """
+    measurements = [measure_import() for _ in range(IMPORT_BUDGET_ATTEMPTS)]
+    seconds = min(measurement["seconds"] for measurement in measurements)
+    loaded = sorted({name for item in measurements for name in item["lazyModulesLoaded"]})
+    logger.info("import main: %.3fs (budget %.3fs)", seconds, budget)
+    if loaded:
+        logger.error("import main loaded %s; import it where it is used", ", ".join(loaded))
+    if seconds > budget:
+        logger.error("import main exceeded its budget by %.3fs", seconds - budget)
+    return 1 if loaded or seconds > budget else 0
+
+
+def _run_case(case: BenchmarkCase, repeats: int) -> dict:
+    """
+    Time `repeats` calls of a case, then measure one more call under tracemalloc.
+
+    Tracing slows allocation-heavy code several-fold, so it never overlaps the
+    timed calls. `setup` runs untimed before every call.
+    """
+    if case.warm_up:
+        _call(case, 0)
+    seconds = []
+    payload_bytes = None
+    for repeat in range(repeats):
+        started, payload_bytes = _call(case, repeat + 1)
+        seconds.append(time.perf_counter() - started)
+
+    if case.setup is not None:
+        case.setup()
+    tracemalloc.start()
+    try:
+        case.run(repeats + 1)
+        peak_traced = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "name": case.name,
+        "seconds": {
+            "min": min(seconds),
+            "median": statistics.median(seconds),
+            "mean": statistics.fmean(seconds),
+            "max": max(seconds),
+        },
+        "payloadBytes": payload_bytes,
+        "peakTracedBytes": peak_traced,
+    }
+
+
+def _import_main(_: int) -> None:
+    measure_import()
+
+
+def _call(case: BenchmarkCase, seed: int) -> tuple[float, int | None]:
+    if case.setup is not None:
+        case.setup()
+    started = time.perf_counter()
+    return started, case.run(seed)
+
+
+class _ASGIClient:
+    """
+    Minimal in-process HTTP client that drives the ASGI app on one event loop.
+
+    No sockets or extra dependencies; requests go through the same middleware,
+    dependency injection and threadpool hand-off as under uvicorn.
+    """
+
+    def __init__(self, app) -> None:
+        self._app = app
+        self._loop = asyncio.new_event_loop()
+
+    def get(self, path: str, query: dict | None = None, headers: dict | None = None) -> int:
+        return self._request("GET", path, urlencode(query or {}), headers or {}, b"")
+
+    def post(self, path: str, body: bytes, headers: dict | None = None) -> int:
+        headers = {"content-type": "application/json", **(headers or {})}
+        return self._request("POST", path, "", headers, body)
+
+    def _request(self, method: str, path: str, query: str, headers: dict, body: bytes) -> int:
+        """
+        @returns: Response body size in bytes.
+        @throws RuntimeError: When the app answers with a non-2xx status.
+        """
+        headers = {**headers, "content-length": str(len(body))}
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode("ascii"),
+            "root_path": "",
+            "query_string": query.encode("ascii"),
+            "headers": [
+                (name.encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("benchmark", 80),
+        }
+        pending = [{"type": "http.request", "body": body, "more_body": False}]
+        status = 0
+        size = 0
+
+        async def receive() -> dict:
+            if pending:
+                return pending.pop()
+            # Never report a disconnect; the app cancels this wait when it finishes.
+            await asyncio.Event().wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+
+        self._loop.run_until_complete(self._app(scope, receive, send))
+        if not 200 <= status < 300:
+            raise RuntimeError(f"{method} {path}?{query} returned HTTP {status}")
+        return size
+
+
+def _json_body(payload: dict) -> bytes:
+    return json.dumps(
+        {key: value.tolist() for key, value in payload.items()}, separators=(",", ":")
+    ).encode("utf-8")
+
+
+@contextmanager
+def _synthetic_datasets(scale: float) -> Iterator[None]:
+    """
+    Swap every dataset loader for a synthetic one and keep the real store untouched.
+    """
+    original_specs = dict(datasets.DATASET_SPECS)
+    original_store = datasets.DATASET_STORE_ENABLED, datasets.DATASET_MMAP_ENABLED
+    for source, spec in original_specs.items():
+        raw_dataset = _synthetic_dataset(spec, scale)
+        datasets.DATASET_SPECS[source] = dataclasses.replace(
+            spec, loader=lambda raw_dataset=raw_dataset: _copy_raw_dataset(raw_dataset)
+        )
+    datasets.DATASET_STORE_ENABLED = datasets.DATASET_MMAP_ENABLED = False
+    _reset_dataset_caches()
+    try:
+        yield
+    finally:
+        datasets.DATASET_SPECS.update(original_specs)
+        datasets.DATASET_STORE_ENABLED, datasets.DATASET_MMAP_ENABLED = original_store
+
+
+@contextmanager
+def _dataset_store(root: Path) -> Iterator[None]:
+    original = datasets.DATASET_STORE_ENABLED, datasets.DATASET_STORE_ROOT
+    datasets.DATASET_STORE_ENABLED, datasets.DATASET_STORE_ROOT = True, root
+    try:
+        yield
+    finally:
+        datasets.DATASET_STORE_ENABLED, datasets.DATASET_STORE_ROOT = original
+
+
+def _load_dataset(dataset: str, store_root: Path | None = None) -> None:
+    if store_root is None:
+        datasets.get_dataset(dataset)
+        return
+    with _dataset_store(store_root):
+        datasets.get_dataset(dataset)
+
+
+def _reset_dataset_caches() -> None:
+    # Views are dropped before raw datasets so derived caches cannot outlive them.
+    for cache in (
+        datasets._split_dataset_cache,
+        datasets._split_pca_cache,
+        datasets._split_neighbor_cache,
+        datasets._split_class_stats_cache,
+        datasets._split_weighting_cache,
+        datasets._raw_dataset_cache,
+        datasets._dataset_load_stats,
+        datasets._dataset_versions,
+    ):
+        cache.clear()
+    api._sample_response_cache.clear()
+    api._eig_cache.clear()
+
+
+def _copy_raw_dataset(raw_dataset: datasets.RawDataset) -> datasets.RawDataset:
+    # Re-run validation/vocab hashing like a real loader, without regenerating data.
+    if raw_dataset.modality == "image":
+        return datasets._prepare_image_dataset(
+            source=raw_dataset.source,
+            display_name=raw_dataset.display_name,
+            images=raw_dataset.images,
+            labels=raw_dataset.labels,
+            label_names=raw_dataset.label_names,
+            supports_train_test=raw_dataset.supports_train_test,
+        )
+    return datasets._prepare_text_dataset(
+        source=raw_dataset.source,
+        display_name=raw_dataset.display_name,
+        texts=raw_dataset.texts,
+        labels=raw_dataset.labels,
+        label_names=raw_dataset.label_names,
+        counts=raw_dataset.counts,
+        vocab=raw_dataset.vocab,
+        supports_train_test=raw_dataset.supports_train_test,
+    )
+
+
+def _synthetic_dataset(spec: datasets.DatasetSpec, scale: float) -> datasets.RawDataset:
+    rng = np.random.default_rng(BENCHMARK_SEED)
+    if spec.modality == "text":
+        return _synthetic_text_dataset(spec, scale, rng)
+
+    label_count = SYNTHETIC_IMAGE_LABELS[spec.source]
+    rows = max(int(SYNTHETIC_IMAGE_ROWS[spec.source] * scale), 2 * min(label_count, 64))
+    height, width = SYNTHETIC_IMAGE_SHAPES[spec.source]
+    labels = rng.integers(0, label_count, rows)
+    # A few prototypes plus uint8 noise keep generation cheap while giving PCA,
+    # neighbour search and class stats real structure to work with.
+    prototypes = rng.integers(0, 192, (min(label_count, 64), height, width), dtype=np.uint8)
+    images = prototypes[labels % prototypes.shape[0]]
+    images += rng.integers(0, 64, images.shape, dtype=np.uint8)
+    label_names = (
+        tuple(f"person {label}" for label in range(label_count)) if label_count > 10 else None
+    )
+    return datasets._prepare_image_dataset(
+        source=spec.source,
+        display_name=spec.display_name,
+        images=images,
+        labels=labels,
+        label_names=label_names,
+        supports_train_test=spec.supports_train_test,
+    )
+
+
+def _synthetic_text_dataset(
+    spec: datasets.DatasetSpec, scale: float, rng: np.random.Generator
+) -> datasets.RawDataset:
+    rows = max(int(SYNTHETIC_TEXT_ROWS * scale), 2 * SYNTHETIC_TEXT_LABELS)
+    # Consonant-vowel syllables pass the vocab token filter; sorted like CountVectorizer's.
+    syllables = [c + v for c in "bcdfghjklmnprstvwz" for v in "aeiou"]
+    vocab = tuple(
+        "".join(parts)
+        for parts in itertools.islice(itertools.product(syllables, repeat=3), SYNTHETIC_TEXT_VOCAB)
+    )
+    # Zipfian word frequencies and geometric per-word counts, like real documents.
+    lengths = rng.poisson(SYNTHETIC_TEXT_WORDS_PER_ROW, rows) + 1
+    frequencies = 1.0 / np.arange(1, len(vocab) + 1)
+    columns = rng.choice(len(vocab), size=int(lengths.sum()), p=frequencies / frequencies.sum())
+    row_ids = np.repeat(np.arange(rows), lengths)
+    values = rng.geometric(0.6, columns.shape[0]).astype(np.int64)
+    counts = sparse.coo_matrix((values, (row_ids, columns)), shape=(rows, len(vocab))).tocsr()
+    counts.sum_duplicates()
+
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    texts = tuple(
+        "Subject: " + " ".join(vocab[column] for column in columns[start:stop]) + "."
+        for start, stop in zip(offsets[:-1], offsets[1:])
+    )
+    return datasets._prepare_text_dataset(
+        source=spec.source,
+        display_name=spec.display_name,
+        texts=texts,
+        labels=rng.integers(0, SYNTHETIC_TEXT_LABELS, rows),
+        label_names=tuple(f"group.{label}" for label in range(SYNTHETIC_TEXT_LABELS)),
+        counts=counts,
+        vocab=vocab,
+        supports_train_test=spec.supports_train_test,
+    )
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    Run the benchmark suite and write its JSON results.
+
+    @param argv: Optional CLI arguments.
+    @returns: Process exit code.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the backend hot paths offline.")
+    parser.add_argument("--output", type=Path, help="write JSON results here (default: stdout)")
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="synthetic dataset size multiplier"
+    )
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="timed calls per case")
+    parser.add_argument(
+        "--only", nargs="*", default=None, help="case-name prefixes to run (e.g. http.matrix)"
+    )
+    parser.add_argument(
+        "--import-budget",
+        type=float,
+        nargs="?",
+        const=IMPORT_BUDGET_SECONDS,
+        metavar="SECONDS",
+        help=f"only check `import main` time (default budget {IMPORT_BUDGET_SECONDS}s)",
+    )
+    args = parser.parse_args(argv)
+    if args.scale <= 0 or args.repeats < 1:
+        parser.error("--scale must be positive and --repeats at least 1")
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+    if args.import_budget is not None:
+        return check_import_budget(args.import_budget)
+    results = run_benchmarks(scale=args.scale, repeats=args.repeats, only=args.only)
+    encoded = json.dumps(results, indent=2, sort_keys=True) + "\n"
+    if args.output is None:
+        sys.stdout.write(encoded)
+    else:
+        args.output.write_text(encoded, encoding="utf-8")
+        logger.info("wrote %s", args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,143 @@
+"""
+Small in-process caches shared by API routes.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import threading
+import time
+from typing import Callable, Generic, Hashable, TypeVar
+
+import numpy as np
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Thread-safe LRU cache bounded by entry count and total byte size.
+
+    Entry sizes come from `sizeof`, so callers decide what "bytes" means for
+    their values (e.g. the length of an encoded response body).
+
+    With `ttl_seconds`, entries also expire that long after their last use.
+    Recency order is then expiry order, so expired entries are always the
+    least recently used ones and are dropped from that end.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        sizeof: Callable[[V], int],
+        ttl_seconds: float | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._sizeof = sizeof
+        # key -> (value, size, last use on the monotonic clock)
+        self._entries: OrderedDict[K, tuple[V, int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: K) -> V | None:
+        """
+        Look up a value and mark it most recently used.
+
+        @param key: Cache key.
+        @returns: Cached value, or None on a miss.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries[key] = (entry[0], entry[1], now)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: K, value: V) -> None:
+        """
+        Store a value, evicting least recently used entries to respect both bounds.
+
+        Values larger than `max_bytes` on their own are not cached.
+
+        @param key: Cache key.
+        @param value: Value to store.
+        """
+        size = self._sizeof(value)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size, now)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        Snapshot cache occupancy and hit/miss counters.
+
+        @returns: Dict with `entries`, `bytes`, `maxEntries`, `maxBytes`, `hits`, `misses`,
+            `evictions` and `expirations`.
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "maxEntries": self.max_entries,
+                "maxBytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _expire(self, now: float) -> None:
+        if self.ttl_seconds is None:
+            return
+        while self._entries:
+            key, (_, size, last_used) = next(iter(self._entries.items()))
+            if now - last_used < self.ttl_seconds:
+                return
+            del self._entries[key]
+            self._bytes -= size
+            self.expirations += 1
+
+
+def array_digest(array: np.ndarray) -> str:
+    """
+    Content hash of an array's dtype, shape and bytes.
+
+    @param array: Array to hash (made contiguous if needed).
+    @returns: 32-character hex digest; equal arrays always hash equal.
+    """
+    contiguous = np.ascontiguousarray(array)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{contiguous.dtype.str}:{contiguous.shape}".encode())
+    digest.update(memoryview(contiguous).cast("B"))
+    return digest.hexdigest()
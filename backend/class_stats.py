@@ -0,0 +1,90 @@
+"""
+Per-label mean and variance of dataset rows in one streaming pass.
+
+Rows are visited once, in blocks. Each block's rows are summed per label
+with a sparse one-hot membership matrix (labels x rows), so the accumulators
+are just two (labels, d) float64 arrays:
+  dense   `CLASS_STATS_CHUNK_ROWS` uint8 rows are converted to float64 at a time
+  sparse  CSR counts (and their squares) are reduced with sparse products, never densified
+
+Variances are population variances, E[x^2] - E[x]^2, clipped at zero.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+
+# Rows converted to float64 per block for dense inputs.
+CLASS_STATS_CHUNK_ROWS = 4096
+
+
+@dataclass(frozen=True)
+class ClassStats:
+    label_ids: np.ndarray
+    counts: np.ndarray
+    means: np.ndarray
+    variances: np.ndarray
+
+
+def class_statistics(
+    matrix: np.ndarray | sparse.csr_matrix,
+    labels: np.ndarray,
+    label_ids: np.ndarray,
+    rows: np.ndarray | None = None,
+) -> ClassStats:
+    """
+    Compute per-label row counts, means and variances.
+
+    @param matrix: 2D (n, d) dense rows (any numeric dtype, memmaps fine) or CSR rows.
+    @param labels: Non-negative int label per row (n,).
+    @param label_ids: Sorted label ids to report; rows with other labels are skipped.
+    @param rows: Optional sorted subset of rows to visit (e.g. the rows of `label_ids`
+        from a label index); defaults to every row.
+    @returns: `ClassStats` with int64 `counts` (k,) and float32 `means`/`variances` (k, d),
+        one row per entry of `label_ids` (zeros for labels without rows).
+    """
+    positions = np.full(int(max(labels.max(initial=0), label_ids.max(initial=0))) + 1, -1)
+    positions[label_ids] = np.arange(label_ids.shape[0])
+    label_count, columns = label_ids.shape[0], matrix.shape[1]
+    sums = np.zeros((label_count, columns), dtype=np.float64)
+    squares = np.zeros((label_count, columns), dtype=np.float64)
+    counts = np.zeros(label_count, dtype=np.int64)
+
+    if rows is None:
+        rows = np.arange(matrix.shape[0])
+    for start in range(0, rows.shape[0], CLASS_STATS_CHUNK_ROWS):
+        block_rows = rows[start : start + CLASS_STATS_CHUNK_ROWS]
+        block_positions = positions[labels[block_rows]]
+        kept = block_positions >= 0
+        block_rows, block_positions = block_rows[kept], block_positions[kept]
+        if block_rows.shape[0] == 0:
+            continue
+        membership = sparse.csr_matrix(
+            (
+                np.ones(block_rows.shape[0], dtype=np.float64),
+                (block_positions, np.arange(block_rows.shape[0])),
+            ),
+            shape=(label_count, block_rows.shape[0]),
+        )
+        if sparse.issparse(matrix):
+            block = matrix[block_rows].astype(np.float64)
+            sums += (membership @ block).toarray()
+            squares += (membership @ block.multiply(block)).toarray()
+        else:
+            block = np.asarray(matrix[block_rows], dtype=np.float64)
+            sums += membership @ block
+            squares += membership @ (block * block)
+        counts += np.bincount(block_positions, minlength=label_count)
+
+    divisor = np.maximum(counts, 1)[:, np.newaxis]
+    means = sums / divisor
+    variances = np.maximum(squares / divisor - means * means, 0.0)
+    return ClassStats(
+        label_ids=label_ids,
+        counts=counts,
+        means=means.astype(np.float32),
+        variances=variances.astype(np.float32),
+    )
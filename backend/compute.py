@@ -0,0 +1,368 @@
+"""
+Bounded process pool for the matrix endpoints' heavy linear algebra.
+
+Every matrix job comes with an estimated cost in flops (see `apply_cost`,
+`eig_cost`, `factorization_cost` and their sparse variants), and the cost decides
+where it runs:
+  cost <= MATRIX_INLINE_MAX_COST  inline in the request thread; pickling and
+                                  IPC would cost more than the math
+  cost <= MATRIX_MAX_COST         in a worker process of a `spawn` pool, so a
+                                  long LAPACK call never holds a request thread's
+                                  CPU or the interpreter
+  above                           rejected (413) before any work is done
+
+Admission control bounds the jobs queued or running in the pool to
+`MATRIX_MAX_PENDING_JOBS`; beyond that requests get 503 with `Retry-After`
+instead of piling up threads. Each job has a deadline
+(`MATRIX_JOB_TIMEOUT_SECONDS`, queue time included). A job still running at
+its deadline cannot be interrupted inside LAPACK, so the pool's processes are
+terminated and a fresh pool is started on the next job. Every other job running
+or queued in the old pool fails with 503 and can be retried.
+
+Large JSON bodies are decoded in the pool too (`decode_matrix_json`, operation
+`"decode"`): decoding a big matrix holds the interpreter for longer than most of
+the math, and would otherwise stall every other request. Decodes are counted
+apart from matrix jobs, since nearly every request makes one.
+
+`MATRIX_POOL_WORKERS=0` disables the pool: heavy jobs then run inline, still
+subject to the cost cap.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from typing import Callable, TypeVar
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Worker processes for heavy jobs (0 runs everything inline).
+MATRIX_POOL_WORKERS = int(os.getenv("MATRIX_POOL_WORKERS", "") or min(2, os.cpu_count() or 1))
+# Jobs allowed in the pool at once (running + queued); more are rejected with 503.
+MATRIX_MAX_PENDING_JOBS = int(
+    os.getenv("MATRIX_MAX_PENDING_JOBS", "") or max(2 * MATRIX_POOL_WORKERS, 1)
+)
+# Long enough for a `MATRIX_MAX_COST` job queued behind another one to finish, so
+# anything admitted by cost is expected to complete; 504 is for a stalled worker.
+MATRIX_JOB_TIMEOUT_SECONDS = float(os.getenv("MATRIX_JOB_TIMEOUT_SECONDS", "") or 30.0)
+# Estimated flops; ~2M is a 60x60 general eig, well under a millisecond of work.
+MATRIX_INLINE_MAX_COST = float(os.getenv("MATRIX_INLINE_MAX_COST", "") or 2e6)
+# ~1e11 is a 2150x2150 general eig, about 12s on one core (2000x2000 takes ~9s); bigger
+# jobs get 413 up front rather than a 504 after holding a worker. Lower it together
+# with MATRIX_JOB_TIMEOUT_SECONDS on slower hosts.
+MATRIX_MAX_COST = float(os.getenv("MATRIX_MAX_COST", "") or 1e11)
+# Seconds clients are asked to wait after an admission rejection.
+MATRIX_RETRY_AFTER_SECONDS = 1
+# Flops per n^3 of a dense eigendecomposition (Hessenberg reduction + QR sweeps +
+# eigenvectors); the symmetric path is cheaper, but inputs are costed before classification.
+EIG_FLOPS_PER_CUBE = 10.0
+# Flops per rows * columns * min(rows, columns) of each factorization (LU
+# ~2/3 n^3; Householder QR with Q formed ~4 m n^2; thin SVD ~4 m n^2 + 8 n^3).
+FACTORIZATION_FLOPS_PER_CUBE = {"lu": 2.0 / 3.0, "qr": 4.0, "svd": 12.0}
+# ARPACK restarts assumed per sparse eigenproblem; each sweeps a Krylov basis of
+# min(n, max(2k + 1, 20)) vectors (scipy's default size).
+SPARSE_EIG_RESTARTS = 10
+# Decoding JSON numbers runs at roughly 8 flop-equivalents per byte, so bodies over
+# ~256 KB (tens of thousands of numbers) are decoded in a worker.
+DECODE_FLOPS_PER_BYTE = 8.0
+
+
+class ComputeLimitError(Exception):
+    """
+    A matrix job was refused or abandoned; carries the HTTP status to report.
+    """
+
+    def __init__(self, status_code: int, detail: str, retry_after: int | None = None) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+_pool: ProcessPoolExecutor | None = None
+# Guards `_pool` creation/replacement and the job counters below.
+_pool_lock = threading.Lock()
+_pending_jobs = 0
+_job_counts = {"inline": 0, "offloaded": 0, "rejected": 0, "timedOut": 0, "failed": 0}
+# The same outcomes for `decode_matrix_json` runs (operation "decode").
+_decode_counts = dict.fromkeys(_job_counts, 0)
+
+
+def apply_cost(rows: int, columns: int, vectors: int = 1) -> float:
+    """
+    @returns: Estimated flops of `vectors` matrix-vector products with a (rows, columns) matrix.
+    """
+    return 2.0 * rows * columns * vectors
+
+
+def eig_cost(size: int, count: int = 1) -> float:
+    """
+    @returns: Estimated flops of `count` eigendecompositions of (size, size) matrices.
+    """
+    return EIG_FLOPS_PER_CUBE * float(size) ** 3 * count
+
+
+def sparse_apply_cost(nonzeros: int, vectors: int = 1) -> float:
+    """
+    @returns: Estimated flops of `vectors` products with a sparse matrix holding `nonzeros` entries.
+    """
+    return 2.0 * nonzeros * vectors
+
+
+def sparse_eig_cost(size: int, nonzeros: int, count: int) -> float:
+    """
+    @returns: Estimated flops of `count` eigenpairs of a sparse (size, size) matrix with ARPACK:
+        per basis vector one sparse product plus orthogonalization against the basis.
+    """
+    basis = min(size, max(2 * count + 1, 20))
+    return SPARSE_EIG_RESTARTS * basis * (2.0 * nonzeros + 4.0 * size * basis)
+
+
+def factorization_cost(kind: str, rows: int, columns: int) -> float:
+    """
+    @returns: Estimated flops of an LU, QR or SVD factorization of a (rows, columns) matrix.
+    """
+    return FACTORIZATION_FLOPS_PER_CUBE[kind] * float(rows) * columns * min(rows, columns)
+
+
+def decode_cost(size_bytes: int) -> float:
+    """
+    @returns: Flop-equivalent cost of decoding a JSON body of `size_bytes`.
+    """
+    return DECODE_FLOPS_PER_BYTE * size_bytes
+
+
+def decode_matrix_json(body: bytes) -> object:
+    """
+    Decode a JSON body, turning its numeric array fields into float64 arrays.
+
+    Large bodies are decoded in a worker with this function. The parent process then
+    unpickles a few arrays (one copy each) instead of building millions of Python floats
+    while holding the interpreter. Top-level fields are converted, and so are the fields
+    of top-level objects (sparse matrices' index/value arrays). Fields that are ragged,
+    empty, mistyped or non-finite stay lists, so route validation reports the same errors
+    as for small bodies.
+
+    @throws ValueError: The body is not valid UTF-8 JSON.
+    """
+    payload = json.loads(body)
+    if isinstance(payload, dict):
+        _decode_arrays(payload)
+        for value in payload.values():
+            if isinstance(value, dict):
+                _decode_arrays(value)
+    return payload
+
+
+def run_matrix_job(operation: str, cost: float, func: Callable[..., T], *args) -> T:
+    """
+    Run a matrix computation inline or in the process pool, based on its cost.
+
+    @param operation: Name used in error messages (e.g. "eig").
+    @param cost: Estimated flops (`apply_cost`/`eig_cost`/`factorization_cost`/`decode_cost`).
+    @param func: Picklable top-level function (it may run in another process).
+    @param args: Picklable arguments (NumPy arrays are fine).
+    @returns: `func(*args)`.
+    @throws ComputeLimitError: 413 over `MATRIX_MAX_COST`; 503 when the pool is
+        full or its worker was lost; 504 past `MATRIX_JOB_TIMEOUT_SECONDS`.
+    @throws Exception: Whatever `func` raises (e.g. `ValueError` for bad input).
+    """
+    if _runs_inline(operation, cost):
+        return func(*args)
+    future = _submit(operation, func, args)
+    try:
+        return future.result(timeout=MATRIX_JOB_TIMEOUT_SECONDS)
+    except FutureTimeoutError:
+        raise _timed_out(operation, future) from None
+    except BrokenProcessPool:
+        raise _worker_lost(operation) from None
+
+
+async def run_matrix_job_async(
+    operation: str, cost: float, func: Callable[..., T], *args
+) -> T:
+    """
+    `run_matrix_job` for the event loop: offloaded jobs are awaited, not waited on.
+
+    Inline jobs still run in the calling thread, so keep their cost threshold
+    small enough for the event loop (it is, at `MATRIX_INLINE_MAX_COST`).
+    """
+    if _runs_inline(operation, cost):
+        return func(*args)
+    future = _submit(operation, func, args)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), MATRIX_JOB_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise _timed_out(operation, future) from None
+    except BrokenProcessPool:
+        raise _worker_lost(operation) from None
+
+
+def compute_stats() -> dict:
+    """
+    Snapshot pool configuration and job counters.
+
+    @returns: `workers`, `maxPendingJobs`, `pendingJobs`, `timeoutSeconds`,
+        `inlineMaxCost`, `maxCost`, per-outcome job counts (`inline`, `offloaded`,
+        `rejected`, `timedOut`, `failed`) and the same counts for JSON decodes (`decodes`).
+    """
+    with _pool_lock:
+        return {
+            "workers": MATRIX_POOL_WORKERS,
+            "maxPendingJobs": MATRIX_MAX_PENDING_JOBS,
+            "pendingJobs": _pending_jobs,
+            "timeoutSeconds": MATRIX_JOB_TIMEOUT_SECONDS,
+            "inlineMaxCost": MATRIX_INLINE_MAX_COST,
+            "maxCost": MATRIX_MAX_COST,
+            **_job_counts,
+            "decodes": dict(_decode_counts),
+        }
+
+
+def shutdown_compute_pool() -> None:
+    """
+    Stop the worker processes (at application shutdown).
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _runs_inline(operation: str, cost: float) -> bool:
+    if cost > MATRIX_MAX_COST:
+        _count(operation, "rejected")
+        raise ComputeLimitError(
+            413,
+            f"matrix is too large for {operation} (estimated {cost:.2g} flops, "
+            f"limit {MATRIX_MAX_COST:.2g})",
+        )
+    if cost <= MATRIX_INLINE_MAX_COST or MATRIX_POOL_WORKERS <= 0:
+        _count(operation, "inline")
+        return True
+    return False
+
+
+def _timed_out(operation: str, future: Future) -> ComputeLimitError:
+    _count(operation, "timedOut")
+    if not future.cancel():
+        # Still running inside a native call; only terminating the worker stops it.
+        _recycle_pool()
+    return ComputeLimitError(
+        504, f"{operation} did not finish within {MATRIX_JOB_TIMEOUT_SECONDS:g}s"
+    )
+
+
+def _worker_lost(operation: str) -> ComputeLimitError:
+    _count(operation, "failed")
+    logger.warning("Matrix worker lost during %s", operation)
+    return ComputeLimitError(
+        503,
+        f"{operation} worker was restarted; retry the request",
+        retry_after=MATRIX_RETRY_AFTER_SECONDS,
+    )
+
+
+def _submit(operation: str, func: Callable[..., T], args: tuple) -> Future:
+    global _pool, _pending_jobs
+    with _pool_lock:
+        counts = _counts_for(operation)
+        if _pending_jobs >= MATRIX_MAX_PENDING_JOBS:
+            counts["rejected"] += 1
+            raise ComputeLimitError(
+                503,
+                f"too many matrix jobs in progress; retry {operation} shortly",
+                retry_after=MATRIX_RETRY_AFTER_SECONDS,
+            )
+        if _pool is None:
+            # `spawn` avoids forking a threaded server (and is the only option on Windows).
+            _pool = ProcessPoolExecutor(
+                max_workers=MATRIX_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        _pending_jobs += 1
+        counts["offloaded"] += 1
+        pool = _pool
+    try:
+        future = pool.submit(func, *args)
+    except BrokenProcessPool:
+        _release_job(None)
+        _discard_pool(pool)
+        raise ComputeLimitError(
+            503,
+            "matrix workers were restarted; retry the request",
+            retry_after=MATRIX_RETRY_AFTER_SECONDS,
+        ) from None
+    future.add_done_callback(_release_job)
+    return future
+
+
+def _release_job(_: Future | None) -> None:
+    global _pending_jobs
+    with _pool_lock:
+        _pending_jobs -= 1
+
+
+def _recycle_pool() -> None:
+    """
+    Terminate the pool running an overdue job; the next job starts a new pool.
+
+    This takes down every job running or queued in that pool, not just the overdue
+    one: their futures fail with `BrokenProcessPool` and callers get 503 (see
+    `_worker_lost`).
+    """
+    with _pool_lock:
+        pool = _pool
+    if pool is None:
+        return
+    logger.warning("Terminating matrix workers to stop an overdue job")
+    if hasattr(pool, "terminate_workers"):
+        pool.terminate_workers()
+    else:
+        # Before Python 3.14 there is no public way to stop a running task.
+        for process in list(getattr(pool, "_processes", {}).values()):
+            process.terminate()
+    _discard_pool(pool)
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    # Queued futures are left to fail with BrokenProcessPool (a 503); cancelling
+    # them would raise CancelledError in their callers instead.
+    pool.shutdown(wait=False)
+
+
+def _counts_for(operation: str) -> dict[str, int]:
+    return _decode_counts if operation == "decode" else _job_counts
+
+
+def _count(operation: str, outcome: str) -> None:
+    with _pool_lock:
+        _counts_for(operation)[outcome] += 1
+
+
+def _decode_arrays(fields: dict) -> None:
+    for key, value in fields.items():
+        if not isinstance(value, list) or not value:
+            continue
+        try:
+            array = np.array(value, dtype=np.float64)
+        except (TypeError, ValueError, OverflowError):
+            continue
+        if 0 not in array.shape and np.isfinite(array).all():
+            fields[key] = array
+
@@ -0,0 +1,232 @@
+"""
+Versioned on-disk store for preprocessed datasets.
+
+Each dataset is written once, after its first load, as a directory of `.npy`
+arrays plus a `meta.json` descriptor, so later process starts can skip the
+OpenML/LFW/20 Newsgroups fetch + normalization and just open a few binary files.
+
+Build the store ahead of time (e.g. at image build time) with:
+  python -m dataset_store                  (from backend/)
+  python -m backend.dataset_store mnist    (from repo root)
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from typing import TYPE_CHECKING, Sequence
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .datasets import RawDataset
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the on-disk layout or normalization rules change; older
+# store directories are then ignored and rebuilt from the source loaders.
+STORE_FORMAT_VERSION = 1
+META_FILENAME = "meta.json"
+TEXTS_FILENAME = "texts.json"
+
+
+def store_path(root: Path, source: str) -> Path:
+    """
+    Resolve the versioned store directory for one dataset.
+
+    @param root: Store root directory.
+    @param source: Dataset id.
+    @returns: Directory holding the dataset's arrays and metadata.
+    """
+    return root / f"v{STORE_FORMAT_VERSION}" / source
+
+
+def write_dataset_store(raw_dataset: RawDataset, root: Path, overwrite: bool = False) -> Path:
+    """
+    Persist a normalized dataset to the store.
+
+    Files are written to a temporary sibling directory and renamed into place,
+    so concurrent writers (e.g. several workers cold-starting together) never
+    expose a partially written dataset.
+
+    @param raw_dataset: Prepared dataset to persist.
+    @param root: Store root directory.
+    @param overwrite: Replace an existing stored copy when True.
+    @returns: Final store directory for the dataset.
+    """
+    target = store_path(root, raw_dataset.source)
+    if target.exists() and not overwrite:
+        return target
+
+    arrays = _dataset_arrays(raw_dataset)
+
+    meta = {
+        "format": STORE_FORMAT_VERSION,
+        "source": raw_dataset.source,
+        "displayName": raw_dataset.display_name,
+        "modality": raw_dataset.modality,
+        "labelNames": raw_dataset.label_names,
+        "vocab": raw_dataset.vocab,
+        "supportsTrainTest": raw_dataset.supports_train_test,
+        "vectorLength": raw_dataset.vector_length,
+        "countsShape": (
+            list(raw_dataset.counts.shape) if raw_dataset.counts is not None else None
+        ),
+        "contentDigest": _content_digest(arrays),
+        "arrays": {
+            name: {"dtype": array.dtype.str, "shape": list(array.shape)}
+            for name, array in arrays.items()
+        },
+    }
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{raw_dataset.source}-", dir=target.parent))
+    try:
+        for name, array in arrays.items():
+            np.save(staging / f"{name}.npy", array, allow_pickle=False)
+        if raw_dataset.texts is not None:
+            with (staging / TEXTS_FILENAME).open("w", encoding="utf-8") as handle:
+                json.dump(raw_dataset.texts, handle, ensure_ascii=False)
+        # meta.json is written last; readers treat its presence as "complete".
+        with (staging / META_FILENAME).open("w", encoding="utf-8") as handle:
+            json.dump(meta, handle, ensure_ascii=False)
+
+        if target.exists():
+            shutil.rmtree(target)
+        try:
+            os.replace(staging, target)
+        except OSError:
+            if not target.exists():
+                raise
+            # Another process finished the same dataset first; keep its copy.
+            logger.info("Dataset store for %s was written concurrently", raw_dataset.source)
+    finally:
+        if staging.exists():
+            shutil.rmtree(staging, ignore_errors=True)
+    return target
+
+
+def read_dataset_store(root: Path, source: str, mmap: bool = False) -> dict | None:
+    """
+    Read a stored dataset's metadata, arrays, and texts.
+
+    With `mmap=True` arrays are returned as read-only `np.memmap`s over the
+    store files, so every worker process maps the same page-cache copy
+    instead of holding a private one.
+
+    @param root: Store root directory.
+    @param source: Dataset id.
+    @param mmap: Memory-map arrays instead of reading them into process memory.
+    @returns: Dict with `meta`, `arrays` and `texts`, or None when no usable copy exists.
+    """
+    directory = store_path(root, source)
+    meta_path = directory / META_FILENAME
+    if not meta_path.is_file():
+        return None
+
+    try:
+        with meta_path.open("r", encoding="utf-8") as handle:
+            meta = json.load(handle)
+        if meta.get("format") != STORE_FORMAT_VERSION or meta.get("source") != source:
+            return None
+
+        arrays: dict[str, np.ndarray] = {}
+        for name, descriptor in meta["arrays"].items():
+            array = np.load(
+                directory / f"{name}.npy",
+                mmap_mode="r" if mmap else None,
+                allow_pickle=False,
+            )
+            if array.dtype.str != descriptor["dtype"] or list(array.shape) != descriptor["shape"]:
+                raise ValueError(f"stored array '{name}' does not match its descriptor")
+            arrays[name] = array
+
+        texts: tuple[str, ...] | None = None
+        texts_path = directory / TEXTS_FILENAME
+        if texts_path.is_file():
+            with texts_path.open("r", encoding="utf-8") as handle:
+                texts = tuple(json.load(handle))
+        if meta["modality"] == "text" and texts is None:
+            raise ValueError("stored text dataset is missing its texts")
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        logger.warning("Ignoring unreadable dataset store for %s: %s", source, exc)
+        return None
+
+    return {"meta": meta, "arrays": arrays, "texts": texts}
+
+
+def dataset_content_digest(raw_dataset: RawDataset) -> str:
+    """
+    Hash a dataset's arrays exactly as the store records them in `contentDigest`.
+
+    @param raw_dataset: Prepared dataset.
+    @returns: Hex digest that changes whenever labels, pixels or counts change.
+    """
+    return _content_digest(_dataset_arrays(raw_dataset))
+
+
+def _dataset_arrays(raw_dataset: RawDataset) -> dict[str, np.ndarray]:
+    arrays: dict[str, np.ndarray] = {"labels": np.ascontiguousarray(raw_dataset.labels)}
+    if raw_dataset.images is not None:
+        arrays["images"] = np.ascontiguousarray(raw_dataset.images)
+    if raw_dataset.counts is not None:
+        arrays["counts_data"] = np.ascontiguousarray(raw_dataset.counts.data)
+        arrays["counts_indices"] = np.ascontiguousarray(raw_dataset.counts.indices)
+        arrays["counts_indptr"] = np.ascontiguousarray(raw_dataset.counts.indptr)
+    return arrays
+
+
+def _content_digest(arrays: dict[str, np.ndarray]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for name in sorted(arrays):
+        array = arrays[name]
+        digest.update(f"{name}:{array.dtype.str}:{array.shape}".encode())
+        digest.update(memoryview(array).cast("B"))
+    return digest.hexdigest()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    Build store entries for the requested datasets (all by default).
+
+    @param argv: Optional CLI arguments.
+    @returns: Process exit code.
+    """
+    try:
+        from . import datasets
+    except ImportError:
+        import datasets  # type: ignore[no-redef]
+
+    parser = argparse.ArgumentParser(description="Preprocess datasets into the on-disk store.")
+    parser.add_argument(
+        "datasets",
+        nargs="*",
+        help=f"dataset ids to build (default: all of {', '.join(datasets.DATASET_SPECS)})",
+    )
+    parser.add_argument("--root", type=Path, default=datasets.DATASET_STORE_ROOT)
+    parser.add_argument("--force", action="store_true", help="rebuild existing store entries")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    selected = args.datasets or list(datasets.DATASET_SPECS)
+    for dataset in selected:
+        spec = datasets.DATASET_SPECS.get(dataset)
+        if spec is None:
+            parser.error(f"unknown dataset '{dataset}'")
+        if store_path(args.root, spec.source).exists() and not args.force:
+            logger.info("%s: already stored", spec.source)
+            continue
+        logger.info("%s: loading from source", spec.source)
+        written = write_dataset_store(spec.loader(), args.root, overwrite=args.force)
+        logger.info("%s: wrote %s", spec.source, written)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,24 +1,55 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, is_dataclass
+import hashlib
+import logging
+import os
 from pathlib import Path
 import re
+import sys
 import threading
-from typing import Callable, Literal
+import time
+import tracemalloc
+from typing import Callable, Iterator, Literal, Sequence
 
 import numpy as np
 from scipy import sparse
-from sklearn.datasets import fetch_20newsgroups, fetch_lfw_people, fetch_openml
-from sklearn.feature_extraction.text import CountVectorizer
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+try:
+    from .class_stats import ClassStats, class_statistics
+    from .dataset_store import dataset_content_digest, read_dataset_store, write_dataset_store
+    from .metrics import timed_stage
+    from .neighbors import NeighborIndex, NeighborMetric, build_neighbor_index, search_neighbors
+    from .projections import PCAResult, truncated_pca
+except ImportError:
+    # Allow `uvicorn main:app` when running from backend/.
+    from class_stats import ClassStats, class_statistics
+    from dataset_store import dataset_content_digest, read_dataset_store, write_dataset_store
+    from metrics import timed_stage
+    from neighbors import NeighborIndex, NeighborMetric, build_neighbor_index, search_neighbors
+    from projections import PCAResult, truncated_pca
 
 DatasetName = Literal["mnist", "fashion-mnist", "faces-in-the-wild", "20newsgroups"]
 DatasetSplit = Literal["train", "test", "all"]
 DatasetModality = Literal["image", "text"]
+TextLayout = Literal["records", "columns"]
+TextWeighting = Literal["max", "tfidf", "l2"]
+DatasetLoadState = Literal["cold", "loading", "ready", "failed"]
 
 DATA_ROOT = Path(__file__).resolve().parent / "data"
 OPENML_DATA_HOME = DATA_ROOT / "openml"
 LFW_DATA_HOME = DATA_ROOT / "lfw"
 NEWSGROUPS_DATA_HOME = DATA_ROOT / "20newsgroups"
+# Preprocessed copies of loaded datasets; see dataset_store.py.
+DATASET_STORE_ROOT = Path(os.getenv("DATASET_STORE_DIR", "").strip() or DATA_ROOT / "store")
+DATASET_STORE_ENABLED = os.getenv("DATASET_STORE", "1").strip() != "0"
+# Back dataset arrays with read-only memmaps over the store so uvicorn workers share pages.
+DATASET_MMAP_ENABLED = DATASET_STORE_ENABLED and os.getenv("DATASET_MMAP", "0").strip() == "1"
 EMAIL_ADDRESS_RE = re.compile(r"(?i)\b[\w.%+\-]+@[A-Z0-9.\-]+\.[A-Z]{2,}\b")
 VALID_VOCAB_TOKEN_RE = re.compile(r"^[A-Za-z]{2,}$")
 HAS_VOWEL_RE = re.compile(r"[aeiou]")
@@ -26,6 +57,23 @@ HAS_CONSONANT_RE = re.compile(r"[b-df-hj-np-tv-z]")
 
 # MNIST and Fashion-MNIST publish 60k train + 10k test rows in order.
 OPENML_TRAIN_COUNT = 60_000
+# Rows converted per block when turning float pixel payloads into uint8 images.
+PIXEL_CONVERT_CHUNK_ROWS = 4096
+# Rows materialized at a time while streaming a sample window.
+STREAM_CHUNK_ROWS = 256
+# Components computed (once per split) for PCA responses; requests take a prefix.
+PCA_MAX_COMPONENTS = 16
+# Largest labels x vectorLength per-class statistics kept for a whole split (8M values is
+# 32 MB per float32 array); beyond it (LFW) requests must name their labels.
+CLASS_STATS_MAX_VALUES = 8_000_000
+# Optional per-load peak memory warning threshold (a load over it is logged, not
+# stopped); setting it also enables tracemalloc peak tracking.
+DATASET_LOAD_MEMORY_BUDGET_MB = float(os.getenv("DATASET_LOAD_MEMORY_BUDGET_MB", "0") or 0)
+DATASET_LOAD_TRACE_MEMORY = (
+    os.getenv("DATASET_LOAD_TRACE_MEMORY", "0").strip() == "1" or DATASET_LOAD_MEMORY_BUDGET_MB > 0
+)
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -48,6 +96,7 @@ class RawDataset:
     label_names: tuple[str, ...] | None
     texts: tuple[str, ...] | None
     vocab: tuple[str, ...] | None
+    vocab_version: str | None
     counts: sparse.csr_matrix | None
     supports_train_test: bool
     vector_length: int
@@ -64,16 +113,63 @@ class DatasetView:
     label_names: tuple[str, ...] | None
     texts: tuple[str, ...] | None
     vocab: tuple[str, ...] | None
+    vocab_version: str | None
     counts: sparse.csr_matrix | None
     image_width: int
     image_height: int
     vector_length: int
     total_count: int
+    # Rows grouped by label: rows of label L are label_order[label_offsets[L]:label_offsets[L + 1]].
+    label_order: np.ndarray
+    label_offsets: np.ndarray
+
+
+@dataclass(frozen=True)
+class DatasetLoadStats:
+    source: DatasetName
+    origin: Literal["store", "source"]
+    duration_seconds: float
+    peak_traced_bytes: int | None
+    max_rss_bytes: int | None
 
 
+# `_cache_lock` only guards creation of the per-dataset locks; loads hold their
+# dataset's own lock so a slow download never blocks other datasets.
 _cache_lock = threading.Lock()
+_dataset_locks: dict[DatasetName, threading.Lock] = {}
 _raw_dataset_cache: dict[DatasetName, RawDataset] = {}
 _split_dataset_cache: dict[tuple[DatasetName, DatasetSplit], DatasetView] = {}
+# `get_dataset` lookups per (dataset, "hit"|"miss"); a miss prepares a view (and may load).
+_split_cache_lookups: dict[tuple[DatasetName, str], int] = {}
+_split_cache_lookups_lock = threading.Lock()
+_dataset_load_stats: dict[DatasetName, DatasetLoadStats] = {}
+# Traced loads in progress, and whether they started tracemalloc (and so must stop it).
+_load_tracing_lock = threading.Lock()
+_load_tracing_active = 0
+_load_tracing_started = False
+_dataset_load_states: dict[DatasetName, DatasetLoadState] = {}
+_dataset_load_errors: dict[DatasetName, str] = {}
+# Content digest of each loaded raw dataset (from the store, or hashed on first use).
+_dataset_versions: dict[DatasetName, str] = {}
+# PCA per split, stored with the view it was computed from so a reloaded
+# dataset (new view object) is recomputed instead of served stale.
+_split_pca_cache: dict[tuple[DatasetName, DatasetSplit], tuple[DatasetView, PCAResult]] = {}
+_pca_locks: dict[DatasetName, threading.Lock] = {}
+# Nearest-neighbour index per split, invalidated the same way as the PCA cache.
+_split_neighbor_cache: dict[
+    tuple[DatasetName, DatasetSplit], tuple[DatasetView, NeighborIndex]
+] = {}
+_neighbor_locks: dict[DatasetName, threading.Lock] = {}
+# Per-label statistics per split (None when the split has too many labels to keep).
+_split_class_stats_cache: dict[
+    tuple[DatasetName, DatasetSplit], tuple[DatasetView, ClassStats | None]
+] = {}
+_class_stats_locks: dict[DatasetName, threading.Lock] = {}
+# Weighted copies of a split's `counts` data (TF-IDF, L2) sharing its indices/indptr.
+_split_weighting_cache: dict[
+    tuple[DatasetName, DatasetSplit, TextWeighting], tuple[DatasetView, sparse.csr_matrix]
+] = {}
+_weighting_locks: dict[DatasetName, threading.Lock] = {}
 
 
 def _load_openml_square_dataset(
@@ -89,6 +185,10 @@ def _load_openml_square_dataset(
     @param openml_name: Dataset name in OpenML.
     @returns: Prepared dataset with uint8 image grids and int labels.
     """
+    # scikit-learn takes over a second to import; only loaders that fetch need it,
+    # so servers reading the dataset store never import it.
+    from sklearn.datasets import fetch_openml
+
     bunch = fetch_openml(
         name=openml_name,
         version=1,
@@ -96,19 +196,22 @@ def _load_openml_square_dataset(
         parser="liac-arff",
         data_home=str(OPENML_DATA_HOME),
     )
-    flat_pixels = np.asarray(bunch.data)
-    if flat_pixels.ndim != 2:
-        raise ValueError(f"{display_name} payload must be 2D, got shape {flat_pixels.shape!r}")
+    payload_shape = np.shape(bunch.data)
+    if len(payload_shape) != 2:
+        raise ValueError(f"{display_name} payload must be 2D, got shape {payload_shape!r}")
 
-    vector_length = int(flat_pixels.shape[1])
+    vector_length = int(payload_shape[1])
     edge = int(np.sqrt(vector_length))
     if edge * edge != vector_length:
         raise ValueError(
             f"{display_name} vectors are not square image grids (length={vector_length})."
         )
 
-    images = np.clip(np.rint(flat_pixels), 0, 255).astype(np.uint8).reshape(-1, edge, edge)
     labels = _to_label_ids(np.asarray(bunch.target))
+    # The conversion pops the float payload itself, so it holds the only reference
+    # and can release the source buffer block by block.
+    images = _pixels_to_uint8(bunch, "data").reshape(-1, edge, edge)
+    del bunch
     return _prepare_image_dataset(
         source=source,
         display_name=display_name,
@@ -125,18 +228,22 @@ def _load_lfw_dataset() -> RawDataset:
 
     @returns: Prepared LFW dataset.
     """
+    from sklearn.datasets import fetch_lfw_people
+
     bunch = fetch_lfw_people(
         data_home=str(LFW_DATA_HOME),
         color=False,
         resize=1.0,
         download_if_missing=True,
     )
-    lfw_images = np.asarray(bunch.images, dtype=np.float32)
-    if np.max(lfw_images) <= 1.0:
-        lfw_images = lfw_images * 255.0
-    images = np.clip(np.rint(lfw_images), 0, 255).astype(np.uint8)
     labels = np.asarray(bunch.target, dtype=np.int64)
     label_names = tuple(str(name).replace("_", " ") for name in np.asarray(bunch.target_names))
+    scale = 255.0 if np.max(bunch.images) <= 1.0 else 1.0
+    # `data` is a flattened view of `images`; drop it so the conversion below
+    # holds the only reference to the float images.
+    bunch.pop("data", None)
+    images = _pixels_to_uint8(bunch, "images", scale=scale, dtype=np.float32)
+    del bunch
     return _prepare_image_dataset(
         source="faces-in-the-wild",
         display_name="faces in the wild",
@@ -153,6 +260,9 @@ def _load_20newsgroups_dataset() -> RawDataset:
 
     @returns: Prepared text dataset with sparse word-count vectors.
     """
+    from sklearn.datasets import fetch_20newsgroups
+    from sklearn.feature_extraction.text import CountVectorizer
+
     bunch = fetch_20newsgroups(
         subset="all",
         data_home=str(NEWSGROUPS_DATA_HOME),
@@ -251,77 +361,475 @@ def available_datasets() -> list[dict[str, str]]:
     ]
 
 
+def dataset_modality(dataset: str) -> DatasetModality:
+    """
+    Look up a dataset's modality without loading it.
+
+    @param dataset: Dataset id.
+    @returns: "image" or "text".
+    """
+    return _get_dataset_spec(dataset).modality
+
+
+def resolve_dataset_split(dataset: str, split: str | None) -> DatasetSplit:
+    """
+    Resolve a requested split the way `get_dataset` does, without loading the dataset.
+
+    @param dataset: Dataset id.
+    @param split: Optional split selector (None picks the dataset's default).
+    @returns: "train", "test" or "all".
+    @throws ValueError: Unknown dataset or a split it does not support.
+    """
+    return _resolve_split(_get_dataset_spec(dataset), split)
+
+
 def sample_dataset(
     count: int,
     dataset: str = "mnist",
     seed: int | None = None,
     split: str | None = None,
+    include_vocab: bool = True,
+    text_layout: TextLayout = "records",
+    labels: Sequence[int] | None = None,
+    per_label: int | None = None,
+    weighting: TextWeighting = "max",
 ) -> dict:
     """
     Return JSON-ready samples for image or text datasets.
 
-    @param count: Number of samples to return.
+    @param count: Number of samples to return (the total cap when `per_label` is set).
     @param dataset: Dataset id.
     @param seed: Optional RNG seed for reproducible sampling.
     @param split: Optional split ("train"|"test"|"all"), validated per dataset.
+    @param include_vocab: Attach the full text vocabulary; when False only
+        `vocabVersion` is returned and clients fetch the vocab separately.
+    @param text_layout: "records" for `wordCounts` dicts, or "columns" for
+        parallel `wordColumns` index/count/weight arrays (text datasets only).
+    @param labels: Only sample rows with these label ids.
+    @param per_label: Draw this many rows of each label (stratified), grouped by label.
+    @param weighting: Word `weight` for text samples: "max" (count / row max count),
+        "tfidf" (smoothed TF-IDF, L2-normalized per row) or "l2" (count / row L2 norm).
     @returns: Serializable dict with metadata and sampled rows.
     """
     selected = get_dataset(dataset=dataset, split=split)
-    total = selected.total_count
-    safe_count = min(max(int(count), 1), total)
+    with timed_stage("draw-indices"):
+        indices = _draw_sample_indices(selected, count, seed, labels, per_label)
 
-    rng = np.random.default_rng(seed)
-    indices = rng.choice(total, size=safe_count, replace=False)
+    with timed_stage("assemble-rows"):
+        if selected.modality == "image":
+            samples = _image_samples(selected, indices)
+        else:
+            samples = _text_samples(selected, indices, text_layout, weighting)
 
+    response = _sample_metadata(selected)
+    response["samples"] = samples
+    if selected.vocab is not None:
+        response["vocabVersion"] = selected.vocab_version
+        if include_vocab:
+            response["vocab"] = selected.vocab
+    return response
+
+
+def _image_samples(selected: DatasetView, indices: np.ndarray) -> list[dict]:
+    if selected.images is None:
+        raise ValueError(f"dataset '{selected.source}' has no image data")
+    pixels = selected.images[indices].reshape(indices.shape[0], -1)
     samples: list[dict] = []
-    if selected.modality == "image":
-        if selected.images is None:
-            raise ValueError(f"dataset '{selected.source}' has no image data")
-        pixels = selected.images[indices].reshape(safe_count, -1)
-        for i, idx in enumerate(indices):
-            label_id = int(selected.labels[idx])
-            sample = {
-                "index": int(idx),
-                "label": label_id,
-                "pixels": pixels[i].tolist(),
-            }
-            label_name = _resolve_label_name(selected.label_names, label_id)
-            if label_name is not None:
-                sample["labelName"] = label_name
-            samples.append(sample)
+    for i, idx in enumerate(indices):
+        label_id = int(selected.labels[idx])
+        sample = {
+            "index": int(idx),
+            "label": label_id,
+            "pixels": pixels[i].tolist(),
+        }
+        label_name = _resolve_label_name(selected.label_names, label_id)
+        if label_name is not None:
+            sample["labelName"] = label_name
+        samples.append(sample)
+    return samples
+
+
+def _text_samples(
+    selected: DatasetView,
+    indices: np.ndarray,
+    text_layout: TextLayout,
+    weighting: TextWeighting = "max",
+) -> list[dict]:
+    """
+    Assemble text samples from one bulk CSR row selection.
+
+    "max" weights are computed over the whole selection at once; "tfidf" and
+    "l2" weights are sliced from a precomputed matrix with the same sparsity
+    pattern. Python only slices the resulting flat lists per row.
+    """
+    if selected.texts is None or selected.counts is None or selected.vocab is None:
+        raise ValueError(f"dataset '{selected.source}' has no text data")
+    if text_layout not in ("records", "columns"):
+        raise ValueError("textLayout must be 'records' or 'columns'")
+    if weighting not in ("max", "tfidf", "l2"):
+        raise ValueError("weighting must be 'max', 'tfidf' or 'l2'")
+
+    counts = selected.counts[indices]
+    if not counts.has_sorted_indices:
+        counts = counts.sorted_indices()
+
+    if weighting == "max":
+        weights = _row_max_weights(counts)
     else:
-        if selected.texts is None or selected.counts is None or selected.vocab is None:
-            raise ValueError(f"dataset '{selected.source}' has no text data")
-        counts = selected.counts[indices]
-        for i, idx in enumerate(indices):
-            label_id = int(selected.labels[idx])
-            row = counts.getrow(i)
-            row_indices = row.indices.tolist()
-            row_counts = row.data.tolist()
-            max_count = max(row_counts) if row_counts else 0
-            word_counts = [
-                {
-                    "index": int(word_index),
-                    "count": int(word_count),
-                    "weight": float(word_count / max_count) if max_count > 0 else 0.0,
-                }
-                for word_index, word_count in zip(row_indices, row_counts, strict=True)
-            ]
-            word_counts.sort(key=lambda item: item["index"])
-
-            sample = {
-                "index": int(idx),
-                "label": label_id,
-                "rawText": selected.texts[idx],
-                "snippet": _first_sentence(selected.texts[idx]),
-                "wordCounts": word_counts,
+        weighted = _split_weighted_counts(selected, weighting)[indices]
+        if not weighted.has_sorted_indices:
+            weighted = weighted.sorted_indices()
+        # Same sparsity pattern as `counts`, so entries line up after sorting.
+        weights = weighted.data
+
+    bounds = counts.indptr.tolist()
+    word_indices = counts.indices.tolist()
+    word_counts = counts.data.astype(np.int64, copy=False).tolist()
+    word_weights = weights.tolist()
+    label_ids = selected.labels[indices].tolist()
+
+    samples: list[dict] = []
+    for i, idx in enumerate(indices.tolist()):
+        start, stop = bounds[i], bounds[i + 1]
+        label_id = label_ids[i]
+        sample = {
+            "index": idx,
+            "label": label_id,
+            "rawText": selected.texts[idx],
+            "snippet": _first_sentence(selected.texts[idx]),
+        }
+        if text_layout == "columns":
+            sample["wordColumns"] = {
+                "index": word_indices[start:stop],
+                "count": word_counts[start:stop],
+                "weight": word_weights[start:stop],
             }
-            label_name = _resolve_label_name(selected.label_names, label_id)
-            if label_name is not None:
-                sample["labelName"] = label_name
-            samples.append(sample)
+        else:
+            sample["wordCounts"] = [
+                {"index": word_index, "count": word_count, "weight": weight}
+                for word_index, word_count, weight in zip(
+                    word_indices[start:stop],
+                    word_counts[start:stop],
+                    word_weights[start:stop],
+                )
+            ]
+        label_name = _resolve_label_name(selected.label_names, label_id)
+        if label_name is not None:
+            sample["labelName"] = label_name
+        samples.append(sample)
+    return samples
+
+
+def _row_max_weights(counts: sparse.csr_matrix) -> np.ndarray:
+    row_lengths = np.diff(counts.indptr)
+    row_max = np.zeros(row_lengths.shape[0], dtype=np.float64)
+    nonempty = row_lengths > 0
+    if counts.nnz:
+        # Empty rows contribute no data, so reducing at the non-empty row starts
+        # yields exactly one max per non-empty row.
+        row_max[nonempty] = np.maximum.reduceat(counts.data, counts.indptr[:-1][nonempty])
+    row_max_per_entry = np.repeat(row_max, row_lengths)
+    return np.divide(
+        counts.data,
+        row_max_per_entry,
+        out=np.zeros(counts.nnz, dtype=np.float64),
+        where=row_max_per_entry > 0,
+    )
+
+
+def _split_weighted_counts(selected: DatasetView, weighting: TextWeighting) -> sparse.csr_matrix:
+    """
+    Return a split's counts reweighted by TF-IDF or per-row L2 norm, built on first use.
+
+    Only a float32 `data` array is allocated; `indices` and `indptr` are the
+    (possibly memmapped) arrays of `counts`. IDF uses sklearn's smoothed form,
+    ln((1 + n) / (1 + df)) + 1, and TF-IDF rows are then L2-normalized.
+    """
+    cache_key = (selected.source, selected.split, weighting)
+    cached = _split_weighting_cache.get(cache_key)
+    if cached is not None and cached[0] is selected:
+        return cached[1]
+
+    with _derived_lock(_weighting_locks, selected.source):
+        cached = _split_weighting_cache.get(cache_key)
+        if cached is not None and cached[0] is selected:
+            return cached[1]
+        counts = selected.counts
+        data = np.asarray(counts.data, dtype=np.float64)
+        if weighting == "tfidf":
+            document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+            idf = np.log((1 + counts.shape[0]) / (1 + document_frequency)) + 1
+            data = data * idf[counts.indices]
+        row_lengths = np.diff(counts.indptr)
+        squared_norms = np.zeros(counts.shape[0], dtype=np.float64)
+        nonempty = row_lengths > 0
+        if counts.nnz:
+            squared_norms[nonempty] = np.add.reduceat(data * data, counts.indptr[:-1][nonempty])
+        norms_per_entry = np.repeat(np.sqrt(squared_norms), row_lengths)
+        np.divide(data, norms_per_entry, out=data, where=norms_per_entry > 0)
+
+        # Assigned after construction, as in `_csr_row_range`, so the buffers are not copied.
+        weighted = sparse.csr_matrix(counts.shape, dtype=np.float32)
+        weighted.data = data.astype(np.float32)
+        weighted.indices = counts.indices
+        weighted.indptr = counts.indptr
+        logger.info(
+            "Built %s weighting for %s/%s (%d bytes)",
+            weighting,
+            selected.source,
+            selected.split,
+            weighted.data.nbytes,
+        )
+        _split_weighting_cache[cache_key] = (selected, weighted)
+        return weighted
+
+
+def text_weighting_stats() -> list[dict]:
+    """
+    Report the memory held by each weighted text matrix built by this process.
+
+    @returns: One entry per built variant with `dataset`, `split`, `weighting` and
+        `bytes` (its own `data` array; indices/indptr are shared with `counts`).
+    """
+    return [
+        {"dataset": source, "split": split, "weighting": weighting, "bytes": int(matrix.data.nbytes)}
+        for (source, split, weighting), (_, matrix) in list(_split_weighting_cache.items())
+    ]
+
+
+def sample_dataset_arrays(
+    count: int,
+    dataset: str = "mnist",
+    seed: int | None = None,
+    split: str | None = None,
+    labels: Sequence[int] | None = None,
+    per_label: int | None = None,
+) -> tuple[dict, list[tuple[str, np.ndarray]]]:
+    """
+    Return image samples as contiguous arrays for binary encoding.
+
+    Draws the same indices as `sample_dataset` for a given seed, but keeps the
+    pixel block as one uint8 array instead of per-pixel Python ints.
+
+    @param count: Number of samples to return (the total cap when `per_label` is set).
+    @param dataset: Dataset id (image modality).
+    @param seed: Optional RNG seed for reproducible sampling.
+    @param split: Optional split ("train"|"test"|"all"), validated per dataset.
+    @param labels: Only sample rows with these label ids.
+    @param per_label: Draw this many rows of each label (stratified), grouped by label.
+    @returns: Metadata dict and named `indices`/`labels` (int64) and `pixels` (uint8, count x vectorLength) arrays.
+    """
+    selected = get_dataset(dataset=dataset, split=split)
+    if selected.modality != "image" or selected.images is None:
+        raise ValueError(f"dataset '{selected.source}' has no image data")
+
+    with timed_stage("draw-indices"):
+        indices = _draw_sample_indices(selected, count, seed, labels, per_label)
+    with timed_stage("assemble-rows"):
+        pixels = selected.images[indices].reshape(indices.shape[0], -1)
+        labels = np.asarray(selected.labels[indices], dtype=np.int64)
+
+    metadata = _sample_metadata(selected)
+    metadata["count"] = int(indices.shape[0])
+    if selected.label_names is not None:
+        metadata["labelNames"] = [
+            _resolve_label_name(selected.label_names, int(label_id)) for label_id in labels
+        ]
+    blocks = [
+        ("indices", indices.astype(np.int64, copy=False)),
+        ("labels", labels),
+        ("pixels", pixels),
+    ]
+    return metadata, blocks
+
+
+def stream_dataset_samples(
+    dataset: str = "mnist",
+    split: str | None = None,
+    seed: int | None = None,
+    offset: int = 0,
+    limit: int = 1024,
+    text_layout: TextLayout = "records",
+) -> tuple[dict, Iterator[list[dict]]]:
+    """
+    Page through a seeded permutation of a split, yielding JSON-ready samples lazily.
 
-    response = {
+    Rows `offset .. offset + limit` of the permutation are materialized
+    `STREAM_CHUNK_ROWS` at a time, so memory stays bounded no matter how many
+    rows are pulled. Pass `header["nextCursor"]` back (see
+    `parse_stream_cursor`) to continue where this page stopped.
+
+    @param dataset: Dataset id.
+    @param split: Optional split ("train"|"test"|"all"), validated per dataset.
+    @param seed: Permutation seed; a random one is drawn (and reported) when None.
+    @param offset: First permutation position to return.
+    @param limit: Maximum number of rows in this page.
+    @param text_layout: "records" or "columns" word layout (text datasets only).
+    @returns: Page header (sample metadata plus `seed`, `offset`, `count`,
+        `nextCursor`, and `vocabVersion` for text) and an iterator of sample chunks.
+    """
+    selected = get_dataset(dataset=dataset, split=split)
+    if selected.modality == "text" and text_layout not in ("records", "columns"):
+        raise ValueError("textLayout must be 'records' or 'columns'")
+    header, window = _stream_window(selected, seed, offset, limit)
+
+    def chunks() -> Iterator[list[dict]]:
+        for start in range(0, window.shape[0], STREAM_CHUNK_ROWS):
+            indices = window[start : start + STREAM_CHUNK_ROWS]
+            if selected.modality == "image":
+                yield _image_samples(selected, indices)
+            else:
+                yield _text_samples(selected, indices, text_layout)
+
+    return header, chunks()
+
+
+def stream_dataset_arrays(
+    dataset: str = "mnist",
+    split: str | None = None,
+    seed: int | None = None,
+    offset: int = 0,
+    limit: int = 1024,
+) -> tuple[dict, Iterator[tuple[dict, list[tuple[str, np.ndarray]]]]]:
+    """
+    Array counterpart of `stream_dataset_samples` for image datasets.
+
+    @param dataset: Dataset id (image modality).
+    @param split: Optional split ("train"|"test"|"all"), validated per dataset.
+    @param seed: Permutation seed; a random one is drawn (and reported) when None.
+    @param offset: First permutation position to return.
+    @param limit: Maximum number of rows in this page.
+    @returns: Page header and an iterator of (`{"offset","count"}`, blocks) chunks
+        with `indices`/`labels` (int64) and `pixels` (uint8) arrays.
+    """
+    selected = get_dataset(dataset=dataset, split=split)
+    if selected.modality != "image" or selected.images is None:
+        raise ValueError(f"dataset '{selected.source}' has no image data")
+    header, window = _stream_window(selected, seed, offset, limit)
+
+    def chunks() -> Iterator[tuple[dict, list[tuple[str, np.ndarray]]]]:
+        for start in range(0, window.shape[0], STREAM_CHUNK_ROWS):
+            indices = window[start : start + STREAM_CHUNK_ROWS]
+            chunk_header = {"offset": header["offset"] + start, "count": int(indices.shape[0])}
+            yield chunk_header, [
+                ("indices", indices),
+                ("labels", np.asarray(selected.labels[indices], dtype=np.int64)),
+                ("pixels", selected.images[indices].reshape(indices.shape[0], -1)),
+            ]
+
+    return header, chunks()
+
+
+def parse_stream_cursor(cursor: str) -> tuple[int, int]:
+    """
+    Split a `<seed>:<offset>` stream cursor.
+
+    @param cursor: Cursor from a previous page's `nextCursor`.
+    @returns: (seed, offset).
+    """
+    seed_text, separator, offset_text = cursor.partition(":")
+    if not separator or not seed_text.isdigit() or not offset_text.isdigit():
+        raise ValueError("cursor must have the form '<seed>:<offset>'")
+    return int(seed_text), int(offset_text)
+
+
+def _stream_window(
+    selected: DatasetView, seed: int | None, offset: int, limit: int
+) -> tuple[dict, np.ndarray]:
+    total = selected.total_count
+    if offset < 0 or offset > total:
+        raise ValueError(f"offset must be between 0 and {total}")
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    if seed is None:
+        seed = int(np.random.default_rng().integers(0, 2**32))
+
+    stop = min(offset + limit, total)
+    # Only this page's slice of the permutation is kept alive.
+    window = np.random.default_rng(seed).permutation(total)[offset:stop].astype(np.int64)
+
+    header = _sample_metadata(selected)
+    header.update(
+        {
+            "seed": seed,
+            "offset": offset,
+            "count": stop - offset,
+            "nextCursor": f"{seed}:{stop}" if stop < total else None,
+        }
+    )
+    if selected.vocab is not None:
+        header["vocabVersion"] = selected.vocab_version
+    return header, window
+
+
+def _draw_sample_indices(
+    selected: DatasetView,
+    count: int,
+    seed: int | None,
+    labels: Sequence[int] | None = None,
+    per_label: int | None = None,
+) -> np.ndarray:
+    """
+    Draw sample rows uniformly, from a set of labels, or stratified per label.
+
+    Filtered draws pick positions in the concatenated label groups of the
+    label index and map them back with `searchsorted`, so they cost O(count)
+    rather than a pass over `labels`.
+    """
+    rng = np.random.default_rng(seed)
+    if labels is None and per_label is None:
+        total = selected.total_count
+        safe_count = min(max(int(count), 1), total)
+        return rng.choice(total, size=safe_count, replace=False)
+
+    label_ids = _resolve_label_filter(selected, labels)
+    starts = selected.label_offsets[label_ids]
+    sizes = selected.label_offsets[label_ids + 1] - starts
+
+    if per_label is not None:
+        if per_label < 1:
+            raise ValueError("perLabel must be at least 1")
+        drawn = np.minimum(sizes, per_label)
+        if int(drawn.sum()) > count:
+            raise ValueError(
+                f"perLabel draws {int(drawn.sum())} samples; count must be at least that"
+            )
+        groups = [
+            selected.label_order[start + rng.choice(size, size=take, replace=False)]
+            for start, size, take in zip(starts.tolist(), sizes.tolist(), drawn.tolist())
+        ]
+        return np.concatenate(groups) if groups else np.zeros(0, dtype=np.int64)
+
+    pool_ends = np.cumsum(sizes)
+    pool_total = int(pool_ends[-1])
+    safe_count = min(max(int(count), 1), pool_total)
+    positions = rng.choice(pool_total, size=safe_count, replace=False)
+    groups = np.searchsorted(pool_ends, positions, side="right")
+    offsets_in_group = positions - (pool_ends[groups] - sizes[groups])
+    return selected.label_order[starts[groups] + offsets_in_group]
+
+
+def _resolve_label_filter(selected: DatasetView, labels: Sequence[int] | None) -> np.ndarray:
+    label_count = selected.label_offsets.shape[0] - 1
+    if labels is None:
+        # Stratify over every label that has rows in this split.
+        return np.flatnonzero(np.diff(selected.label_offsets))
+    label_ids = np.unique(np.asarray(labels, dtype=np.int64))
+    if label_ids.size == 0:
+        raise ValueError("label filter must not be empty")
+    if label_ids[0] < 0 or label_ids[-1] >= label_count:
+        raise ValueError(f"labels must be between 0 and {label_count - 1}")
+    empty = label_ids[np.diff(selected.label_offsets)[label_ids] == 0]
+    if empty.size:
+        raise ValueError(
+            f"label {int(empty[0])} has no samples in split '{selected.split}' "
+            f"of dataset '{selected.source}'"
+        )
+    return label_ids
+
+
+def _sample_metadata(selected: DatasetView) -> dict:
+    return {
         "source": selected.source,
         "displayName": selected.display_name,
         "split": selected.split,
@@ -330,13 +838,304 @@ def sample_dataset(
         "imageHeight": selected.image_height,
         "vectorLength": selected.vector_length,
         "totalCount": selected.total_count,
-        "samples": samples,
     }
-    if selected.vocab is not None:
-        response["vocab"] = selected.vocab
+
+
+def dataset_pca(
+    dataset: str = "mnist",
+    split: str | None = None,
+    components: int = 2,
+    dims: int = 2,
+) -> tuple[dict, list[tuple[str, np.ndarray]]]:
+    """
+    Return the leading principal components of a dataset split and its projection.
+
+    The decomposition (`PCA_MAX_COMPONENTS` components) runs once per split on
+    first use (see `projections.py`); later requests only slice the cached arrays.
+
+    @param dataset: Dataset id.
+    @param split: Optional split ("train"|"test"|"all"), validated per dataset.
+    @param components: Components to return (1..PCA_MAX_COMPONENTS).
+    @param dims: Projection dimensions per row (2 or 3).
+    @returns: Metadata (sample metadata plus `componentCount`, `dims`, `singularValues`,
+        `explainedVariance`, `explainedVarianceRatio`) and named float32 `mean`
+        (d,), `components` (k, d), `projection` (n, dims) and int64 `labels` (n,) arrays.
+    """
+    if not 1 <= components <= PCA_MAX_COMPONENTS:
+        raise ValueError(f"components must be between 1 and {PCA_MAX_COMPONENTS}")
+    if dims not in (2, 3):
+        raise ValueError("dims must be 2 or 3")
+
+    selected = get_dataset(dataset=dataset, split=split)
+    result = _split_pca(selected)
+    kept = min(components, result.components.shape[0])
+
+    metadata = _sample_metadata(selected)
+    metadata.update(
+        {
+            "componentCount": kept,
+            "dims": dims,
+            "singularValues": result.singular_values[:kept].tolist(),
+            "explainedVariance": result.explained_variance[:kept].tolist(),
+            "explainedVarianceRatio": result.explained_variance_ratio[:kept].tolist(),
+        }
+    )
+    blocks = [
+        ("mean", result.mean),
+        ("components", result.components[:kept]),
+        ("projection", result.scores[:, :dims]),
+        ("labels", np.asarray(selected.labels, dtype=np.int64)),
+    ]
+    return metadata, blocks
+
+
+def _split_pca(selected: DatasetView) -> PCAResult:
+    cache_key = (selected.source, selected.split)
+    cached = _split_pca_cache.get(cache_key)
+    if cached is not None and cached[0] is selected:
+        return cached[1]
+
+    # A separate lock from the load lock: sampling stays available while PCA runs.
+    with _derived_lock(_pca_locks, selected.source):
+        cached = _split_pca_cache.get(cache_key)
+        if cached is not None and cached[0] is selected:
+            return cached[1]
+        started = time.perf_counter()
+        result = truncated_pca(_row_matrix(selected), PCA_MAX_COMPONENTS)
+        logger.info(
+            "Computed PCA for %s/%s in %.2fs",
+            selected.source,
+            selected.split,
+            time.perf_counter() - started,
+        )
+        _split_pca_cache[cache_key] = (selected, result)
+        return result
+
+
+def dataset_neighbors(
+    dataset: str = "mnist",
+    split: str | None = None,
+    k: int = 10,
+    metric: NeighborMetric | None = None,
+    index: int | None = None,
+    vector: np.ndarray | None = None,
+    exact: bool = False,
+) -> dict:
+    """
+    Return the k rows of a split most similar to one of its rows or to a vector.
+
+    Image datasets support "l2" and "cosine" over the raw pixel vectors; text
+    datasets support "cosine" over word counts. The index (see `neighbors.py`)
+    is built once per split on first use.
+
+    @param dataset: Dataset id.
+    @param split: Optional split ("train"|"test"|"all"), validated per dataset.
+    @param k: Number of neighbours to return.
+    @param metric: "l2" or "cosine"; defaults to "l2" for images and "cosine" for text.
+    @param index: Query row within the split (excluded from the results).
+    @param vector: Query vector of length `vectorLength` (instead of `index`).
+    @param exact: Rank every row instead of probing the coarse clusters.
+    @returns: Sample metadata plus `metric`, `k`, `path` ("ivf"|"exact"), `queryIndex`
+        and `neighbors` (`index`, `label`, optional `labelName`, `score`: distance
+        for l2, similarity for cosine).
+    """
+    if (index is None) == (vector is None):
+        raise ValueError("provide exactly one of index or vector")
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    selected = get_dataset(dataset=dataset, split=split)
+    if metric is None:
+        metric = "l2" if selected.modality == "image" else "cosine"
+    if metric not in (("l2", "cosine") if selected.modality == "image" else ("cosine",)):
+        allowed = "'l2' or 'cosine'" if selected.modality == "image" else "'cosine'"
+        raise ValueError(f"metric must be {allowed} for dataset '{selected.source}'")
+
+    matrix = _row_matrix(selected)
+    if index is not None:
+        if not 0 <= index < selected.total_count:
+            raise ValueError(f"index must be between 0 and {selected.total_count - 1}")
+        query = matrix[index].toarray().ravel() if selected.counts is not None else matrix[index]
+    else:
+        if vector.shape != (selected.vector_length,):
+            raise ValueError(
+                f"vector length ({vector.shape[0]}) must match vectorLength "
+                f"({selected.vector_length})"
+            )
+        query = vector
+
+    result = search_neighbors(
+        matrix,
+        _split_neighbor_index(selected),
+        query,
+        k=k,
+        metric=metric,
+        exclude=index,
+        exact=exact,
+    )
+    label_ids = selected.labels[result.indices].tolist()
+    neighbors: list[dict] = []
+    for row, label_id, score in zip(result.indices.tolist(), label_ids, result.scores.tolist()):
+        neighbor = {"index": row, "label": label_id, "score": score}
+        label_name = _resolve_label_name(selected.label_names, label_id)
+        if label_name is not None:
+            neighbor["labelName"] = label_name
+        neighbors.append(neighbor)
+
+    response = _sample_metadata(selected)
+    response.update(
+        {
+            "metric": metric,
+            "k": k,
+            "path": result.path,
+            "queryIndex": index,
+            "neighbors": neighbors,
+        }
+    )
     return response
 
 
+def _split_neighbor_index(selected: DatasetView) -> NeighborIndex:
+    cache_key = (selected.source, selected.split)
+    cached = _split_neighbor_cache.get(cache_key)
+    if cached is not None and cached[0] is selected:
+        return cached[1]
+
+    with _derived_lock(_neighbor_locks, selected.source):
+        cached = _split_neighbor_cache.get(cache_key)
+        if cached is not None and cached[0] is selected:
+            return cached[1]
+        started = time.perf_counter()
+        neighbor_index = build_neighbor_index(_row_matrix(selected))
+        logger.info(
+            "Built neighbour index for %s/%s in %.2fs",
+            selected.source,
+            selected.split,
+            time.perf_counter() - started,
+        )
+        _split_neighbor_cache[cache_key] = (selected, neighbor_index)
+        return neighbor_index
+
+
+def dataset_class_stats(
+    dataset: str = "mnist",
+    split: str | None = None,
+    labels: Sequence[int] | None = None,
+) -> tuple[dict, list[tuple[str, np.ndarray]]]:
+    """
+    Return per-label row counts, mean vectors and variance vectors for a split.
+
+    Statistics for every label are computed in one pass on first use and
+    cached with the split; label filters slice that result. Splits whose
+    full result would exceed `CLASS_STATS_MAX_VALUES` are not cached: their
+    requests must name labels, and only those labels' rows are visited.
+
+    @param dataset: Dataset id.
+    @param split: Optional split ("train"|"test"|"all"), validated per dataset.
+    @param labels: Optional label ids to report (default: every label in the split).
+    @returns: Sample metadata (plus `labelNames` when known) and named `labels`/`counts`
+        (int64, (k,)) and `mean`/`variance` (float32, (k, vectorLength)) arrays.
+    """
+    selected = get_dataset(dataset=dataset, split=split)
+    label_ids = _resolve_label_filter(selected, labels)
+    stats = _split_class_stats(selected)
+    if stats is not None:
+        positions = np.searchsorted(stats.label_ids, label_ids)
+        counts, means, variances = (
+            stats.counts[positions],
+            stats.means[positions],
+            stats.variances[positions],
+        )
+    else:
+        max_labels = CLASS_STATS_MAX_VALUES // selected.vector_length
+        if label_ids.shape[0] > max_labels:
+            raise ValueError(
+                f"dataset '{selected.source}' has too many labels for full statistics; "
+                f"request at most {max_labels} labels"
+            )
+        rows = np.sort(
+            np.concatenate(
+                [
+                    selected.label_order[
+                        selected.label_offsets[label_id] : selected.label_offsets[label_id + 1]
+                    ]
+                    for label_id in label_ids.tolist()
+                ]
+            )
+        )
+        filtered = class_statistics(_row_matrix(selected), selected.labels, label_ids, rows)
+        counts, means, variances = filtered.counts, filtered.means, filtered.variances
+
+    metadata = _sample_metadata(selected)
+    if selected.label_names is not None:
+        metadata["labelNames"] = [
+            _resolve_label_name(selected.label_names, label_id) for label_id in label_ids.tolist()
+        ]
+    blocks = [
+        ("labels", label_ids.astype(np.int64, copy=False)),
+        ("counts", counts),
+        ("mean", means),
+        ("variance", variances),
+    ]
+    return metadata, blocks
+
+
+def _split_class_stats(selected: DatasetView) -> ClassStats | None:
+    cache_key = (selected.source, selected.split)
+    cached = _split_class_stats_cache.get(cache_key)
+    if cached is not None and cached[0] is selected:
+        return cached[1]
+
+    with _derived_lock(_class_stats_locks, selected.source):
+        cached = _split_class_stats_cache.get(cache_key)
+        if cached is not None and cached[0] is selected:
+            return cached[1]
+        label_ids = _resolve_label_filter(selected, None)
+        stats = None
+        if label_ids.shape[0] * selected.vector_length <= CLASS_STATS_MAX_VALUES:
+            started = time.perf_counter()
+            stats = class_statistics(_row_matrix(selected), selected.labels, label_ids)
+            logger.info(
+                "Computed class statistics for %s/%s in %.2fs",
+                selected.source,
+                selected.split,
+                time.perf_counter() - started,
+            )
+        _split_class_stats_cache[cache_key] = (selected, stats)
+        return stats
+
+
+def _row_matrix(selected: DatasetView) -> np.ndarray | sparse.csr_matrix:
+    # One row per sample: flattened pixels (a view, so memmaps stay shared) or CSR counts.
+    if selected.images is not None:
+        return selected.images.reshape(selected.total_count, -1)
+    return selected.counts
+
+
+def _derived_lock(locks: dict[DatasetName, threading.Lock], source: DatasetName) -> threading.Lock:
+    lock = locks.get(source)
+    if lock is None:
+        with _cache_lock:
+            lock = locks.setdefault(source, threading.Lock())
+    return lock
+
+
+def dataset_vocab(dataset: str) -> dict:
+    """
+    Return a text dataset's vocabulary with its content-hash version.
+
+    @param dataset: Dataset id.
+    @returns: Serializable dict with `source`, `vocabVersion` and `vocab`.
+    """
+    selected = get_dataset(dataset=dataset)
+    if selected.vocab is None:
+        raise ValueError(f"dataset '{selected.source}' has no vocabulary")
+    return {
+        "source": selected.source,
+        "vocabVersion": selected.vocab_version,
+        "vocab": selected.vocab,
+    }
+
+
 def get_dataset(dataset: str = "mnist", split: str | None = None) -> DatasetView:
     """
     Load and cache the requested dataset + split.
@@ -350,10 +1149,11 @@ def get_dataset(dataset: str = "mnist", split: str | None = None) -> DatasetView
     cache_key = (spec.source, resolved_split)
 
     cached = _split_dataset_cache.get(cache_key)
+    _count_split_cache_lookup(spec.source, hit=cached is not None)
     if cached is not None:
         return cached
 
-    with _cache_lock:
+    with _dataset_lock(spec.source):
         cached = _split_dataset_cache.get(cache_key)
         if cached is not None:
             return cached
@@ -367,14 +1167,371 @@ def get_dataset(dataset: str = "mnist", split: str | None = None) -> DatasetView
                 for key in stale_keys:
                     del _split_dataset_cache[key]
         if raw_dataset is None:
-            raw_dataset = spec.loader()
+            _dataset_load_states[spec.source] = "loading"
+            try:
+                with timed_stage("dataset-load"):
+                    raw_dataset = _load_raw_dataset(spec)
+            except Exception as exc:
+                _dataset_load_states[spec.source] = "failed"
+                _dataset_load_errors[spec.source] = f"{exc.__class__.__name__}: {exc}"
+                raise
             _raw_dataset_cache[spec.source] = raw_dataset
+            _dataset_load_states[spec.source] = "ready"
+            _dataset_load_errors.pop(spec.source, None)
 
-        prepared = _prepare_dataset_view(raw_dataset, resolved_split)
+        with timed_stage("split-slice"):
+            prepared = _prepare_dataset_view(raw_dataset, resolved_split)
         _split_dataset_cache[cache_key] = prepared
         return prepared
 
 
+def _count_split_cache_lookup(source: DatasetName, hit: bool) -> None:
+    key = (source, "hit" if hit else "miss")
+    with _split_cache_lookups_lock:
+        _split_cache_lookups[key] = _split_cache_lookups.get(key, 0) + 1
+
+
+def warm_up_datasets(datasets: Sequence[str]) -> list[threading.Thread]:
+    """
+    Load datasets in background threads, one thread per dataset.
+
+    Each dataset loads under its own lock, so warm-ups run in parallel and a
+    request for an already-loaded dataset is never blocked by them.
+
+    @param datasets: Dataset ids to load (default split each).
+    @returns: Started daemon threads.
+    """
+    threads: list[threading.Thread] = []
+    for dataset in datasets:
+        spec = _get_dataset_spec(dataset)
+        thread = threading.Thread(
+            target=_warm_up_dataset,
+            args=(spec.source,),
+            name=f"warm-up-{spec.source}",
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+    return threads
+
+
+def dataset_readiness(required: Sequence[str]) -> dict:
+    """
+    Report per-dataset load state and whether all required datasets are ready.
+
+    @param required: Dataset ids that must be loaded for the service to be ready.
+    @returns: `{"ready": bool, "datasets": [{"id","state","required","loadSeconds","error"}]}`.
+    """
+    required_sources = {_get_dataset_spec(dataset).source for dataset in required}
+    entries: list[dict] = []
+    for source in DATASET_SPECS:
+        stats = _dataset_load_stats.get(source)
+        entries.append(
+            {
+                "id": source,
+                "state": _dataset_load_states.get(source, "cold"),
+                "required": source in required_sources,
+                "loadSeconds": round(stats.duration_seconds, 4) if stats is not None else None,
+                "error": _dataset_load_errors.get(source),
+            }
+        )
+    ready = all(
+        _dataset_load_states.get(source) == "ready" for source in required_sources
+    )
+    return {"ready": ready, "datasets": entries}
+
+
+def dataset_version(dataset: str) -> str:
+    """
+    Return a content-derived version of a dataset, loading it if needed.
+
+    The version is the store's `contentDigest` (hashed from the arrays on first
+    use when the dataset was not read from the store), so it only changes
+    when the served data changes, across restarts and workers alike.
+
+    @param dataset: Dataset id.
+    @returns: 16-character hex version.
+    """
+    source = get_dataset(dataset=dataset).source
+    version = _dataset_versions.get(source)
+    if version is None:
+        with _dataset_lock(source):
+            version = _dataset_versions.get(source)
+            if version is None:
+                version = dataset_content_digest(_raw_dataset_cache[source])[:16]
+                _dataset_versions[source] = version
+    return version
+
+
+def _warm_up_dataset(source: DatasetName) -> None:
+    try:
+        get_dataset(dataset=source)
+    except Exception:
+        # The failure is recorded in the load state and surfaced by readiness.
+        logger.exception("Warm-up failed for dataset %s", source)
+
+
+def _dataset_lock(source: DatasetName) -> threading.Lock:
+    lock = _dataset_locks.get(source)
+    if lock is None:
+        with _cache_lock:
+            lock = _dataset_locks.setdefault(source, threading.Lock())
+    return lock
+
+
+def dataset_load_stats() -> list[dict]:
+    """
+    Report timing and peak-memory figures for datasets loaded by this process.
+
+    @returns: JSON-ready load stats, one entry per loaded dataset.
+    """
+    return [
+        {
+            "dataset": stats.source,
+            "origin": stats.origin,
+            "durationSeconds": round(stats.duration_seconds, 4),
+            "peakTracedBytes": stats.peak_traced_bytes,
+            "maxRssBytes": stats.max_rss_bytes,
+        }
+        for stats in list(_dataset_load_stats.values())
+    ]
+
+
+def split_cache_stats() -> list[dict]:
+    """
+    Report `get_dataset` split-cache lookups per dataset.
+
+    @returns: One entry per dataset looked up, with `dataset`, `hits` and `misses`.
+    """
+    with _split_cache_lookups_lock:
+        lookups = dict(_split_cache_lookups)
+    sources = sorted({source for source, _ in lookups})
+    return [
+        {
+            "dataset": source,
+            "hits": lookups.get((source, "hit"), 0),
+            "misses": lookups.get((source, "miss"), 0),
+        }
+        for source in sources
+    ]
+
+
+def dataset_memory_stats() -> list[dict]:
+    """
+    Report the array memory held per loaded dataset.
+
+    `rawBytes` covers the loaded arrays (images, labels, CSR counts). Memmapped
+    arrays count at full size even though their pages are shared between workers.
+    `derivedBytes` covers everything built from them: label indexes, PCA, neighbour
+    indexes, class statistics and text weightings. Text strings are not counted.
+
+    @returns: One entry per loaded dataset with `dataset`, `rawBytes`, `derivedBytes`.
+    """
+    derived: dict[DatasetName, int] = {}
+
+    def add(source: DatasetName, *values: object) -> None:
+        derived[source] = derived.get(source, 0) + sum(_array_bytes(value) for value in values)
+
+    for (source, _), view in list(_split_dataset_cache.items()):
+        add(source, view.label_order, view.label_offsets)
+    for cache in (_split_pca_cache, _split_neighbor_cache, _split_class_stats_cache):
+        for (source, _), (_, result) in list(cache.items()):
+            add(source, result)
+    for (source, _, _), (_, matrix) in list(_split_weighting_cache.items()):
+        # Weighted matrices share indices/indptr with `counts`; only `data` is their own.
+        add(source, matrix.data)
+
+    return [
+        {
+            "dataset": source,
+            "rawBytes": _array_bytes(raw_dataset.images, raw_dataset.labels, raw_dataset.counts),
+            "derivedBytes": derived.get(source, 0),
+        }
+        for source, raw_dataset in list(_raw_dataset_cache.items())
+    ]
+
+
+def _array_bytes(*values: object) -> int:
+    # Sums ndarrays, CSR buffers, and the array fields of result dataclasses.
+    total = 0
+    for value in values:
+        if isinstance(value, np.ndarray):
+            total += value.nbytes
+        elif sparse.issparse(value):
+            total += value.data.nbytes + value.indices.nbytes + value.indptr.nbytes
+        elif is_dataclass(value):
+            total += _array_bytes(*(getattr(value, field.name) for field in fields(value)))
+    return total
+
+
+def _begin_load_tracing() -> None:
+    """
+    Count a traced load in, starting tracemalloc (or resetting its peak) for the first one.
+    """
+    global _load_tracing_active, _load_tracing_started
+    with _load_tracing_lock:
+        if _load_tracing_active == 0:
+            # Resetting while other loads trace would truncate their peaks.
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                _load_tracing_started = True
+        _load_tracing_active += 1
+
+
+def _end_load_tracing() -> int:
+    """
+    Count a traced load out, stopping tracemalloc after the last one if loads started it.
+
+    @returns: Peak traced bytes since the first overlapping load began.
+    """
+    global _load_tracing_active, _load_tracing_started
+    with _load_tracing_lock:
+        peak = tracemalloc.get_traced_memory()[1]
+        _load_tracing_active -= 1
+        if _load_tracing_active == 0 and _load_tracing_started:
+            tracemalloc.stop()
+            _load_tracing_started = False
+        return peak
+
+
+def _load_raw_dataset(spec: DatasetSpec) -> RawDataset:
+    """
+    Load a dataset and record its load duration and peak memory.
+
+    Peak memory comes from tracemalloc (numpy buffers included) when
+    `DATASET_LOAD_TRACE_MEMORY=1` or a budget is configured; tracing is
+    process-wide, so loads that overlap in time share one peak figure (each
+    reads the peak since the first of them started).
+
+    @param spec: Dataset registry entry.
+    @returns: Prepared raw dataset.
+    """
+    if DATASET_LOAD_TRACE_MEMORY:
+        _begin_load_tracing()
+
+    started = time.perf_counter()
+    try:
+        raw_dataset, origin, content_digest = _read_or_build_raw_dataset(spec)
+    finally:
+        duration = time.perf_counter() - started
+        peak_traced = _end_load_tracing() if DATASET_LOAD_TRACE_MEMORY else None
+
+    stats = DatasetLoadStats(
+        source=spec.source,
+        origin=origin,
+        duration_seconds=duration,
+        peak_traced_bytes=peak_traced,
+        max_rss_bytes=_max_rss_bytes(),
+    )
+    _dataset_load_stats[spec.source] = stats
+    if content_digest is not None:
+        _dataset_versions[spec.source] = content_digest[:16]
+    else:
+        _dataset_versions.pop(spec.source, None)
+    budget_bytes = int(DATASET_LOAD_MEMORY_BUDGET_MB * 1024 * 1024)
+    if budget_bytes and peak_traced is not None and peak_traced > budget_bytes:
+        logger.warning(
+            "Loading %s peaked at %.1f MB, over the %.1f MB budget",
+            spec.source,
+            peak_traced / 1024 / 1024,
+            DATASET_LOAD_MEMORY_BUDGET_MB,
+        )
+    else:
+        logger.info(
+            "Loaded %s from %s in %.2fs (peak traced bytes=%s, max RSS bytes=%s)",
+            spec.source,
+            origin,
+            duration,
+            stats.peak_traced_bytes,
+            stats.max_rss_bytes,
+        )
+    return raw_dataset
+
+
+def _max_rss_bytes() -> int | None:
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return int(max_rss if sys.platform == "darwin" else max_rss * 1024)
+
+
+def _read_or_build_raw_dataset(
+    spec: DatasetSpec,
+) -> tuple[RawDataset, Literal["store", "source"], str | None]:
+    """
+    Load a dataset from the preprocessed store, falling back to its source loader.
+
+    A fresh source load is written back to the store so the next process start
+    can skip fetching and normalizing it. When memory mapping is enabled the
+    fresh copy is then re-opened from the store, so this process shares pages
+    with every other worker instead of keeping a private copy.
+
+    @param spec: Dataset registry entry.
+    @returns: Prepared raw dataset, where it was loaded from, and its store
+        `contentDigest` when known without rehashing.
+    """
+    if DATASET_STORE_ENABLED:
+        stored = read_dataset_store(DATASET_STORE_ROOT, spec.source, mmap=DATASET_MMAP_ENABLED)
+        if stored is not None:
+            raw_dataset = _raw_dataset_from_store(stored)
+            # Stores written under older tokenization rules are rebuilt below.
+            if not _contains_invalid_vocab_tokens(raw_dataset.vocab):
+                return raw_dataset, "store", stored["meta"].get("contentDigest")
+
+    raw_dataset = spec.loader()
+    if DATASET_STORE_ENABLED:
+        try:
+            write_dataset_store(raw_dataset, DATASET_STORE_ROOT, overwrite=True)
+        except OSError:
+            # The store is an optimization; serving must not depend on a writable disk.
+            logger.warning("Could not persist dataset %s to the store", spec.source, exc_info=True)
+            return raw_dataset, "source", None
+        if DATASET_MMAP_ENABLED:
+            stored = read_dataset_store(DATASET_STORE_ROOT, spec.source, mmap=True)
+            if stored is not None:
+                return (
+                    _raw_dataset_from_store(stored),
+                    "source",
+                    stored["meta"].get("contentDigest"),
+                )
+    return raw_dataset, "source", None
+
+
+def _raw_dataset_from_store(stored: dict) -> RawDataset:
+    meta = stored["meta"]
+    arrays = stored["arrays"]
+    label_names = tuple(meta["labelNames"]) if meta["labelNames"] is not None else None
+    if meta["modality"] == "image":
+        return _prepare_image_dataset(
+            source=meta["source"],
+            display_name=meta["displayName"],
+            images=arrays["images"],
+            labels=arrays["labels"],
+            label_names=label_names,
+            supports_train_test=meta["supportsTrainTest"],
+        )
+
+    # copy=False keeps memmapped CSR buffers shared instead of pulling them into the heap.
+    counts = sparse.csr_matrix(
+        (arrays["counts_data"], arrays["counts_indices"], arrays["counts_indptr"]),
+        shape=tuple(meta["countsShape"]),
+        copy=False,
+    )
+    return _prepare_text_dataset(
+        source=meta["source"],
+        display_name=meta["displayName"],
+        texts=stored["texts"],
+        labels=arrays["labels"],
+        label_names=label_names,
+        counts=counts,
+        vocab=tuple(meta["vocab"]),
+        supports_train_test=meta["supportsTrainTest"],
+    )
+
+
 def _get_dataset_spec(dataset: str) -> DatasetSpec:
     normalized = dataset.strip().lower()
     spec = DATASET_SPECS.get(normalized)
@@ -417,11 +1574,13 @@ def _prepare_dataset_view(raw_dataset: RawDataset, split: DatasetSplit) -> Datas
             label_names=raw_dataset.label_names,
             texts=None,
             vocab=None,
+            vocab_version=None,
             counts=None,
             image_width=image_width,
             image_height=image_height,
             vector_length=raw_dataset.vector_length,
             total_count=int(sliced_images.shape[0]),
+            **_label_index(sliced_labels),
         )
 
     sliced_texts, sliced_labels, sliced_counts = _slice_texts_for_split(raw_dataset, split)
@@ -438,14 +1597,24 @@ def _prepare_dataset_view(raw_dataset: RawDataset, split: DatasetSplit) -> Datas
         label_names=raw_dataset.label_names,
         texts=sliced_texts,
         vocab=raw_dataset.vocab,
+        vocab_version=raw_dataset.vocab_version,
         counts=sliced_counts,
         image_width=1,
         image_height=1,
         vector_length=raw_dataset.vector_length,
         total_count=int(sliced_counts.shape[0]),
+        **_label_index(sliced_labels),
     )
 
 
+def _label_index(labels: np.ndarray) -> dict[str, np.ndarray]:
+    # One stable argsort per view; label ids are non-negative ints (see `_to_label_ids`).
+    label_order = np.argsort(labels, kind="stable")
+    label_offsets = np.zeros(int(labels.max(initial=-1)) + 2, dtype=np.int64)
+    np.cumsum(np.bincount(labels), out=label_offsets[1:])
+    return {"label_order": label_order, "label_offsets": label_offsets}
+
+
 def _slice_images_for_split(
     raw_dataset: RawDataset, split: DatasetSplit
 ) -> tuple[np.ndarray, np.ndarray]:
@@ -483,13 +1652,84 @@ def _slice_texts_for_split(
         return (
             raw_dataset.texts[:boundary],
             raw_dataset.labels[:boundary],
-            raw_dataset.counts[:boundary],
+            _csr_row_range(raw_dataset.counts, 0, boundary),
         )
     return (
         raw_dataset.texts[boundary:],
         raw_dataset.labels[boundary:],
-        raw_dataset.counts[boundary:],
+        _csr_row_range(raw_dataset.counts, boundary, total),
+    )
+
+
+def _csr_row_range(matrix: sparse.csr_matrix, start: int, stop: int) -> sparse.csr_matrix:
+    # CSR row slicing copies data/indices; build a view over the (possibly
+    # memmapped) buffers instead and only rebase the small indptr array.
+    # Buffers are assigned after construction because the constructor's
+    # prune() copies views that are much smaller than their base array.
+    indptr = matrix.indptr[start : stop + 1]
+    first, last = int(indptr[0]), int(indptr[-1])
+    view = sparse.csr_matrix((stop - start, matrix.shape[1]), dtype=matrix.dtype)
+    view.data = matrix.data[first:last]
+    view.indices = matrix.indices[first:last]
+    view.indptr = indptr - first
+    return view
+
+
+def _pixels_to_uint8(
+    payload: dict,
+    key: str,
+    scale: float = 1.0,
+    dtype: np.dtype | type | None = None,
+    chunk_rows: int = PIXEL_CONVERT_CHUNK_ROWS,
+) -> np.ndarray:
+    """
+    Pop float pixel rows from `payload` and round, clip and cast them to uint8 in
+    fixed-size row blocks.
+
+    Converting the whole payload at once allocates several full-size float
+    temporaries (rounded, clipped, cast); blocks keep the extra memory to one
+    small scratch buffer. Popping the rows here leaves this function with the only
+    reference to them (unless the payload shared them elsewhere), so rows are
+    converted from the end and the source buffer is shrunk after each block: the
+    float payload is released as the uint8 copy grows.
+
+    @param payload: Mapping holding the float pixel rows, shape (n, ...); `key` is
+        removed from it.
+    @param key: Entry of `payload` with the rows.
+    @param scale: Factor applied before rounding (e.g. 255 for 0..1 inputs).
+    @param dtype: Float dtype to read the rows as (None keeps theirs).
+    @param chunk_rows: Rows converted per block.
+    @returns: uint8 array with the same shape as the rows.
+    """
+    pixels = np.asarray(payload.pop(key), dtype=dtype)
+    total = int(pixels.shape[0])
+    row_shape = tuple(pixels.shape[1:])
+    images = np.empty(pixels.shape, dtype=np.uint8)
+    if total == 0:
+        return images
+
+    scratch = np.empty(
+        (min(chunk_rows, total), *row_shape), dtype=np.result_type(pixels.dtype, np.float32)
     )
+    can_shrink = pixels.flags.owndata and pixels.flags.c_contiguous
+    stop = total
+    while stop > 0:
+        start = max(stop - chunk_rows, 0)
+        block = scratch[: stop - start]
+        np.multiply(pixels[start:stop], scale, out=block, casting="same_kind")
+        np.rint(block, out=block)
+        np.clip(block, 0, 255, out=block)
+        images[start:stop] = block
+        del block
+        if can_shrink and start > 0:
+            try:
+                pixels.resize((start, *row_shape), refcheck=True)
+            except ValueError:
+                # Someone else still references the rows; keep them intact.
+                logger.debug("Pixel rows are shared; converting without releasing them")
+                can_shrink = False
+        stop = start
+    return images
 
 
 def _prepare_image_dataset(
@@ -524,6 +1764,7 @@ def _prepare_image_dataset(
         label_names=label_names,
         texts=None,
         vocab=None,
+        vocab_version=None,
         counts=None,
         supports_train_test=supports_train_test,
         vector_length=vector_length,
@@ -564,12 +1805,19 @@ def _prepare_text_dataset(
         label_names=label_names,
         texts=tuple(texts),
         vocab=tuple(vocab),
+        vocab_version=_vocab_version(vocab),
         counts=counts_csr,
         supports_train_test=supports_train_test,
         vector_length=int(counts_csr.shape[1]),
     )
 
 
+def _vocab_version(vocab: tuple[str, ...]) -> str:
+    # Content hash, so clients and CDNs can cache a vocab version forever.
+    digest = hashlib.sha256("\n".join(vocab).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
 def _first_sentence(text: str, max_length: int = 200) -> str:
     if not text:
         return ""
@@ -0,0 +1,154 @@
+"""
+LU, QR and SVD factorizations that are computed once and reused for many right-hand sides.
+
+`factorize` does the O(n^3) work; `solve_factorization` and
+`project_factorization` then cost O(n^2) per vector:
+  lu   square, non-singular (`scipy.linalg.lu_factor`); solves A x = b exactly
+  qr   rows >= columns, full column rank (reduced `np.linalg.qr`); least-squares
+       solve via R x = Q^T b, projection Q Q^T b onto the column space
+  svd  any shape (`np.linalg.svd`, thin); minimum-norm least-squares solve and
+       projection onto the column space, ignoring singular values under the
+       rank tolerance (as `np.linalg.matrix_rank` does)
+
+Right-hand sides come as rows of a (k, rows) array so one call serves a whole batch.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal
+import warnings
+
+import numpy as np
+
+FactorizationKind = Literal["lu", "qr", "svd"]
+
+FACTORIZATION_KINDS: tuple[FactorizationKind, ...] = ("lu", "qr", "svd")
+
+RANK_DEFICIENT_MESSAGE = (
+    "matrix does not have full column rank; use an svd factorization for least squares"
+)
+
+
+@dataclass(frozen=True)
+class Factorization:
+    kind: FactorizationKind
+    shape: tuple[int, int]
+    # lu: `lu` (packed L\U), `piv`; qr: `q`, `r`; svd: `u`, `s`, `vt`.
+    factors: dict[str, np.ndarray]
+    rank: int
+
+    @property
+    def nbytes(self) -> int:
+        return sum(factor.nbytes for factor in self.factors.values())
+
+
+def factorize(matrix: np.ndarray, kind: FactorizationKind) -> Factorization:
+    """
+    Factorize a matrix for later solves and projections.
+
+    @param matrix: Finite float64 (rows, columns) array.
+    @param kind: `lu`, `qr` or `svd`.
+    @returns: `Factorization` holding the factors and the numerical rank.
+    @throws ValueError: On an unknown kind, a shape the kind does not support or a
+        singular matrix (LU).
+    """
+    rows, columns = matrix.shape
+    if kind == "lu":
+        if rows != columns:
+            raise ValueError("lu factorization requires a square matrix")
+        # Imported here: scipy.linalg is only needed once someone factorizes.
+        from scipy import linalg
+
+        with warnings.catch_warnings():
+            # Exactly singular inputs warn; they are rejected below instead.
+            warnings.simplefilter("ignore", linalg.LinAlgWarning)
+            lu, piv = linalg.lu_factor(matrix, check_finite=False)
+        pivots = np.abs(np.diag(lu))
+        if pivots.min() <= _rank_tolerance(matrix.shape, pivots.max()):
+            raise ValueError("matrix is singular; use an svd factorization for least squares")
+        return Factorization("lu", (rows, columns), {"lu": lu, "piv": piv}, rank=rows)
+    if kind == "qr":
+        if rows < columns:
+            raise ValueError("qr factorization requires at least as many rows as columns")
+        q, r = np.linalg.qr(matrix, mode="reduced")
+        diagonal = np.abs(np.diag(r))
+        rank = int((diagonal > _rank_tolerance(matrix.shape, diagonal.max())).sum())
+        return Factorization("qr", (rows, columns), {"q": q, "r": r}, rank=rank)
+    if kind == "svd":
+        u, s, vt = np.linalg.svd(matrix, full_matrices=False)
+        rank = int((s > _rank_tolerance(matrix.shape, s[0])).sum())
+        return Factorization("svd", (rows, columns), {"u": u, "s": s, "vt": vt}, rank=rank)
+    raise ValueError(f"kind must be one of: {', '.join(FACTORIZATION_KINDS)}")
+
+
+def solve_factorization(factorization: Factorization, vectors: np.ndarray) -> np.ndarray:
+    """
+    Solve A x = b for each row b of `vectors` (least squares for qr/svd).
+
+    @param factorization: Result of `factorize`.
+    @param vectors: Finite float64 (k, rows) right-hand sides.
+    @returns: (k, columns) solutions; svd returns the minimum-norm least-squares solution.
+    @throws ValueError: qr factorization of a rank-deficient matrix.
+    """
+    factors = factorization.factors
+    if factorization.kind == "lu":
+        from scipy import linalg
+
+        return linalg.lu_solve((factors["lu"], factors["piv"]), vectors.T, check_finite=False).T
+    if factorization.kind == "qr":
+        if factorization.rank < factorization.shape[1]:
+            raise ValueError(RANK_DEFICIENT_MESSAGE)
+        from scipy import linalg
+
+        return linalg.solve_triangular(
+            factors["r"], factors["q"].T @ vectors.T, check_finite=False
+        ).T
+    rank = factorization.rank
+    u, s, vt = factors["u"][:, :rank], factors["s"][:rank], factors["vt"][:rank]
+    return ((vectors @ u) / s) @ vt
+
+
+def project_factorization(factorization: Factorization, vectors: np.ndarray) -> np.ndarray:
+    """
+    Orthogonally project each row of `vectors` onto the matrix's column space.
+
+    @param factorization: Result of `factorize`.
+    @param vectors: Finite float64 (k, rows) vectors.
+    @returns: (k, rows) projections (the vectors themselves for lu, whose matrix is
+        non-singular and so spans every vector).
+    @throws ValueError: qr factorization of a rank-deficient matrix.
+    """
+    factors = factorization.factors
+    if factorization.kind == "lu":
+        return vectors.copy()
+    if factorization.kind == "qr":
+        if factorization.rank < factorization.shape[1]:
+            raise ValueError(RANK_DEFICIENT_MESSAGE)
+        basis = factors["q"]
+    else:
+        basis = factors["u"][:, : factorization.rank]
+    return (vectors @ basis) @ basis.T
+
+
+def explicit_factors(factorization: Factorization) -> dict[str, np.ndarray]:
+    """
+    Unpack the stored factors into the matrices a reader expects.
+
+    @returns: lu: `l` (unit lower), `u` and `permutation` with A[permutation] = L U;
+        qr: `q`, `r` with A = Q R; svd: `u`, `s`, `vt` with A = U diag(s) Vt.
+    """
+    factors = factorization.factors
+    if factorization.kind != "lu":
+        return dict(factors)
+    lu, piv = factors["lu"], factors["piv"]
+    permutation = np.arange(lu.shape[0])
+    # LAPACK pivots are sequential row swaps: row i was exchanged with row piv[i].
+    for row, pivot in enumerate(piv):
+        permutation[[row, pivot]] = permutation[[pivot, row]]
+    lower = np.tril(lu, k=-1) + np.eye(lu.shape[0])
+    return {"l": lower, "u": np.triu(lu), "permutation": permutation}
+
+
+def _rank_tolerance(shape: tuple[int, int], scale: float) -> float:
+    return max(shape) * np.finfo(np.float64).eps * scale
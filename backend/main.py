@@ -1,14 +1,157 @@
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+import hashlib
+import json
 import os
 import logging
-from fastapi import FastAPI, HTTPException, Query
+import operator
+from typing import Callable, Iterator
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response, WebSocket
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 import numpy as np
 
 try:
-    from .datasets import available_datasets, sample_dataset
+    from .caching import LRUCache, array_digest
+    from .compute import (
+        MATRIX_INLINE_MAX_COST,
+        ComputeLimitError,
+        apply_cost,
+        compute_stats,
+        decode_cost,
+        decode_matrix_json,
+        eig_cost,
+        factorization_cost,
+        run_matrix_job,
+        run_matrix_job_async,
+        shutdown_compute_pool,
+        sparse_apply_cost,
+        sparse_eig_cost,
+    )
+    from .datasets import (
+        available_datasets,
+        dataset_class_stats,
+        dataset_load_stats,
+        dataset_memory_stats,
+        dataset_modality,
+        dataset_neighbors,
+        dataset_pca,
+        dataset_readiness,
+        dataset_version,
+        dataset_vocab,
+        parse_stream_cursor,
+        resolve_dataset_split,
+        sample_dataset,
+        sample_dataset_arrays,
+        split_cache_stats,
+        stream_dataset_arrays,
+        stream_dataset_samples,
+        text_weighting_stats,
+        warm_up_datasets,
+    )
+    from .factorizations import (
+        FACTORIZATION_KINDS,
+        Factorization,
+        explicit_factors,
+        factorize,
+        project_factorization,
+        solve_factorization,
+    )
+    from .matrices import eig_decompose
+    from .metrics import (
+        PROMETHEUS_MEDIA_TYPE,
+        REQUEST_DURATION,
+        STAGE_DURATION,
+        MetricFamily,
+        MetricsMiddleware,
+        render_metrics,
+        timed_stage,
+    )
+    from .sparse_matrices import (
+        SPARSE_EIG_DEFAULT_K,
+        SPARSE_EIG_WHICH,
+        sparse_eig,
+        sparse_matrix_from_payload,
+    )
+    from .wire import (
+        FRAME_MEDIA_TYPE,
+        FRAME_STREAM_MEDIA_TYPE,
+        accepts_frame,
+        accepts_media_type,
+        encode_frame,
+    )
 except ImportError:
     # Allow `uvicorn main:app` when running from backend/.
-    from datasets import available_datasets, sample_dataset
+    from caching import LRUCache, array_digest
+    from compute import (
+        MATRIX_INLINE_MAX_COST,
+        ComputeLimitError,
+        apply_cost,
+        compute_stats,
+        decode_cost,
+        decode_matrix_json,
+        eig_cost,
+        factorization_cost,
+        run_matrix_job,
+        run_matrix_job_async,
+        shutdown_compute_pool,
+        sparse_apply_cost,
+        sparse_eig_cost,
+    )
+    from datasets import (
+        available_datasets,
+        dataset_class_stats,
+        dataset_load_stats,
+        dataset_memory_stats,
+        dataset_modality,
+        dataset_neighbors,
+        dataset_pca,
+        dataset_readiness,
+        dataset_version,
+        dataset_vocab,
+        parse_stream_cursor,
+        resolve_dataset_split,
+        sample_dataset,
+        sample_dataset_arrays,
+        split_cache_stats,
+        stream_dataset_arrays,
+        stream_dataset_samples,
+        text_weighting_stats,
+        warm_up_datasets,
+    )
+    from factorizations import (
+        FACTORIZATION_KINDS,
+        Factorization,
+        explicit_factors,
+        factorize,
+        project_factorization,
+        solve_factorization,
+    )
+    from matrices import eig_decompose
+    from metrics import (
+        PROMETHEUS_MEDIA_TYPE,
+        REQUEST_DURATION,
+        STAGE_DURATION,
+        MetricFamily,
+        MetricsMiddleware,
+        render_metrics,
+        timed_stage,
+    )
+    from sparse_matrices import (
+        SPARSE_EIG_DEFAULT_K,
+        SPARSE_EIG_WHICH,
+        sparse_eig,
+        sparse_matrix_from_payload,
+    )
+    from wire import (
+        FRAME_MEDIA_TYPE,
+        FRAME_STREAM_MEDIA_TYPE,
+        accepts_frame,
+        accepts_media_type,
+        encode_frame,
+    )
 
 logger = logging.getLogger(__name__)
 
@@ -25,8 +168,92 @@ def _cors_origins() -> list[str]:
     return [o.strip() for o in raw.split(",") if o.strip()]
 
 
-app = FastAPI(title="Linear Algebra Demos API", version="0.1.0")
+def _warm_up_datasets() -> list[str]:
+    """
+    Comma-separated dataset ids to load in the background at startup, e.g.
+      DATASET_WARMUP=mnist,20newsgroups
+
+    `/ready` reports 503 until every listed dataset has loaded.
+    """
+    raw = os.getenv("DATASET_WARMUP", "").strip()
+    return [d.strip() for d in raw.split(",") if d.strip()]
+
+
+WARM_UP_DATASETS = _warm_up_datasets()
+
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI):
+    # Loads run in daemon threads so startup (and /health) is not delayed.
+    warm_up_datasets(WARM_UP_DATASETS)
+    yield
+    shutdown_compute_pool()
+
+
+app = FastAPI(title="Linear Algebra Demos API", version="0.1.0", lifespan=_lifespan)
 MAX_DATASET_SAMPLES = 64
+# Text rows are assembled in bulk from the CSR matrix, so they allow larger requests.
+MAX_TEXT_DATASET_SAMPLES = 256
+# Version-pinned vocab URLs never change content, so caches may keep them indefinitely.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+# Seeded samples are deterministic for a given dataset version; shared caches may
+# keep them for an hour and then revalidate with the ETag.
+SEEDED_SAMPLES_CACHE_CONTROL = "public, max-age=3600"
+UNSEEDED_SAMPLES_CACHE_CONTROL = "no-store"
+
+# Upper bound on neighbours per nearest-neighbour query.
+MAX_NEIGHBORS = 100
+
+# Rows per streamed samples page; pages continue via `nextCursor`.
+MAX_STREAM_SAMPLES = 10_000
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Upper bound on vectors (or matrix/vector pairs) per batched apply request.
+MAX_MATRIX_BATCH = 1024
+# Matrix request bodies above this size are rejected (413) before JSON decoding; the
+# default admits a full-precision 2000x2000 matrix (~80 MB of JSON), the largest
+# eig `MATRIX_MAX_COST` allows.
+MAX_MATRIX_REQUEST_BYTES = int(os.getenv("MAX_MATRIX_REQUEST_BYTES", "") or 96 * 1024 * 1024)
+# Results a matrix session can compute for each state (`ops`).
+MATRIX_SESSION_OPS = ("apply", "eig")
+# WebSocket close code for messages over MAX_MATRIX_REQUEST_BYTES (RFC 6455 "message too big").
+WS_CLOSE_MESSAGE_TOO_BIG = 1009
+
+_encoded_vocab_cache: dict[str, bytes] = {}
+
+# Encoded seeded sample responses (body, media type) keyed by (dataset version, request
+# parameters).
+SAMPLE_CACHE_MAX_ENTRIES = 512
+SAMPLE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+_sample_response_cache: LRUCache[tuple, tuple[bytes, str]] = LRUCache(
+    max_entries=SAMPLE_CACHE_MAX_ENTRIES,
+    max_bytes=SAMPLE_CACHE_MAX_BYTES,
+    sizeof=lambda entry: len(entry[0]),
+)
+
+# Eigendecomposition results keyed by a hash of the validated float64 matrix.
+# Values are (status_code, encoded JSON body); 400 outcomes are cached too.
+EIG_CACHE_MAX_ENTRIES = 1024
+EIG_CACHE_MAX_BYTES = 16 * 1024 * 1024
+_eig_cache: LRUCache[str, tuple[int, bytes]] = LRUCache(
+    max_entries=EIG_CACHE_MAX_ENTRIES,
+    max_bytes=EIG_CACHE_MAX_BYTES,
+    sizeof=lambda entry: len(entry[1]),
+)
+
+# Factorizations behind /api/v1/matrix/solve|project, keyed by their handle
+# ("<kind>-<array_digest(matrix)>"). Handles expire FACTORIZATION_TTL_SECONDS after
+# their last use; the registry is per process, like every cache here.
+FACTORIZATION_TTL_SECONDS = float(os.getenv("FACTORIZATION_TTL_SECONDS", "") or 600.0)
+FACTORIZATION_MAX_ENTRIES = 256
+FACTORIZATION_MAX_BYTES = 256 * 1024 * 1024
+_factorizations: LRUCache[str, Factorization] = LRUCache(
+    max_entries=FACTORIZATION_MAX_ENTRIES,
+    max_bytes=FACTORIZATION_MAX_BYTES,
+    sizeof=lambda factorization: factorization.nbytes,
+    ttl_seconds=FACTORIZATION_TTL_SECONDS,
+)
 
 origins = _cors_origins()
 app.add_middleware(
@@ -35,7 +262,11 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browser clients read per-stage timings on cross-origin responses.
+    expose_headers=["Server-Timing"],
 )
+# Added last so it wraps CORS too: latency covers everything the app does.
+app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/health")
@@ -43,14 +274,137 @@ def health() -> dict:
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def ready(response: Response) -> dict:
+    """
+    Report whether the warm-up datasets are loaded, with per-dataset state.
+
+    Returns 503 until every dataset in `DATASET_WARMUP` is ready, so a load
+    balancer health check can hold traffic until the default dataset is warm.
+    """
+    readiness = dataset_readiness(WARM_UP_DATASETS)
+    if not readiness["ready"]:
+        response.status_code = 503
+    return readiness
+
+
 @app.get("/api/v1/info")
 def info() -> dict:
     return {
         "service": "linalg-demos-backend",
         "version": app.version,
+        "caches": {
+            "eig": _eig_cache.stats(),
+            "factorizations": _factorizations.stats(),
+            "samples": _sample_response_cache.stats(),
+        },
+        "compute": compute_stats(),
+        "textWeightings": text_weighting_stats(),
     }
 
 
+@app.get("/metrics")
+def metrics() -> Response:
+    """
+    Expose request/stage latency histograms, cache counters and dataset memory
+    in the Prometheus text format.
+    """
+    return Response(content=render_metrics(_metric_families()), media_type=PROMETHEUS_MEDIA_TYPE)
+
+
+def _metric_families() -> list:
+    """
+    Build scrape-time counter/gauge families from the caches' and dataset engine's stats.
+    """
+    split_lookups = split_cache_stats()
+    response_caches = {"eig": _eig_cache.stats(), "samples": _sample_response_cache.stats()}
+    memory = dataset_memory_stats()
+    compute = compute_stats()
+    factorizations = _factorizations.stats()
+    return [
+        REQUEST_DURATION,
+        STAGE_DURATION,
+        MetricFamily(
+            "linalg_split_cache_lookups_total",
+            "get_dataset split-cache lookups by result (a miss prepares a view).",
+            "counter",
+            [
+                ({"dataset": entry["dataset"], "result": result}, entry[field])
+                for entry in split_lookups
+                for result, field in (("hit", "hits"), ("miss", "misses"))
+            ],
+        ),
+        MetricFamily(
+            "linalg_response_cache_lookups_total",
+            "Encoded-response cache lookups by cache and result.",
+            "counter",
+            [
+                ({"cache": name, "result": result}, stats[field])
+                for name, stats in response_caches.items()
+                for result, field in (("hit", "hits"), ("miss", "misses"))
+            ],
+        ),
+        MetricFamily(
+            "linalg_response_cache_bytes",
+            "Bytes held by each encoded-response cache.",
+            "gauge",
+            [({"cache": name}, stats["bytes"]) for name, stats in response_caches.items()],
+        ),
+        MetricFamily(
+            "linalg_matrix_jobs_total",
+            "Matrix jobs by outcome (inline, offloaded to the pool, rejected, timedOut, failed).",
+            "counter",
+            [
+                ({"outcome": outcome}, compute[outcome])
+                for outcome in ("inline", "offloaded", "rejected", "timedOut", "failed")
+            ],
+        ),
+        MetricFamily(
+            "linalg_matrix_decodes_total",
+            "Matrix request JSON decodes by outcome (same outcomes as matrix jobs).",
+            "counter",
+            [({"outcome": outcome}, count) for outcome, count in compute["decodes"].items()],
+        ),
+        MetricFamily(
+            "linalg_matrix_jobs_pending",
+            "Matrix jobs queued or running in the process pool.",
+            "gauge",
+            [({}, compute["pendingJobs"])],
+        ),
+        MetricFamily(
+            "linalg_factorization_handles",
+            "Live factorization handles (expired ones are dropped at scrape time).",
+            "gauge",
+            [({}, factorizations["entries"])],
+        ),
+        MetricFamily(
+            "linalg_factorization_bytes",
+            "Bytes of factors held by the factorization registry.",
+            "gauge",
+            [({}, factorizations["bytes"])],
+        ),
+        MetricFamily(
+            "linalg_dataset_load_duration_seconds",
+            "Duration of each dataset's most recent load, by origin (store or source).",
+            "gauge",
+            [
+                ({"dataset": stats["dataset"], "origin": stats["origin"]}, stats["durationSeconds"])
+                for stats in dataset_load_stats()
+            ],
+        ),
+        MetricFamily(
+            "linalg_dataset_resident_bytes",
+            "Array bytes held per loaded dataset: raw arrays and data derived from them.",
+            "gauge",
+            [
+                ({"dataset": entry["dataset"], "kind": kind}, entry[f"{kind}Bytes"])
+                for entry in memory
+                for kind in ("raw", "derived")
+            ],
+        ),
+    ]
+
+
 @app.get("/api/v1/datasets")
 def datasets() -> dict:
     return {
@@ -59,36 +413,382 @@ def datasets() -> dict:
     }
 
 
-@app.get("/api/v1/datasets/samples")
+@app.get("/api/v1/datasets/samples", response_model=None)
 def dataset_samples(
+    request: Request,
     dataset: str = Query("mnist"),
-    count: int = Query(24, ge=1, le=MAX_DATASET_SAMPLES),
+    count: int = Query(24, ge=1, le=max(MAX_DATASET_SAMPLES, MAX_TEXT_DATASET_SAMPLES)),
     split: str | None = Query(None),
     seed: int | None = Query(None, ge=0),
-) -> dict:
+    include_vocab: bool = Query(True, alias="includeVocab"),
+    text_layout: str = Query("records", alias="textLayout"),
+    label: list[int] | None = Query(None),
+    per_label: int | None = Query(None, alias="perLabel", ge=1),
+    weighting: str = Query("max"),
+) -> Response:
     """
     Return random dataset samples (image or text).
 
+    Image datasets are returned as a binary frame (see `wire.py`) when the
+    client sends `Accept: application/vnd.linalg.frame`; JSON stays the default
+    and is also the fallback for text datasets.
+
+    Seeded requests are deterministic, so their encoded bodies are cached per
+    dataset version and served with an ETag and a public `Cache-Control`;
+    unseeded responses are marked `no-store`.
+
     @param dataset: Dataset id.
-    @param count: Number of samples to return (1..MAX_DATASET_SAMPLES).
+    @param count: Number of samples to return (1..MAX_DATASET_SAMPLES, or
+        1..MAX_TEXT_DATASET_SAMPLES for text datasets).
     @param split: Optional split ("train"|"test"|"all"), validated by dataset.
     @param seed: Optional RNG seed for reproducible sampling.
-    @returns: JSON payload containing sampled rows and metadata.
+    @param include_vocab: Set false to receive only `vocabVersion` for text datasets.
+    @param text_layout: "records" (default) or "columns" for parallel word arrays.
+    @param label: Optional label ids (repeatable) to sample from.
+    @param per_label: Draw this many rows of each label (or of each `label`),
+        grouped by label; `count` caps the total.
+    @param weighting: Text word weights: "max" (default), "tfidf" or "l2".
+    @returns: JSON payload (or binary frame) containing sampled rows and metadata.
     """
     try:
-        return sample_dataset(dataset=dataset, count=count, split=split, seed=seed)
+        modality = dataset_modality(dataset)
+        max_count = MAX_TEXT_DATASET_SAMPLES if modality == "text" else MAX_DATASET_SAMPLES
+        if count > max_count:
+            raise ValueError(f"count must be at most {max_count} for dataset '{dataset}'")
+        use_frame = accepts_frame(request.headers.get("accept")) and modality == "image"
+        if modality == "image":
+            # Text-only options do not change image payloads; share one cache entry.
+            include_vocab, text_layout, weighting = True, "records", "max"
+
+        sample_options = {
+            "dataset": dataset,
+            "count": count,
+            "split": split,
+            "seed": seed,
+            "use_frame": use_frame,
+            "include_vocab": include_vocab,
+            "text_layout": text_layout,
+            "labels": label,
+            "per_label": per_label,
+            "weighting": weighting,
+        }
+        if seed is None:
+            body, media_type = _sample_body(**sample_options)
+            headers = {"Vary": "Accept", "Cache-Control": UNSEEDED_SAMPLES_CACHE_CONTROL}
+            return Response(content=body, media_type=media_type, headers=headers)
+
+        key = (
+            dataset_version(dataset),
+            dataset,
+            # Resolved as `get_dataset` does, so an omitted split shares the default's entry.
+            resolve_dataset_split(dataset, split),
+            count,
+            seed,
+            "frame" if use_frame else "json",
+            include_vocab,
+            text_layout,
+            tuple(sorted(set(label))) if label is not None else None,
+            per_label,
+            weighting,
+        )
+        etag = f'"samples-{hashlib.blake2b(repr(key).encode(), digest_size=12).hexdigest()}"'
+        headers = {
+            "Vary": "Accept",
+            "ETag": etag,
+            "Cache-Control": SEEDED_SAMPLES_CACHE_CONTROL,
+        }
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+
+        cached = _sample_response_cache.get(key)
+        if cached is None:
+            cached = _sample_body(**sample_options)
+            _sample_response_cache.put(key, cached)
+        body, media_type = cached
+        return Response(content=body, media_type=media_type, headers=headers)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:  # pragma: no cover - defensive fallback
         logger.exception("Dataset sampling failed for dataset=%s split=%s", dataset, split)
-        split_suffix = f" (split='{split}')" if split is not None else ""
-        detail = (
-            f"Failed to load dataset '{dataset}'"
-            f"{split_suffix}: "
-            f"{exc.__class__.__name__}: {exc}"
+        detail = _dataset_failure_detail(dataset, split, exc)
+        raise HTTPException(status_code=500, detail=detail) from exc
+
+
+def _sample_body(
+    *,
+    dataset: str,
+    count: int,
+    split: str | None,
+    seed: int | None,
+    use_frame: bool,
+    include_vocab: bool,
+    text_layout: str,
+    labels: list[int] | None,
+    per_label: int | None,
+    weighting: str,
+) -> tuple[bytes, str]:
+    """
+    Sample a dataset and encode the `/api/v1/datasets/samples` body.
+
+    @param use_frame: Encode a binary frame from `sample_dataset_arrays` (image datasets);
+        otherwise JSON from `sample_dataset`, which alone uses the text-only options.
+    @returns: The encoded body and its media type.
+    """
+    if use_frame:
+        metadata, blocks = sample_dataset_arrays(
+            dataset=dataset,
+            count=count,
+            split=split,
+            seed=seed,
+            labels=labels,
+            per_label=per_label,
         )
+        with timed_stage("encode"):
+            return encode_frame(metadata, blocks), FRAME_MEDIA_TYPE
+    payload = sample_dataset(
+        dataset=dataset,
+        count=count,
+        split=split,
+        seed=seed,
+        include_vocab=include_vocab,
+        text_layout=text_layout,
+        labels=labels,
+        per_label=per_label,
+        weighting=weighting,
+    )
+    with timed_stage("encode"):
+        return _encode_json(payload), "application/json"
+
+
+@app.get("/api/v1/datasets/samples/stream")
+def dataset_samples_stream(
+    request: Request,
+    dataset: str = Query("mnist"),
+    split: str | None = Query(None),
+    cursor: str | None = Query(None),
+    seed: int | None = Query(None, ge=0, lt=2**32),
+    limit: int = Query(1024, ge=1, le=MAX_STREAM_SAMPLES),
+    text_layout: str = Query("records", alias="textLayout"),
+) -> StreamingResponse:
+    """
+    Stream one page of a seeded permutation of a dataset split.
+
+    The response is NDJSON: a header line (sample metadata plus `seed`,
+    `offset`, `count`, `nextCursor`) followed by one sample per line. Image
+    datasets can instead be requested as a binary frame stream with
+    `Accept: application/vnd.linalg.frame-stream` (a header frame, then one
+    frame of `indices`/`labels`/`pixels` blocks per chunk).
+
+    @param dataset: Dataset id.
+    @param split: Optional split ("train"|"test"|"all"), validated by dataset.
+    @param cursor: `nextCursor` of the previous page (`<seed>:<offset>`); overrides `seed`.
+    @param seed: Permutation seed for the first page; random when omitted.
+    @param limit: Maximum rows in this page (1..MAX_STREAM_SAMPLES).
+    @param text_layout: "records" (default) or "columns" for text datasets.
+    @returns: Streaming NDJSON or frame-stream response.
+    """
+    try:
+        offset = 0
+        if cursor is not None:
+            seed, offset = parse_stream_cursor(cursor)
+        if accepts_media_type(request.headers.get("accept"), FRAME_STREAM_MEDIA_TYPE) and (
+            dataset_modality(dataset) == "image"
+        ):
+            header, frames = stream_dataset_arrays(
+                dataset=dataset, split=split, seed=seed, offset=offset, limit=limit
+            )
+            body = _frame_stream(header, frames)
+            media_type = FRAME_STREAM_MEDIA_TYPE
+        else:
+            header, chunks = stream_dataset_samples(
+                dataset=dataset,
+                split=split,
+                seed=seed,
+                offset=offset,
+                limit=limit,
+                text_layout=text_layout,
+            )
+            body = _ndjson_stream(header, chunks)
+            media_type = NDJSON_MEDIA_TYPE
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:  # pragma: no cover - defensive fallback
+        logger.exception("Dataset streaming failed for dataset=%s split=%s", dataset, split)
+        detail = _dataset_failure_detail(dataset, split, exc)
         raise HTTPException(status_code=500, detail=detail) from exc
 
+    return StreamingResponse(body, media_type=media_type, headers={"Vary": "Accept"})
+
+
+@app.get("/api/v1/datasets/pca")
+def dataset_principal_components(
+    request: Request,
+    dataset: str = Query("mnist"),
+    split: str | None = Query(None),
+    components: int = Query(2, ge=1),
+    dims: int = Query(2, ge=2, le=3),
+) -> Response:
+    """
+    Return a split's top principal components and each row's 2-D/3-D projection.
+
+    The decomposition is computed once per split and cached with the dataset,
+    so the response is deterministic per dataset version; it carries an ETag
+    and is served as a binary frame for `Accept: application/vnd.linalg.frame`.
+
+    @param dataset: Dataset id.
+    @param split: Optional split ("train"|"test"|"all"), validated by dataset.
+    @param components: Number of components (1..PCA_MAX_COMPONENTS).
+    @param dims: Projection dimensions per row (2 or 3).
+    @returns: JSON (or frame) with PCA metadata and `mean`/`components`/`projection`/`labels`.
+    """
+    try:
+        use_frame = accepts_frame(request.headers.get("accept"))
+        key = (
+            dataset_version(dataset),
+            dataset,
+            resolve_dataset_split(dataset, split),
+            components,
+            dims,
+        )
+        etag = f'"pca-{hashlib.blake2b(repr(key).encode(), digest_size=12).hexdigest()}"'
+        headers = {"Vary": "Accept", "ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        metadata, blocks = dataset_pca(
+            dataset=dataset, split=split, components=components, dims=dims
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:  # pragma: no cover - defensive fallback
+        logger.exception("PCA failed for dataset=%s split=%s", dataset, split)
+        detail = _dataset_failure_detail(dataset, split, exc)
+        raise HTTPException(status_code=500, detail=detail) from exc
+
+    if use_frame:
+        return Response(
+            content=encode_frame(metadata, blocks), media_type=FRAME_MEDIA_TYPE, headers=headers
+        )
+    payload = {**metadata, **{name: array.tolist() for name, array in blocks}}
+    return Response(content=_encode_json(payload), media_type="application/json", headers=headers)
+
+
+def _ndjson_stream(header: dict, chunks: Iterator[list[dict]]) -> Iterator[bytes]:
+    yield _encode_json(header) + b"\n"
+    for samples in chunks:
+        yield b"".join(_encode_json(sample) + b"\n" for sample in samples)
+
+
+def _frame_stream(header: dict, frames: Iterator[tuple[dict, list]]) -> Iterator[bytes]:
+    yield encode_frame(header, [])
+    for chunk_header, blocks in frames:
+        yield encode_frame(chunk_header, blocks)
+
+
+@app.get("/api/v1/datasets/class-stats")
+def dataset_class_statistics(
+    request: Request,
+    dataset: str = Query("mnist"),
+    split: str | None = Query(None),
+    label: list[int] | None = Query(None),
+) -> Response:
+    """
+    Return per-label counts, mean vectors and variance vectors for a split.
+
+    Statistics are computed once per split and cached with the dataset, so the
+    response is deterministic per dataset version; it carries an ETag and is
+    served as a binary frame (float32 blocks) for `Accept: application/vnd.linalg.frame`.
+
+    @param dataset: Dataset id.
+    @param split: Optional split ("train"|"test"|"all"), validated by dataset.
+    @param label: Optional label ids (repeatable); required for datasets with many labels.
+    @returns: JSON (or frame) with metadata and `labels`/`counts`/`mean`/`variance`.
+    """
+    try:
+        use_frame = accepts_frame(request.headers.get("accept"))
+        labels = tuple(sorted(set(label))) if label is not None else None
+        key = (dataset_version(dataset), dataset, resolve_dataset_split(dataset, split), labels)
+        etag = f'"class-stats-{hashlib.blake2b(repr(key).encode(), digest_size=12).hexdigest()}"'
+        headers = {"Vary": "Accept", "ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        metadata, blocks = dataset_class_stats(dataset=dataset, split=split, labels=labels)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:  # pragma: no cover - defensive fallback
+        logger.exception("Class statistics failed for dataset=%s split=%s", dataset, split)
+        detail = _dataset_failure_detail(dataset, split, exc)
+        raise HTTPException(status_code=500, detail=detail) from exc
+
+    if use_frame:
+        return Response(
+            content=encode_frame(metadata, blocks), media_type=FRAME_MEDIA_TYPE, headers=headers
+        )
+    payload = {**metadata, **{name: array.tolist() for name, array in blocks}}
+    return Response(content=_encode_json(payload), media_type="application/json", headers=headers)
+
+
+@app.get("/api/v1/datasets/vocab")
+def dataset_vocabulary(
+    request: Request,
+    dataset: str = Query("20newsgroups"),
+    version: str | None = Query(None),
+) -> Response:
+    """
+    Return a text dataset's vocabulary, cacheable by its content hash.
+
+    @param dataset: Dataset id (text modality).
+    @param version: Optional `vocabVersion` to pin; pinned URLs are immutable.
+    @returns: JSON `{"source","vocabVersion","vocab"}` with a strong ETag, or 304 on a match.
+    """
+    try:
+        payload = dataset_vocab(dataset)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:  # pragma: no cover - defensive fallback
+        logger.exception("Vocab lookup failed for dataset=%s", dataset)
+        detail = _dataset_failure_detail(dataset, None, exc)
+        raise HTTPException(status_code=500, detail=detail) from exc
+
+    vocab_version = payload["vocabVersion"]
+    if version is not None and version != vocab_version:
+        raise HTTPException(
+            status_code=404,
+            detail=f"vocab version '{version}' not found (current: '{vocab_version}')",
+        )
+
+    etag = f'"{vocab_version}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if version is not None else REVALIDATE_CACHE_CONTROL,
+    }
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    body = _encoded_vocab_cache.get(vocab_version)
+    if body is None:
+        body = _encode_json(payload)
+        _encoded_vocab_cache[vocab_version] = body
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check an `If-None-Match` request header against a strong ETag.
+    """
+    raw = request.headers.get("if-none-match")
+    if not raw:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in raw.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _dataset_failure_detail(dataset: str, split: str | None, exc: Exception) -> str:
+    """
+    Describe an unexpected dataset route failure for its HTTP 500 `detail`.
+    """
+    split_suffix = f" (split='{split}')" if split is not None else ""
+    return f"Failed to load dataset '{dataset}'{split_suffix}: {exc.__class__.__name__}: {exc}"
+
 
 @app.get("/api/v1/mnist/samples")
 def mnist_samples(
@@ -105,14 +805,88 @@ def mnist_samples(
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:  # pragma: no cover - defensive fallback
         logger.exception("MNIST sampling failed for split=%s", split)
-        detail = f"Failed to load dataset 'mnist' (split='{split}'): {exc.__class__.__name__}: {exc}"
+        detail = _dataset_failure_detail("mnist", split, exc)
         raise HTTPException(status_code=500, detail=detail) from exc
 
 
+async def _matrix_payload(request: Request) -> dict:
+    """
+    Read and decode a matrix endpoint's JSON body, enforcing the size limit first.
+
+    Oversized bodies are refused from `Content-Length` (or while streaming, for
+    chunked uploads) so they are never buffered or decoded into Python objects.
+    Large bodies are decoded in the compute pool, which returns their numeric
+    fields as float64 arrays (see `decode_matrix_json`).
+    """
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > MAX_MATRIX_REQUEST_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"request body must be at most {MAX_MATRIX_REQUEST_BYTES} bytes",
+        )
+
+    chunks: list[bytes] = []
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > MAX_MATRIX_REQUEST_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"request body must be at most {MAX_MATRIX_REQUEST_BYTES} bytes",
+            )
+        chunks.append(chunk)
+
+    body = b"".join(chunks)
+    try:
+        with timed_stage("decode"), _compute_errors():
+            payload = await run_matrix_job_async(
+                "decode", decode_cost(len(body)), decode_matrix_json, body
+            )
+    except (UnicodeDecodeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail="request body must be valid JSON") from exc
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="request body must be a JSON object")
+    return payload
+
+
+def _coerce_array(raw: object, ndim: int) -> np.ndarray | None:
+    """
+    Build a finite float64 array with `ndim` non-empty axes in one NumPy call.
+
+    Returns None whenever the input is ragged, mistyped, empty or non-finite;
+    callers then run the per-entry checks, which report the precise error.
+    Arrays already decoded by `decode_matrix_json` are only checked.
+    """
+    if isinstance(raw, np.ndarray):
+        array = raw
+    elif not isinstance(raw, list):
+        return None
+    else:
+        try:
+            array = np.array(raw, dtype=np.float64)
+        except (TypeError, ValueError, OverflowError):
+            return None
+    if array.ndim != ndim or 0 in array.shape or not np.isfinite(array).all():
+        return None
+    return array
+
+
+def _decoded_lists(raw: object) -> object:
+    """
+    Undo `decode_matrix_json`'s array conversion so the per-entry checks see plain lists.
+    """
+    return raw.tolist() if isinstance(raw, np.ndarray) else raw
+
+
 def _validate_matrix(raw_matrix: object) -> np.ndarray:
     """
     Validate and coerce a request matrix into a finite float64 ndarray.
     """
+    matrix = _coerce_array(raw_matrix, ndim=2)
+    if matrix is not None:
+        return matrix
+
+    raw_matrix = _decoded_lists(raw_matrix)
     if not isinstance(raw_matrix, list) or not raw_matrix:
         raise ValueError("matrix must be a non-empty 2D array")
 
@@ -136,10 +910,19 @@ def _validate_matrix(raw_matrix: object) -> np.ndarray:
     return matrix
 
 
-def _validate_vector(raw_vector: object, expected_length: int) -> np.ndarray:
+def _validate_vector(
+    raw_vector: object, expected_length: int, length_name: str = "matrix column count"
+) -> np.ndarray:
     """
     Validate and coerce a request vector into a finite float64 ndarray.
+
+    @param length_name: What `expected_length` is, for the length-mismatch message.
     """
+    vector = _coerce_array(raw_vector, ndim=1)
+    if vector is not None and vector.shape[0] == expected_length:
+        return vector
+
+    raw_vector = _decoded_lists(raw_vector)
     if not isinstance(raw_vector, list) or not raw_vector:
         raise ValueError("vector must be a non-empty array")
     try:
@@ -151,60 +934,674 @@ def _validate_vector(raw_vector: object, expected_length: int) -> np.ndarray:
         raise ValueError("vector must be a 1D array")
     if vector.shape[0] != expected_length:
         raise ValueError(
-            f"vector length ({vector.shape[0]}) must match matrix column count ({expected_length})"
+            f"vector length ({vector.shape[0]}) must match {length_name} ({expected_length})"
         )
     if not np.isfinite(vector).all():
         raise ValueError("vector entries must be finite numbers")
     return vector
 
 
+def _check_finite_result(*arrays: np.ndarray) -> None:
+    """
+    Reject results that overflowed float64, since JSON cannot carry Infinity or NaN.
+
+    @throws ValueError: When any entry of `arrays` is not finite.
+    """
+    if not all(np.isfinite(array).all() for array in arrays):
+        raise ValueError("result is not finite (float64 overflow); scale the inputs down")
+
+
 @app.post("/api/v1/matrix/apply")
-def matrix_apply(payload: dict) -> dict:
+def matrix_apply(payload: dict = Depends(_matrix_payload)) -> Response:
     """
     Apply a matrix to a vector and return the resulting vector.
+
+    `matrix` is a dense 2D array or a COO/CSR object (see `sparse_matrices.py`);
+    sparse matrices are multiplied in CSR form, costing O(nonzeros).
     """
-    if not isinstance(payload, dict):
-        raise HTTPException(status_code=400, detail="request body must be a JSON object")
+    raw_matrix = payload.get("matrix")
+    try:
+        with timed_stage("validate"):
+            if isinstance(raw_matrix, dict):
+                matrix = sparse_matrix_from_payload(raw_matrix)
+                cost = sparse_apply_cost(matrix.nnz)
+            else:
+                matrix = _validate_matrix(raw_matrix)
+                cost = apply_cost(*matrix.shape)
+            vector = _validate_vector(payload.get("vector"), expected_length=matrix.shape[1])
+        with timed_stage("compute"), _compute_errors():
+            # `operator.matmul` dispatches to csr_matrix.__matmul__; `np.matmul` would not.
+            result = run_matrix_job("apply", cost, operator.matmul, matrix, vector)
+        _check_finite_result(result)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    return _json_response({"result": result.astype(float).tolist()})
+
+
+def _validate_vector_batch(
+    raw_vectors: object, expected_length: int, length_name: str = "matrix column count"
+) -> np.ndarray:
+    """
+    Validate a list of request vectors into a finite float64 (n, expected_length) array.
+    """
+    if not isinstance(raw_vectors, (list, np.ndarray)) or len(raw_vectors) == 0:
+        raise ValueError("vectors must be a non-empty array of vectors")
+    if len(raw_vectors) > MAX_MATRIX_BATCH:
+        raise ValueError(f"vectors must contain at most {MAX_MATRIX_BATCH} entries")
+    vectors = _coerce_array(raw_vectors, ndim=2)
+    if vectors is not None and vectors.shape[1] == expected_length:
+        return vectors
+
+    rows: list[np.ndarray] = []
+    for position, raw_vector in enumerate(raw_vectors):
+        try:
+            rows.append(_validate_vector(raw_vector, expected_length, length_name))
+        except ValueError as exc:
+            raise ValueError(f"vectors[{position}]: {exc}") from exc
+    return np.stack(rows)
+
+
+def _validate_matrix_batch(raw_matrices: object) -> np.ndarray:
+    """
+    Validate a list of same-shape request matrices into a float64 (n, rows, cols) array.
+    """
+    if not isinstance(raw_matrices, (list, np.ndarray)) or len(raw_matrices) == 0:
+        raise ValueError("matrices must be a non-empty array of matrices")
+    if len(raw_matrices) > MAX_MATRIX_BATCH:
+        raise ValueError(f"matrices must contain at most {MAX_MATRIX_BATCH} entries")
+    stacked = _coerce_array(raw_matrices, ndim=3)
+    if stacked is not None:
+        return stacked
+
+    matrices: list[np.ndarray] = []
+    for position, raw_matrix in enumerate(raw_matrices):
+        try:
+            matrices.append(_validate_matrix(raw_matrix))
+        except ValueError as exc:
+            raise ValueError(f"matrices[{position}]: {exc}") from exc
+    if any(matrix.shape != matrices[0].shape for matrix in matrices):
+        raise ValueError("matrices must all have the same shape")
+    return np.stack(matrices)
+
+
+@app.post("/api/v1/matrix/apply/batch")
+def matrix_apply_batch(payload: dict = Depends(_matrix_payload)) -> Response:
+    """
+    Apply one matrix to many vectors, or many matrices to paired vectors.
 
+    Accepts `{"matrix", "vectors"}` (every vector uses the same matrix) or
+    `{"matrices", "vectors"}` (vector i uses matrix i). Either form holds at
+    most MAX_MATRIX_BATCH vectors and is computed with a single matmul.
+    """
     try:
-        matrix = _validate_matrix(payload.get("matrix"))
-        vector = _validate_vector(payload.get("vector"), expected_length=matrix.shape[1])
+        if "matrices" in payload:
+            if "matrix" in payload:
+                raise ValueError("provide either matrix or matrices, not both")
+            with timed_stage("validate"):
+                matrices = _validate_matrix_batch(payload.get("matrices"))
+                vectors = _validate_vector_batch(
+                    payload.get("vectors"), expected_length=matrices.shape[2]
+                )
+            if vectors.shape[0] != matrices.shape[0]:
+                raise ValueError(
+                    f"vectors count ({vectors.shape[0]}) must match matrices count "
+                    f"({matrices.shape[0]})"
+                )
+            with timed_stage("compute"), _compute_errors():
+                results = run_matrix_job(
+                    "apply",
+                    apply_cost(*matrices.shape[1:], vectors=matrices.shape[0]),
+                    np.matmul,
+                    matrices,
+                    vectors[:, :, np.newaxis],
+                )[:, :, 0]
+        else:
+            with timed_stage("validate"):
+                matrix = _validate_matrix(payload.get("matrix"))
+                vectors = _validate_vector_batch(
+                    payload.get("vectors"), expected_length=matrix.shape[1]
+                )
+            # Row i of (vectors @ matrix.T) is matrix @ vectors[i].
+            with timed_stage("compute"), _compute_errors():
+                results = run_matrix_job(
+                    "apply",
+                    apply_cost(*matrix.shape, vectors=vectors.shape[0]),
+                    np.matmul,
+                    vectors,
+                    matrix.T,
+                )
+        _check_finite_result(results)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    result = matrix @ vector
-    return {"result": result.astype(float).tolist()}
+    return _json_response({"results": results.astype(float).tolist()})
 
 
 @app.post("/api/v1/matrix/eig")
-def matrix_eig(payload: dict) -> dict:
+def matrix_eig(payload: dict = Depends(_matrix_payload)) -> Response:
     """
     Compute eigenvalues and eigenvectors for a real-valued square matrix.
-    """
-    if not isinstance(payload, dict):
-        raise HTTPException(status_code=400, detail="request body must be a JSON object")
 
+    Diagonal, symmetric and triangular inputs use specialized solvers, and only
+    non-symmetric 2x2 inputs use the closed form (see `matrices.py`); the
+    response's `path` names the one taken. Outcomes (including the 400 for complex
+    results) are cached by matrix content, and `X-Cache` reports HIT or MISS. There
+    is no ETag: POST responses are never revalidated (RFC 9110 allows only a 412
+    for a failed `If-None-Match` on them).
+    """
     try:
-        matrix = _validate_matrix(payload.get("matrix"))
+        with timed_stage("validate"):
+            matrix = _validate_matrix(payload.get("matrix"))
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
     if matrix.shape[0] != matrix.shape[1]:
         raise HTTPException(status_code=400, detail="matrix must be square")
 
+    key = array_digest(matrix)
+    cached = _eig_cache.get(key)
+    headers = {"X-Cache": "HIT" if cached is not None else "MISS"}
+    if cached is None:
+        with _compute_errors():
+            cached = _eig_response(matrix)
+        _eig_cache.put(key, cached)
+    status_code, body = cached
+    return Response(
+        content=body, status_code=status_code, media_type="application/json", headers=headers
+    )
+
+
+def _eig_response(matrix: np.ndarray) -> tuple[int, bytes]:
+    """
+    Run the eigendecomposition and encode the route's response (or its 400 error).
+    """
     try:
-        eigenvalues, eigenvectors = np.linalg.eig(matrix)
-    except np.linalg.LinAlgError as exc:
-        raise HTTPException(status_code=400, detail=f"unable to compute eigendecomposition: {exc}") from exc
+        with timed_stage("compute"):
+            result = run_matrix_job("eig", eig_cost(matrix.shape[0]), eig_decompose, matrix)
+        _check_finite_result(result.eigenvalues, result.eigenvectors)
+    except ValueError as exc:
+        return 400, _encode_json({"detail": str(exc)})
 
-    # Keep the contract real-valued for current frontends.
-    if np.any(np.abs(np.imag(eigenvalues)) > 1e-9) or np.any(np.abs(np.imag(eigenvectors)) > 1e-9):
-        raise HTTPException(
-            status_code=400,
-            detail="matrix has complex eigenvalues/eigenvectors; only real-valued results are supported",
+    with timed_stage("encode"):
+        return 200, _encode_json(
+            {
+                "eigenvalues": result.eigenvalues.astype(float).tolist(),
+                "eigenvectors": result.eigenvectors.astype(float).tolist(),
+                "path": result.path,
+            }
         )
 
-    return {
-        "eigenvalues": np.real(eigenvalues).astype(float).tolist(),
-        "eigenvectors": np.real(eigenvectors).astype(float).tolist(),
+
+@app.post("/api/v1/matrix/eig/batch")
+def matrix_eig_batch(payload: dict = Depends(_matrix_payload)) -> Response:
+    """
+    Decompose a stack of same-size square matrices in one vectorized call.
+
+    The whole stack shares one solver path (the most specific one every
+    matrix qualifies for), reported as `path`.
+    """
+    try:
+        with timed_stage("validate"):
+            matrices = _validate_matrix_batch(payload.get("matrices"))
+        if matrices.shape[1] != matrices.shape[2]:
+            raise ValueError("matrices must be square")
+        with timed_stage("compute"), _compute_errors():
+            result = run_matrix_job(
+                "eig",
+                eig_cost(matrices.shape[1], count=matrices.shape[0]),
+                eig_decompose,
+                matrices,
+            )
+        _check_finite_result(result.eigenvalues, result.eigenvectors)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    return _json_response(
+        {
+            "eigenvalues": result.eigenvalues.astype(float).tolist(),
+            "eigenvectors": result.eigenvectors.astype(float).tolist(),
+            "path": result.path,
+        }
+    )
+
+
+@app.post("/api/v1/matrix/eig/sparse")
+def matrix_eig_sparse(payload: dict = Depends(_matrix_payload)) -> Response:
+    """
+    Compute k eigenpairs of a square COO/CSR matrix without densifying it.
+
+    Accepts `{"matrix", "k"?, "which"?}`: `k` defaults to SPARSE_EIG_DEFAULT_K and
+    `which` to `LM` (largest magnitude; `LA`/`SA` pick the largest/smallest
+    eigenvalues). The response matches `/api/v1/matrix/eig`, with `path`
+    `lanczos`/`arnoldi` for ARPACK or a dense path for small matrices.
+    """
+    try:
+        with timed_stage("validate"):
+            matrix = sparse_matrix_from_payload(payload.get("matrix"))
+            k = payload.get("k", SPARSE_EIG_DEFAULT_K)
+            if isinstance(k, bool) or not isinstance(k, int):
+                raise ValueError("k must be an integer")
+            which = payload.get("which", "LM")
+            if which not in SPARSE_EIG_WHICH:
+                raise ValueError(f"which must be one of: {', '.join(SPARSE_EIG_WHICH)}")
+        with timed_stage("compute"), _compute_errors():
+            result = run_matrix_job(
+                "eig",
+                sparse_eig_cost(matrix.shape[0], matrix.nnz, k),
+                sparse_eig,
+                matrix,
+                k,
+                which,
+            )
+        _check_finite_result(result.eigenvalues, result.eigenvectors)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    return _json_response(
+        {
+            "eigenvalues": result.eigenvalues.astype(float).tolist(),
+            "eigenvectors": result.eigenvectors.astype(float).tolist(),
+            "path": result.path,
+        }
+    )
+
+
+@app.post("/api/v1/matrix/factorize")
+def matrix_factorize(payload: dict = Depends(_matrix_payload)) -> Response:
+    """
+    Factorize a matrix (LU, QR or SVD) once and return a handle for solve/project requests.
+
+    The handle is derived from the kind and the matrix content, so factorizing
+    the same matrix again reuses the stored factors (`X-Cache: HIT`) and keeps the
+    handle alive. The factors are returned too unless `includeFactors` is false.
+    """
+    try:
+        with timed_stage("validate"):
+            matrix = _validate_matrix(payload.get("matrix"))
+            kind = payload.get("kind")
+            if kind not in FACTORIZATION_KINDS:
+                raise ValueError(f"kind must be one of: {', '.join(FACTORIZATION_KINDS)}")
+            include_factors = payload.get("includeFactors", True)
+            if not isinstance(include_factors, bool):
+                raise ValueError("includeFactors must be a boolean")
+
+        handle = f"{kind}-{array_digest(matrix)}"
+        factorization = _factorizations.get(handle)
+        headers = {"X-Cache": "HIT" if factorization is not None else "MISS"}
+        if factorization is None:
+            with timed_stage("compute"), _compute_errors():
+                factorization = run_matrix_job(
+                    "factorize",
+                    factorization_cost(kind, *matrix.shape),
+                    factorize,
+                    matrix,
+                    kind,
+                )
+            _check_finite_result(*factorization.factors.values())
+            _factorizations.put(handle, factorization)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    response = {
+        "handle": handle,
+        "kind": factorization.kind,
+        "shape": list(factorization.shape),
+        "rank": factorization.rank,
+        "expiresInSeconds": FACTORIZATION_TTL_SECONDS,
     }
+    if include_factors:
+        response["factors"] = {
+            name: factor.tolist() for name, factor in explicit_factors(factorization).items()
+        }
+    return _json_response(response, headers=headers)
+
+
+@app.post("/api/v1/matrix/solve")
+def matrix_solve(payload: dict = Depends(_matrix_payload)) -> Response:
+    """
+    Solve A x = b with a stored factorization: exact for lu, least squares for qr,
+    minimum-norm least squares for svd.
+
+    Accepts `{"handle", "vector"}` or `{"handle", "vectors"}` (at most
+    MAX_MATRIX_BATCH right-hand sides, solved together); vectors have the
+    matrix's row count.
+    """
+    return _factorization_response(payload, "solve", solve_factorization)
+
+
+@app.post("/api/v1/matrix/project")
+def matrix_project(payload: dict = Depends(_matrix_payload)) -> Response:
+    """
+    Project vectors onto the column space of a factorized matrix (qr/svd; lu is identity).
+
+    Same body and response shapes as `/api/v1/matrix/solve`.
+    """
+    return _factorization_response(payload, "project", project_factorization)
+
+
+def _factorization_response(
+    payload: dict,
+    operation: str,
+    func: Callable[[Factorization, np.ndarray], np.ndarray],
+) -> Response:
+    """
+    Validate a `{handle, vector|vectors}` body and run `func` on the stored factorization.
+    """
+    handle = payload.get("handle")
+    if not isinstance(handle, str) or not handle:
+        raise HTTPException(status_code=400, detail="handle must be a non-empty string")
+    factorization = _factorizations.get(handle)
+    if factorization is None:
+        raise HTTPException(
+            status_code=404,
+            detail="unknown or expired factorization handle; factorize the matrix again",
+        )
+
+    rows = factorization.shape[0]
+    batched = "vectors" in payload
+    try:
+        with timed_stage("validate"):
+            if batched:
+                if "vector" in payload:
+                    raise ValueError("provide either vector or vectors, not both")
+                vectors = _validate_vector_batch(payload.get("vectors"), rows, "matrix row count")
+            else:
+                vectors = _validate_vector(payload.get("vector"), rows, "matrix row count")
+                vectors = vectors[np.newaxis]
+        # Two passes over factors the size of the matrix per vector (e.g. L then U).
+        with timed_stage("compute"), _compute_errors():
+            results = run_matrix_job(
+                operation,
+                apply_cost(*factorization.shape, vectors=2 * vectors.shape[0]),
+                func,
+                factorization,
+                vectors,
+            )
+        _check_finite_result(results)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    if batched:
+        return _json_response({"results": results.astype(float).tolist()})
+    return _json_response({"result": results[0].astype(float).tolist()})
+
+
+@dataclass
+class _MatrixSession:
+    """
+    State of one `/api/v1/matrix/session` connection.
+
+    The receive loop merges updates into it as they arrive; the worker computes
+    from a snapshot, so a burst of updates becomes one computation of the newest state.
+    """
+
+    matrix: np.ndarray | None = None
+    vector: np.ndarray | None = None
+    ops: tuple[str, ...] = ("apply",)
+    seq: int | None = None
+    # Updates merged since the worker's last snapshot.
+    pending: int = 0
+    # Encoded error messages for rejected updates, sent by the worker in order.
+    errors: list[bytes] = field(default_factory=list)
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+@app.websocket("/api/v1/matrix/session")
+async def matrix_session(websocket: WebSocket) -> None:
+    """
+    Keep a matrix/vector state open for interactive edits and push results back.
+
+    Each message is a JSON object with any of `matrix`, `vector`, `ops` (subset of
+    MATRIX_SESSION_OPS, default `["apply"]`) and an integer `seq` echoed in replies;
+    given fields replace the session's values. Updates arriving while a result is
+    being computed are coalesced: only the newest state is computed, and its
+    `result` message counts the updates it covers (`coalesced`). Rejected updates
+    get an `error` message and leave the state unchanged.
+    """
+    await websocket.accept()
+    session = _MatrixSession()
+    worker = asyncio.create_task(_run_matrix_session(websocket, session))
+    try:
+        while not worker.done():
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            body = message.get("bytes") or (message.get("text") or "").encode("utf-8")
+            if len(body) > MAX_MATRIX_REQUEST_BYTES:
+                await websocket.close(
+                    code=WS_CLOSE_MESSAGE_TOO_BIG,
+                    reason=f"messages must be at most {MAX_MATRIX_REQUEST_BYTES} bytes",
+                )
+                break
+            await _merge_session_update(session, body)
+            session.changed.set()
+    finally:
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+
+
+async def _merge_session_update(session: _MatrixSession, body: bytes) -> None:
+    """
+    Validate one session message and merge it into the state (or queue its error).
+    """
+    try:
+        update = await run_matrix_job_async(
+            "decode", decode_cost(len(body)), decode_matrix_json, body
+        )
+    except (UnicodeDecodeError, ValueError):
+        session.errors.append(_session_error(None, 400, "message must be valid JSON"))
+        return
+    except ComputeLimitError as exc:
+        session.errors.append(_session_error(None, exc.status_code, str(exc), exc.retry_after))
+        return
+    if not isinstance(update, dict):
+        session.errors.append(_session_error(None, 400, "message must be a JSON object"))
+        return
+    seq = update.get("seq")
+    if seq is not None and (isinstance(seq, bool) or not isinstance(seq, int)):
+        session.errors.append(_session_error(None, 400, "seq must be an integer"))
+        return
+
+    try:
+        matrix = session.matrix
+        if "matrix" in update:
+            matrix = _validate_matrix(update["matrix"])
+        if matrix is None:
+            raise ValueError("matrix is required before the first result")
+        vector = session.vector
+        if "vector" in update:
+            vector = _validate_vector(update["vector"], expected_length=matrix.shape[1])
+        ops = session.ops
+        if "ops" in update:
+            raw_ops = update["ops"]
+            if (
+                not isinstance(raw_ops, list)
+                or not raw_ops
+                or any(op not in MATRIX_SESSION_OPS for op in raw_ops)
+            ):
+                raise ValueError(f"ops must be a non-empty subset of {list(MATRIX_SESSION_OPS)}")
+            ops = tuple(raw_ops)
+    except ValueError as exc:
+        session.errors.append(_session_error(seq, 400, str(exc)))
+        return
+
+    session.matrix, session.vector, session.ops, session.seq = matrix, vector, ops, seq
+    session.pending += 1
+
+
+async def _run_matrix_session(websocket: WebSocket, session: _MatrixSession) -> None:
+    """
+    Send queued errors, then compute and send the newest state, until cancelled.
+    """
+    while True:
+        await session.changed.wait()
+        session.changed.clear()
+        errors, session.errors = session.errors, []
+        for error in errors:
+            await websocket.send_text(error.decode("utf-8"))
+        if session.pending == 0:
+            continue
+
+        coalesced, session.pending = session.pending, 0
+        message = await _session_result(
+            session.matrix, session.vector, session.ops, session.seq, coalesced
+        )
+        await websocket.send_text(message.decode("utf-8"))
+
+
+async def _session_result(
+    matrix: np.ndarray,
+    vector: np.ndarray | None,
+    ops: tuple[str, ...],
+    seq: int | None,
+    coalesced: int,
+) -> bytes:
+    """
+    Compute a session state's `ops` into one encoded `result` (or `error`) message.
+
+    Eigendecompositions share `_eig_cache` with `/api/v1/matrix/eig`, whose
+    encoded bodies are embedded as-is.
+    """
+    # The object is left open so results can be appended as pre-encoded JSON.
+    parts = [_encode_json({"type": "result", "seq": seq, "coalesced": coalesced})[:-1]]
+    try:
+        if "apply" in ops:
+            if vector is None or vector.shape[0] != matrix.shape[1]:
+                raise ValueError(
+                    f"apply needs a vector of length {matrix.shape[1]} (matrix column count)"
+                )
+            result = await run_matrix_job_async(
+                "apply", apply_cost(*matrix.shape), np.matmul, matrix, vector
+            )
+            _check_finite_result(result)
+            parts.append(b',"apply":' + _encode_json(result.astype(float).tolist()))
+        if "eig" in ops:
+            if matrix.shape[0] != matrix.shape[1]:
+                raise ValueError("matrix must be square")
+            key = array_digest(matrix)
+            cached = _eig_cache.get(key)
+            if cached is None:
+                # Off the event loop unless it is cheap enough to run inline anyway.
+                if eig_cost(matrix.shape[0]) <= MATRIX_INLINE_MAX_COST:
+                    cached = _eig_response(matrix)
+                else:
+                    cached = await run_in_threadpool(_eig_response, matrix)
+                _eig_cache.put(key, cached)
+            status_code, body = cached
+            if status_code != 200:
+                raise ValueError(json.loads(body)["detail"])
+            parts.append(b',"eig":' + body)
+    except ValueError as exc:
+        return _session_error(seq, 400, str(exc))
+    except ComputeLimitError as exc:
+        return _session_error(seq, exc.status_code, str(exc), exc.retry_after)
+    parts.append(b"}")
+    return b"".join(parts)
+
+
+def _session_error(
+    seq: int | None, status_code: int, detail: str, retry_after: int | None = None
+) -> bytes:
+    message = {"type": "error", "seq": seq, "status": status_code, "detail": detail}
+    if retry_after is not None:
+        message["retryAfter"] = retry_after
+    return _encode_json(message)
+
+
+@app.get("/api/v1/datasets/neighbors")
+def dataset_neighbors_by_index(
+    dataset: str = Query("mnist"),
+    split: str | None = Query(None),
+    index: int = Query(..., ge=0),
+    k: int = Query(10, ge=1, le=MAX_NEIGHBORS),
+    metric: str | None = Query(None),
+    exact: bool = Query(False),
+) -> dict:
+    """
+    Return the k rows of a split nearest to one of its own rows.
+
+    @param dataset: Dataset id.
+    @param split: Optional split ("train"|"test"|"all"), validated by dataset.
+    @param index: Query row within the split (left out of the results).
+    @param k: Number of neighbours (1..MAX_NEIGHBORS).
+    @param metric: "l2" (default) or "cosine" for image datasets; "cosine" for text.
+    @param exact: Rank every row instead of probing the coarse clusters.
+    @returns: Dataset metadata plus ranked `neighbors`.
+    """
+    return _neighbors_response(
+        dataset=dataset, split=split, k=k, metric=metric, index=index, exact=exact
+    )
+
+
+@app.post("/api/v1/datasets/neighbors")
+def dataset_neighbors_by_vector(payload: dict = Depends(_matrix_payload)) -> dict:
+    """
+    Return the k rows of a split nearest to a client-supplied vector.
+
+    Accepts `{"dataset", "split"?, "vector", "k"?, "metric"?, "exact"?}`; the
+    vector must have the dataset's `vectorLength`.
+    """
+    try:
+        vector = _coerce_array(payload.get("vector"), ndim=1)
+        if vector is None:
+            raise ValueError("vector must be a non-empty array of finite numbers")
+        k = payload.get("k", 10)
+        if isinstance(k, bool) or not isinstance(k, int) or not 1 <= k <= MAX_NEIGHBORS:
+            raise ValueError(f"k must be an integer between 1 and {MAX_NEIGHBORS}")
+        dataset, split = payload.get("dataset", "mnist"), payload.get("split")
+        metric, exact = payload.get("metric"), payload.get("exact", False)
+        if not isinstance(dataset, str) or not (split is None or isinstance(split, str)):
+            raise ValueError("dataset and split must be strings")
+        if not isinstance(exact, bool):
+            raise ValueError("exact must be a boolean")
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    return _neighbors_response(
+        dataset=dataset, split=split, k=k, metric=metric, vector=vector, exact=exact
+    )
+
+
+def _neighbors_response(dataset: str, split: str | None, **query) -> dict:
+    try:
+        return dataset_neighbors(dataset=dataset, split=split, **query)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:  # pragma: no cover - defensive fallback
+        logger.exception("Neighbour search failed for dataset=%s split=%s", dataset, split)
+        detail = _dataset_failure_detail(dataset, split, exc)
+        raise HTTPException(status_code=500, detail=detail) from exc
+
+
+def _encode_json(payload: object) -> bytes:
+    # `allow_nan=False` as in Starlette's JSONResponse: Infinity/NaN are not JSON.
+    return json.dumps(
+        payload, allow_nan=False, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+@contextmanager
+def _compute_errors() -> Iterator[None]:
+    """
+    Report `ComputeLimitError`s (cost cap, full pool, deadline) with their HTTP status.
+
+    They are never cached: the same matrix may succeed once the pool has capacity.
+    """
+    try:
+        yield
+    except ComputeLimitError as exc:
+        headers = {"Retry-After": str(exc.retry_after)} if exc.retry_after is not None else None
+        raise HTTPException(status_code=exc.status_code, detail=str(exc), headers=headers) from exc
+
+
+def _json_response(payload: dict, headers: dict | None = None) -> Response:
+    """
+    Encode a JSON body as a timed `encode` stage.
+
+    Produces the same bytes as FastAPI's default response but skips its
+    `jsonable_encoder` pass, which would walk every nested list again.
+    """
+    with timed_stage("encode"):
+        body = _encode_json(payload)
+    return Response(content=body, media_type="application/json", headers=headers)
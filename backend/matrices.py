@@ -0,0 +1,224 @@
+"""
+Structure-aware eigendecomposition for the matrix endpoints.
+
+Inputs are classified before solving so the common demo cases avoid the
+general (complex-capable) `np.linalg.eig`:
+  diagonal     eigenvalues are the diagonal, eigenvectors the identity
+  symmetric    `np.linalg.eigh` (always real, ascending eigenvalues)
+  closed-form  non-symmetric 2x2 matrices, solved from the characteristic quadratic
+  triangular   `np.linalg.eig`, whose real spectrum skips the complex checks
+  general      `np.linalg.eig`, rejecting complex results
+
+Symmetric 2x2/3x3 inputs deliberately stay on `eigh`: measured against it,
+analytic formulas were no faster (single or stacked) and less accurate.
+Likewise, Python-level back substitution for triangular eigenvectors lost to
+`dgeev` (which needs no QR sweeps on triangular input) up to n=128, so
+triangular inputs share the general solver and are only reported separately.
+
+`eig_decompose` accepts either one (n, n) matrix or a stack (b, n, n); stacks
+are solved with one vectorized call for the path the whole stack qualifies for.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+import math
+from typing import Literal
+
+import numpy as np
+
+EigPath = Literal["diagonal", "closed-form", "symmetric", "triangular", "general"]
+
+# Imaginary parts below this are treated as rounding noise (matches the original contract).
+COMPLEX_TOLERANCE = 1e-9
+# Closed-form results whose residual |Av - lambda v| exceeds this (relative to the
+# matrix scale) are recomputed with the LAPACK path; this catches near-repeated
+# eigenvalues where the analytic eigenvectors lose accuracy.
+CLOSED_FORM_RESIDUAL_TOLERANCE = 1e-10
+
+COMPLEX_EIGEN_MESSAGE = (
+    "matrix has complex eigenvalues/eigenvectors; only real-valued results are supported"
+)
+
+
+@dataclass(frozen=True)
+class EigResult:
+    eigenvalues: np.ndarray
+    eigenvectors: np.ndarray
+    path: EigPath
+
+
+def eig_decompose(matrices: np.ndarray) -> EigResult:
+    """
+    Compute real eigenvalues/eigenvectors for one square matrix or a stack.
+
+    Eigenvectors are unit-norm columns. Eigenvalue order depends on the path:
+    diagonal/triangular follow the diagonal, symmetric/closed-form are ascending,
+    general keeps LAPACK's order.
+
+    @param matrices: Finite float64 array of shape (n, n) or (b, n, n).
+    @returns: `EigResult` with arrays shaped like the input ((n,)/(n, n) or (b, n)/(b, n, n)).
+    @raises ValueError: On complex results or LAPACK failures; stack errors are
+        prefixed with `matrices[i]: `.
+    """
+    if matrices.ndim == 2:
+        return _decompose_single(matrices)
+    return _decompose_stack(matrices)
+
+
+def _decompose_single(matrix: np.ndarray) -> EigResult:
+    size = matrix.shape[0]
+    if size == 2:
+        # Classify on Python floats; NumPy reductions cost more than the solve here.
+        (a, b), (c, d) = matrix.tolist()
+        if b == 0 and c == 0:
+            return EigResult(np.array([a, d]), np.eye(2), "diagonal")
+        if b != c:
+            solved = _closed_form_2x2_scalar(a, b, c, d)
+            if solved is not None:
+                return EigResult(*solved, "closed-form")
+
+    below = matrix[_strict_lower_mask(size)]
+    above = matrix.T[_strict_lower_mask(size)]
+    has_below, has_above = below.any(), above.any()
+    if not has_below and not has_above:
+        return EigResult(np.diagonal(matrix).copy(), np.eye(size), "diagonal")
+
+    if (below == above).all():
+        eigenvalues, eigenvectors = np.linalg.eigh(matrix)
+        return EigResult(eigenvalues, eigenvectors, "symmetric")
+
+    eigenvalues, eigenvectors = _general(matrix[np.newaxis], single=True)
+    path: EigPath = "triangular" if not has_below or not has_above else "general"
+    return EigResult(eigenvalues[0], eigenvectors[0], path)
+
+
+def _decompose_stack(stack: np.ndarray) -> EigResult:
+    size = stack.shape[-1]
+    below = stack[:, _strict_lower_mask(size)]
+    above = np.swapaxes(stack, 1, 2)[:, _strict_lower_mask(size)]
+    if not below.any() and not above.any():
+        eigenvalues = np.diagonal(stack, axis1=1, axis2=2).copy()
+        eigenvectors = np.broadcast_to(np.eye(size), stack.shape).copy()
+        return EigResult(eigenvalues, eigenvectors, "diagonal")
+
+    if (below == above).all():
+        eigenvalues, eigenvectors = np.linalg.eigh(stack)
+        return EigResult(eigenvalues, eigenvectors, "symmetric")
+
+    if size == 2:
+        solved = _closed_form_2x2(stack)
+        if solved is not None:
+            return EigResult(*solved, "closed-form")
+
+    return EigResult(*_general(stack, single=False), "general")
+
+
+@lru_cache(maxsize=64)
+def _strict_lower_mask(size: int) -> np.ndarray:
+    return np.tri(size, k=-1, dtype=bool)
+
+
+def _general(stack: np.ndarray, single: bool) -> tuple[np.ndarray, np.ndarray]:
+    try:
+        eigenvalues, eigenvectors = np.linalg.eig(stack)
+    except np.linalg.LinAlgError as exc:
+        raise ValueError(f"unable to compute eigendecomposition: {exc}") from exc
+
+    # NumPy only returns complex dtypes when some eigenvalue has a non-zero
+    # imaginary part (never for triangular input); keep the contract
+    # real-valued for current frontends.
+    if eigenvalues.dtype.kind != "c":
+        return eigenvalues, eigenvectors
+    complex_rows = np.any(np.abs(np.imag(eigenvalues)) > COMPLEX_TOLERANCE, axis=1) | np.any(
+        np.abs(np.imag(eigenvectors)) > COMPLEX_TOLERANCE, axis=(1, 2)
+    )
+    if np.any(complex_rows):
+        message = COMPLEX_EIGEN_MESSAGE
+        raise ValueError(message if single else f"matrices[{int(np.argmax(complex_rows))}]: {message}")
+    return np.real(eigenvalues), np.real(eigenvectors)
+
+
+def _closed_form_2x2(stack: np.ndarray) -> tuple[np.ndarray, np.ndarray] | None:
+    a, b = stack[:, 0, 0], stack[:, 0, 1]
+    c, d = stack[:, 1, 0], stack[:, 1, 1]
+    half_trace = (a + d) / 2
+    determinant = a * d - b * c
+    discriminant = (a - d) ** 2 / 4 + b * c
+
+    # Complex roots, however small their imaginary parts: `_general` decides, since
+    # its check also covers the eigenvectors, which can be far from real even then.
+    if np.any(discriminant < 0):
+        return None
+
+    # Take the larger-magnitude root directly and derive the other from the
+    # determinant to avoid cancellation.
+    root = np.sqrt(discriminant)
+    large = half_trace + np.copysign(root, half_trace)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        small = np.where(large != 0, determinant / large, half_trace - np.copysign(root, half_trace))
+    eigenvalues = np.sort(np.stack([large, small], axis=1), axis=1)
+
+    # For each eigenvalue, (b, lambda - a) and (lambda - d, c) both solve
+    # (A - lambda I) v = 0; keep whichever is better conditioned.
+    first = np.stack([np.broadcast_to(b[:, None], eigenvalues.shape), eigenvalues - a[:, None]], axis=1)
+    second = np.stack([eigenvalues - d[:, None], np.broadcast_to(c[:, None], eigenvalues.shape)], axis=1)
+    eigenvectors = np.where(
+        np.linalg.norm(first, axis=1, keepdims=True) >= np.linalg.norm(second, axis=1, keepdims=True),
+        first,
+        second,
+    )
+    return _finish_closed_form(stack, eigenvalues, eigenvectors)
+
+
+def _finish_closed_form(
+    stack: np.ndarray, eigenvalues: np.ndarray, eigenvectors: np.ndarray
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    Normalize closed-form eigenvector columns and verify them by residual.
+
+    Returns None (use a LAPACK path) when any column is degenerate or inaccurate.
+    """
+    norms = np.linalg.norm(eigenvectors, axis=1, keepdims=True)
+    if np.any(norms == 0):
+        return None
+    eigenvectors = eigenvectors / norms
+
+    # Relative to each matrix's largest entry, so tiny-scale inputs are checked too.
+    scale = np.abs(stack).max(axis=(1, 2))
+    residual = np.abs(stack @ eigenvectors - eigenvectors * eigenvalues[:, None, :]).max(axis=(1, 2))
+    if np.any(residual > CLOSED_FORM_RESIDUAL_TOLERANCE * scale):
+        return None
+    return eigenvalues, eigenvectors
+
+
+def _closed_form_2x2_scalar(
+    a: float, b: float, c: float, d: float
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    Scalar twin of `_closed_form_2x2` for one matrix [[a, b], [c, d]].
+    """
+    half_trace = (a + d) / 2
+    discriminant = (a - d) ** 2 / 4 + b * c
+    if discriminant < 0:
+        return None
+
+    root = math.sqrt(discriminant)
+    large = half_trace + math.copysign(root, half_trace)
+    small = (a * d - b * c) / large if large != 0 else half_trace - math.copysign(root, half_trace)
+    eigenvalues = (small, large) if small <= large else (large, small)
+
+    scale = CLOSED_FORM_RESIDUAL_TOLERANCE * max(abs(a), abs(b), abs(c), abs(d))
+    columns = []
+    for value in eigenvalues:
+        x, y = (b, value - a) if math.hypot(b, value - a) >= math.hypot(value - d, c) else (value - d, c)
+        norm = math.hypot(x, y)
+        if norm == 0:
+            return None
+        x, y = x / norm, y / norm
+        if abs(a * x + b * y - value * x) > scale or abs(c * x + d * y - value * y) > scale:
+            return None
+        columns.append((x, y))
+    (x0, y0), (x1, y1) = columns
+    return np.array(eigenvalues), np.array([[x0, x1], [y0, y1]])
@@ -0,0 +1,224 @@
+"""
+Per-stage request timing and a Prometheus text exposition of backend metrics.
+
+Code anywhere below a request (routes, dependencies, the dataset engine running
+in the threadpool) wraps its expensive steps in `timed_stage(name)`. Each
+duration is:
+  - collected for the current request in a context variable, which
+    `MetricsMiddleware` turns into a `Server-Timing` response header;
+  - observed in the `STAGE_DURATION` histogram, including stages outside
+    requests, such as warm-up loads.
+
+`MetricsMiddleware` also records whole-request latency per route template.
+`/metrics` renders both histograms plus scrape-time `MetricFamily` values
+(cache counters, dataset sizes) with `render_metrics`.
+
+No client library is needed: the text format is a few lines per series.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+import math
+import threading
+import time
+from typing import Iterable, Iterator, Literal
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Upper bounds (seconds) shared by the request and stage histograms: sub-millisecond
+# matrix requests up to cold dataset downloads.
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+@dataclass(frozen=True)
+class MetricFamily:
+    name: str
+    help: str
+    type: Literal["counter", "gauge"]
+    samples: list[tuple[dict[str, str], float]]
+
+
+class Histogram:
+    """
+    Thread-safe cumulative histogram with one series per label combination.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        label_names: tuple[str, ...],
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.buckets = buckets
+        # label values -> (per-bucket counts, sum, count); bucket counts are not cumulative.
+        self._series: dict[tuple[str, ...], tuple[list[int], float, int]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(labels[name] for name in self.label_names)
+        position = _bucket_position(self.buckets, value)
+        with self._lock:
+            counts, total, count = self._series.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            if position < len(counts):
+                counts[position] += 1
+            self._series[key] = (counts, total + value, count + 1)
+
+    def render(self) -> list[str]:
+        """
+        @returns: Exposition lines (`_bucket`, `_sum`, `_count` per series).
+        """
+        with self._lock:
+            series = [
+                (key, list(counts), total, count)
+                for key, (counts, total, count) in self._series.items()
+            ]
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, counts, total, count in sorted(series):
+            labels = dict(zip(self.label_names, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                bucket_labels = {**labels, "le": _format_value(bound)}
+                lines.append(_sample(f"{self.name}_bucket", bucket_labels, cumulative))
+            lines.append(_sample(f"{self.name}_bucket", {**labels, "le": "+Inf"}, count))
+            lines.append(_sample(f"{self.name}_sum", labels, total))
+            lines.append(_sample(f"{self.name}_count", labels, count))
+        return lines
+
+
+REQUEST_DURATION = Histogram(
+    "linalg_http_request_duration_seconds",
+    "HTTP request latency (until the last body byte is sent) per route template.",
+    ("route", "method", "status"),
+)
+STAGE_DURATION = Histogram(
+    "linalg_stage_duration_seconds",
+    "Duration of instrumented request stages (dataset load, sampling, encoding, ...).",
+    ("stage",),
+)
+
+# Stage durations of the request being served; None outside requests. The dict is
+# shared (not copied) with threadpool workers, which run in a copy of the context.
+_request_stages: ContextVar[dict[str, float] | None] = ContextVar("request_stages", default=None)
+
+
+@contextmanager
+def timed_stage(name: str) -> Iterator[None]:
+    """
+    Time a block as a named stage of the current request.
+
+    @param name: Stage name; must be a `Server-Timing` token (letters, digits, `-`).
+        Repeated stages within one request are summed.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_DURATION.observe(elapsed, stage=name)
+        stages = _request_stages.get()
+        if stages is not None:
+            stages[name] = stages.get(name, 0.0) + elapsed
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware adding a `Server-Timing` header and recording request latency.
+
+    The header is built when the response starts, so it lists every stage that
+    finished before the first byte plus `total` (time to headers). Streaming
+    responses report their latency when the last chunk has been sent.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stages: dict[str, float] = {}
+        token = _request_stages.set(stages)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                header = _server_timing(stages, time.perf_counter() - started)
+                timing = (b"server-timing", header.encode("latin-1"))
+                message = {**message, "headers": [*message.get("headers", []), timing]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stages.reset(token)
+            # FastAPI stores the matched route in the scope; its template keeps label
+            # cardinality bounded (unmatched paths share one series).
+            route = scope.get("route")
+            REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                route=getattr(route, "path", "unmatched"),
+                method=scope["method"],
+                status=str(status),
+            )
+
+
+def render_metrics(families: Iterable[Histogram | MetricFamily]) -> str:
+    """
+    Render metrics in the Prometheus text exposition format (version 0.0.4).
+
+    @param families: Histograms and scrape-time counter/gauge families.
+    @returns: Exposition text ending in a newline.
+    """
+    lines: list[str] = []
+    for family in families:
+        if isinstance(family, Histogram):
+            lines.extend(family.render())
+            continue
+        lines.append(f"# HELP {family.name} {family.help}")
+        lines.append(f"# TYPE {family.name} {family.type}")
+        lines.extend(_sample(family.name, labels, value) for labels, value in family.samples)
+    return "\n".join(lines) + "\n"
+
+
+def _server_timing(stages: dict[str, float], total: float) -> str:
+    entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in stages.items()]
+    entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
+
+
+def _bucket_position(buckets: tuple[float, ...], value: float) -> int:
+    for position, bound in enumerate(buckets):
+        if value <= bound:
+            return position
+    return len(buckets)
+
+
+def _sample(name: str, labels: dict[str, str], value: float) -> str:
+    if not labels:
+        return f"{name} {_format_value(value)}"
+    rendered = ",".join(f'{key}="{_escape_label(str(label))}"' for key, label in labels.items())
+    return f"{name}{{{rendered}}} {_format_value(value)}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int) or (math.isfinite(value) and float(value).is_integer()):
+        return str(int(value))
+    return repr(float(value))
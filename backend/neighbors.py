@@ -0,0 +1,207 @@
+"""
+Nearest-neighbour search over dataset rows.
+
+An index keeps only small derived arrays next to the dataset, never a float
+copy of it:
+  squared_norms  float64 (n,), shared by L2 distances and cosine similarities
+  coarse lists   dense datasets with at least `IVF_MIN_ROWS` rows get an
+                 inverted-file index: k-means centroids (float32) plus the rows
+                 of each cluster as CSR-style offsets into a cluster-sorted
+                 permutation
+
+Queries against an inverted file score the centroids, gather the rows of the
+`IVF_PROBES` best clusters and rank only those exactly, so a query touches a
+few thousand MNIST rows instead of 70k. Exact search scans the matrix in
+float32 blocks of `NEIGHBOR_BLOCK_ROWS` rows. Sparse (CSR) matrices are always
+searched exactly: one sparse matrix-vector product is already cheap.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+from scipy import sparse
+
+NeighborMetric = Literal["l2", "cosine"]
+NeighborPath = Literal["ivf", "exact"]
+
+# Rows converted to float32 per block for exact scans, k-means assignment and norms.
+NEIGHBOR_BLOCK_ROWS = 8192
+# Smaller dense datasets are scanned exactly; clustering would not pay off.
+IVF_MIN_ROWS = 4096
+# Clusters probed per query; more probes trade latency for recall.
+IVF_PROBES = 8
+# k-means trains on this many rows per cluster (sampled) for this many Lloyd steps.
+IVF_TRAIN_ROWS_PER_LIST = 32
+IVF_TRAIN_ITERATIONS = 10
+IVF_SEED = 0
+
+
+@dataclass(frozen=True)
+class NeighborIndex:
+    squared_norms: np.ndarray
+    centroids: np.ndarray | None
+    list_offsets: np.ndarray | None
+    list_rows: np.ndarray | None
+
+
+@dataclass(frozen=True)
+class NeighborResult:
+    indices: np.ndarray
+    scores: np.ndarray
+    path: NeighborPath
+
+
+def build_neighbor_index(matrix: np.ndarray | sparse.csr_matrix) -> NeighborIndex:
+    """
+    Precompute row norms and, for large dense matrices, an inverted-file index.
+
+    @param matrix: 2D (n, d) dense rows (any numeric dtype, memmaps fine) or CSR rows.
+    @returns: `NeighborIndex` for `search_neighbors` on the same matrix.
+    """
+    if sparse.issparse(matrix):
+        data = np.asarray(matrix.data, dtype=np.float64)
+        squared_norms = np.zeros(matrix.shape[0], dtype=np.float64)
+        lengths = np.diff(matrix.indptr)
+        nonempty = lengths > 0
+        if matrix.nnz:
+            squared_norms[nonempty] = np.add.reduceat(data * data, matrix.indptr[:-1][nonempty])
+        return NeighborIndex(squared_norms, None, None, None)
+
+    squared_norms = np.empty(matrix.shape[0], dtype=np.float64)
+    for start, block in _float_blocks(matrix):
+        squared_norms[start : start + block.shape[0]] = np.einsum("ij,ij->i", block, block)
+    if matrix.shape[0] < IVF_MIN_ROWS:
+        return NeighborIndex(squared_norms, None, None, None)
+
+    centroids = _train_centroids(matrix)
+    assignments = np.empty(matrix.shape[0], dtype=np.int64)
+    centroid_norms = np.einsum("ij,ij->i", centroids, centroids)
+    for start, block in _float_blocks(matrix):
+        assignments[start : start + block.shape[0]] = np.argmin(
+            centroid_norms - 2 * (block @ centroids.T), axis=1
+        )
+    list_rows = np.argsort(assignments, kind="stable")
+    list_offsets = np.zeros(centroids.shape[0] + 1, dtype=np.int64)
+    np.cumsum(np.bincount(assignments, minlength=centroids.shape[0]), out=list_offsets[1:])
+    return NeighborIndex(squared_norms, centroids, list_offsets, list_rows)
+
+
+def search_neighbors(
+    matrix: np.ndarray | sparse.csr_matrix,
+    index: NeighborIndex,
+    query: np.ndarray,
+    k: int,
+    metric: NeighborMetric,
+    exclude: int | None = None,
+    exact: bool = False,
+) -> NeighborResult:
+    """
+    Find the k rows closest to a query vector.
+
+    @param matrix: The matrix `index` was built from.
+    @param index: Prebuilt `NeighborIndex`.
+    @param query: Float (d,) query vector.
+    @param k: Number of neighbours to return.
+    @param metric: "l2" (ascending Euclidean distance) or "cosine" (descending similarity).
+    @param exclude: Row to leave out (the query's own row when searching by index).
+    @param exact: Scan every row even when an inverted file exists.
+    @returns: `NeighborResult` with row indices, their distances/similarities, and the path used.
+    """
+    query = np.asarray(query, dtype=np.float32 if not sparse.issparse(matrix) else np.float64)
+    path: NeighborPath = "exact"
+    candidates = None
+    if index.centroids is not None and not exact:
+        candidates = _probe_lists(index, query, metric)
+        if candidates.shape[0] < k + 1:
+            candidates = None
+        else:
+            path = "ivf"
+
+    if candidates is None:
+        products = _all_products(matrix, query)
+        squared_norms = index.squared_norms
+        rows = np.arange(matrix.shape[0])
+    else:
+        rows = np.sort(candidates)
+        products = np.asarray(matrix[rows], dtype=np.float32) @ query
+        squared_norms = index.squared_norms[rows]
+
+    query_norm = float(np.dot(query, query))
+    if metric == "l2":
+        scores = np.sqrt(np.maximum(squared_norms - 2 * products + query_norm, 0.0))
+        order_keys = scores
+    else:
+        denominators = np.sqrt(squared_norms * query_norm)
+        scores = np.divide(
+            products, denominators, out=np.zeros(products.shape[0]), where=denominators > 0
+        )
+        order_keys = -scores
+    if exclude is not None:
+        order_keys = order_keys.copy()
+        order_keys[rows == exclude] = np.inf
+
+    count = min(k, int(np.isfinite(order_keys).sum()))
+    if count == 0:
+        return NeighborResult(np.zeros(0, dtype=np.int64), np.zeros(0), path)
+    best = np.argpartition(order_keys, count - 1)[:count]
+    best = best[np.argsort(order_keys[best], kind="stable")]
+    return NeighborResult(rows[best], np.asarray(scores[best], dtype=np.float64), path)
+
+
+def _probe_lists(index: NeighborIndex, query: np.ndarray, metric: NeighborMetric) -> np.ndarray:
+    centroids = index.centroids
+    products = centroids @ query
+    centroid_norms = np.einsum("ij,ij->i", centroids, centroids)
+    if metric == "l2":
+        keys = centroid_norms - 2 * products
+    else:
+        keys = -products / np.sqrt(np.maximum(centroid_norms, 1e-12))
+    probes = min(IVF_PROBES, centroids.shape[0])
+    nearest = np.argpartition(keys, probes - 1)[:probes]
+    return np.concatenate(
+        [index.list_rows[index.list_offsets[c] : index.list_offsets[c + 1]] for c in nearest]
+    )
+
+
+def _all_products(matrix: np.ndarray | sparse.csr_matrix, query: np.ndarray) -> np.ndarray:
+    if sparse.issparse(matrix):
+        return np.asarray(matrix @ query, dtype=np.float64).ravel()
+    products = np.empty(matrix.shape[0], dtype=np.float32)
+    for start, block in _float_blocks(matrix):
+        np.matmul(block, query, out=products[start : start + block.shape[0]])
+    return products
+
+
+def _train_centroids(matrix: np.ndarray) -> np.ndarray:
+    """
+    Lloyd's k-means on a row sample, with about sqrt(n) clusters.
+    """
+    rows = matrix.shape[0]
+    lists = int(np.clip(round(np.sqrt(rows)), 16, 1024))
+    rng = np.random.default_rng(IVF_SEED)
+    sample_size = min(rows, lists * IVF_TRAIN_ROWS_PER_LIST)
+    sample = np.sort(rng.choice(rows, size=sample_size, replace=False))
+    training = np.asarray(matrix[sample], dtype=np.float32)
+
+    centroids = training[rng.choice(sample_size, size=lists, replace=False)].copy()
+    for _ in range(IVF_TRAIN_ITERATIONS):
+        centroid_norms = np.einsum("ij,ij->i", centroids, centroids)
+        assignments = np.argmin(centroid_norms - 2 * (training @ centroids.T), axis=1)
+        # Summing rows per cluster as one sparse one-hot product avoids a Python loop.
+        membership = sparse.csr_matrix(
+            (np.ones(sample_size, dtype=np.float32), (assignments, np.arange(sample_size))),
+            shape=(lists, sample_size),
+        )
+        sizes = np.bincount(assignments, minlength=lists)
+        filled = sizes > 0
+        # Empty clusters keep their previous centroid.
+        centroids[filled] = (membership @ training)[filled] / sizes[filled, np.newaxis]
+    return centroids
+
+
+def _float_blocks(matrix: np.ndarray):
+    for start in range(0, matrix.shape[0], NEIGHBOR_BLOCK_ROWS):
+        yield start, np.asarray(matrix[start : start + NEIGHBOR_BLOCK_ROWS], dtype=np.float32)
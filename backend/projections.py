@@ -0,0 +1,149 @@
+"""
+Truncated PCA of dataset matrices via randomized SVD.
+
+The centered data matrix A = X - 1 mean^T is never formed. Every product the
+algorithm needs (A @ M and A^T @ M) is computed from X plus a rank-one mean
+correction, so:
+  dense   uint8 image rows are converted to float64 `PCA_CHUNK_ROWS` at a time
+          (MNIST's 70k x 784 matrix never exists as one float64 array)
+  sparse  CSR word counts go straight into sparse-dense products, never densified
+
+The randomized range finder (Halko, Martinsson & Tropp) samples
+`components + PCA_OVERSAMPLES` directions, sharpens them with
+`PCA_POWER_ITERATIONS` QR-normalized power iterations, and takes an exact SVD
+of the small projected matrix. A fixed seed keeps results reproducible.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+
+# Rows converted to float64 per block for dense products.
+PCA_CHUNK_ROWS = 4096
+# Extra random directions beyond the requested rank; improves the top components.
+PCA_OVERSAMPLES = 10
+# Power iterations for slowly decaying spectra (images and word counts both qualify).
+PCA_POWER_ITERATIONS = 4
+PCA_SEED = 0
+
+
+@dataclass(frozen=True)
+class PCAResult:
+    mean: np.ndarray
+    components: np.ndarray
+    singular_values: np.ndarray
+    explained_variance: np.ndarray
+    explained_variance_ratio: np.ndarray
+    scores: np.ndarray
+
+
+def truncated_pca(matrix: np.ndarray | sparse.csr_matrix, components: int) -> PCAResult:
+    """
+    Compute the top principal components of a row-sample matrix.
+
+    @param matrix: (n, d) samples; dense arrays of any numeric dtype (e.g. uint8,
+        possibly memmapped) or a CSR matrix.
+    @param components: Number of components to keep (clipped to min(n, d)).
+    @returns: `PCAResult` with float32 `mean` (d,), `components` (k, d) unit rows
+        with a positive largest-magnitude loading, float64 singular values and
+        (ratio of) explained variance (k,), and float32 `scores` (n, k), the
+        centered rows projected onto the components.
+    """
+    rows, columns = matrix.shape
+    if rows < 2:
+        raise ValueError("PCA needs at least two samples")
+    rank = min(components, rows, columns)
+    sketch = min(rank + PCA_OVERSAMPLES, rows, columns)
+
+    mean = _column_sums(matrix) / rows
+    omega = np.random.default_rng(PCA_SEED).standard_normal((columns, sketch))
+    basis = _orthonormal(_centered_product(matrix, mean, omega))
+    for _ in range(PCA_POWER_ITERATIONS):
+        row_basis = _orthonormal(_centered_transpose_product(matrix, mean, basis))
+        basis = _orthonormal(_centered_product(matrix, mean, row_basis))
+
+    # B = Q^T A is small (sketch x d); its SVD gives A's leading singular triplets.
+    projected = _centered_transpose_product(matrix, mean, basis).T
+    _, singular_values, right_t = np.linalg.svd(projected, full_matrices=False)
+    singular_values, right_t = singular_values[:rank], right_t[:rank]
+
+    # Fix each component's sign so repeated runs (and workers) agree.
+    signs = np.sign(right_t[np.arange(rank), np.argmax(np.abs(right_t), axis=1)])
+    signs[signs == 0] = 1.0
+    right_t *= signs[:, np.newaxis]
+    # Project exactly onto the returned components rather than reusing Q @ U S,
+    # which only approximates the projection when the spectrum decays slowly.
+    scores = _centered_product(matrix, mean, right_t.T)
+
+    explained_variance = singular_values**2 / (rows - 1)
+    total_variance = (_sum_of_squares(matrix) - rows * float(mean @ mean)) / (rows - 1)
+    ratio = explained_variance / total_variance if total_variance > 0 else np.zeros(rank)
+    return PCAResult(
+        mean=mean.astype(np.float32),
+        components=right_t.astype(np.float32),
+        singular_values=singular_values,
+        explained_variance=explained_variance,
+        explained_variance_ratio=ratio,
+        scores=scores.astype(np.float32),
+    )
+
+
+def _orthonormal(block: np.ndarray) -> np.ndarray:
+    return np.linalg.qr(block)[0]
+
+
+def _column_sums(matrix: np.ndarray | sparse.csr_matrix) -> np.ndarray:
+    if sparse.issparse(matrix):
+        return np.asarray(matrix.sum(axis=0, dtype=np.float64)).ravel()
+    sums = np.zeros(matrix.shape[1], dtype=np.float64)
+    for chunk in _dense_chunks(matrix):
+        sums += chunk.sum(axis=0)
+    return sums
+
+
+def _sum_of_squares(matrix: np.ndarray | sparse.csr_matrix) -> float:
+    if sparse.issparse(matrix):
+        data = np.asarray(matrix.data, dtype=np.float64)
+        return float(data @ data)
+    return float(sum(np.einsum("ij,ij->", chunk, chunk) for chunk in _dense_chunks(matrix)))
+
+
+def _centered_product(
+    matrix: np.ndarray | sparse.csr_matrix, mean: np.ndarray, other: np.ndarray
+) -> np.ndarray:
+    """
+    (X - 1 mean^T) @ other, shape (n, m).
+    """
+    correction = mean @ other
+    if sparse.issparse(matrix):
+        return np.asarray(matrix @ other) - correction
+    result = np.empty((matrix.shape[0], other.shape[1]), dtype=np.float64)
+    for start, chunk in _dense_chunks(matrix, with_offsets=True):
+        np.matmul(chunk, other, out=result[start : start + chunk.shape[0]])
+    result -= correction
+    return result
+
+
+def _centered_transpose_product(
+    matrix: np.ndarray | sparse.csr_matrix, mean: np.ndarray, other: np.ndarray
+) -> np.ndarray:
+    """
+    (X - 1 mean^T)^T @ other, shape (d, m).
+    """
+    correction = np.outer(mean, other.sum(axis=0))
+    if sparse.issparse(matrix):
+        return np.asarray(matrix.T @ other) - correction
+    result = np.zeros((matrix.shape[1], other.shape[1]), dtype=np.float64)
+    for start, chunk in _dense_chunks(matrix, with_offsets=True):
+        result += chunk.T @ other[start : start + chunk.shape[0]]
+    result -= correction
+    return result
+
+
+def _dense_chunks(matrix: np.ndarray, with_offsets: bool = False):
+    for start in range(0, matrix.shape[0], PCA_CHUNK_ROWS):
+        chunk = np.asarray(matrix[start : start + PCA_CHUNK_ROWS], dtype=np.float64)
+        yield (start, chunk) if with_offsets else chunk
@@ -0,0 +1,207 @@
+"""
+Sparse (COO/CSR) matrix input and iterative eigensolvers for the matrix endpoints.
+
+Request payloads name a format and carry scipy's arrays:
+  coo  {"format": "coo", "shape": [m, n], "row": [...], "col": [...], "data": [...]}
+       (duplicate entries are summed)
+  csr  {"format": "csr", "shape": [m, n], "indptr": [...], "indices": [...], "data": [...]}
+Both become a canonical `csr_matrix`, which products and solvers use without densifying.
+
+`sparse_eig` computes k eigenpairs with ARPACK through `scipy.sparse.linalg`
+(imported on first use):
+  lanczos  symmetric input, `eigsh` (always real)
+  arnoldi  non-symmetric input, `eigs`, rejecting complex results like the dense path
+Matrices up to `SPARSE_EIG_DENSE_MAX_SIZE` are densified and handed to
+`eig_decompose` instead: ARPACK needs k < n - 1, and costs more than a dense solve there.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+from scipy import sparse
+
+try:
+    from .matrices import COMPLEX_EIGEN_MESSAGE, COMPLEX_TOLERANCE, EigPath, eig_decompose
+except ImportError:
+    from matrices import COMPLEX_EIGEN_MESSAGE, COMPLEX_TOLERANCE, EigPath, eig_decompose
+
+SparseFormat = Literal["coo", "csr"]
+# Which eigenvalues to return: largest magnitude, largest algebraic, smallest algebraic.
+SparseEigWhich = Literal["LM", "LA", "SA"]
+
+SPARSE_FORMATS: tuple[SparseFormat, ...] = ("coo", "csr")
+SPARSE_EIG_WHICH: tuple[SparseEigWhich, ...] = ("LM", "LA", "SA")
+# Largest accepted rows/columns; bounds ARPACK's (n, basis) workspace and dense results.
+MAX_SPARSE_DIMENSION = 262_144
+SPARSE_EIG_MAX_K = 32
+SPARSE_EIG_DEFAULT_K = 6
+# Square matrices up to this size are solved densely (at most 64^2 float64 = 32 KiB).
+SPARSE_EIG_DENSE_MAX_SIZE = 64
+# Seed of ARPACK's start vector, so repeated requests return identical eigenvectors.
+SPARSE_EIG_SEED = 0
+
+# `eigs` has no algebraic modes; its real-part modes match them for real spectra.
+_ARNOLDI_WHICH = {"LM": "LM", "LA": "LR", "SA": "SR"}
+
+
+@dataclass(frozen=True)
+class SparseEigResult:
+    eigenvalues: np.ndarray
+    eigenvectors: np.ndarray
+    path: Literal["lanczos", "arnoldi"] | EigPath
+
+
+def sparse_matrix_from_payload(raw: object) -> sparse.csr_matrix:
+    """
+    Validate a COO/CSR request payload and build a canonical float64 CSR matrix.
+
+    Index and value fields may be lists or arrays already decoded by
+    `decode_matrix_json`.
+
+    @param raw: Sparse matrix object (see the module docstring).
+    @returns: `csr_matrix` with sorted indices and duplicates summed.
+    @throws ValueError: On a missing/unknown format, bad shape, non-integer or
+        out-of-range indices, non-finite values or inconsistent array lengths.
+    """
+    if not isinstance(raw, dict):
+        raise ValueError("sparse matrix must be an object")
+    matrix_format = raw.get("format")
+    if matrix_format not in SPARSE_FORMATS:
+        raise ValueError(f"matrix.format must be one of: {', '.join(SPARSE_FORMATS)}")
+    shape = _sparse_shape(raw.get("shape"))
+    data = _value_array(raw.get("data"))
+
+    if matrix_format == "coo":
+        row = _index_array(raw.get("row"), "matrix.row", shape[0])
+        col = _index_array(raw.get("col"), "matrix.col", shape[1])
+        if not row.shape[0] == col.shape[0] == data.shape[0]:
+            raise ValueError("matrix.row, matrix.col and matrix.data must have the same length")
+        return sparse.coo_matrix((data, (row, col)), shape=shape).tocsr()
+
+    indptr = _index_array(raw.get("indptr"), "matrix.indptr", data.shape[0] + 1)
+    indices = _index_array(raw.get("indices"), "matrix.indices", shape[1])
+    if indptr.shape[0] != shape[0] + 1:
+        raise ValueError(f"matrix.indptr must have {shape[0] + 1} entries (rows + 1)")
+    if indptr[0] != 0 or indptr[-1] != data.shape[0] or (np.diff(indptr) < 0).any():
+        raise ValueError("matrix.indptr must rise from 0 to len(matrix.data) without decreasing")
+    if indices.shape[0] != data.shape[0]:
+        raise ValueError("matrix.indices and matrix.data must have the same length")
+    matrix = sparse.csr_matrix((data, indices, indptr), shape=shape)
+    matrix.sum_duplicates()
+    return matrix
+
+
+def sparse_eig(matrix: sparse.csr_matrix, k: int, which: SparseEigWhich) -> SparseEigResult:
+    """
+    Compute k real eigenpairs of a square sparse matrix.
+
+    @param matrix: Square CSR matrix from `sparse_matrix_from_payload`.
+    @param k: Number of eigenpairs (1..min(SPARSE_EIG_MAX_K, n)).
+    @param which: `LM` (largest magnitude), `LA` (largest) or `SA` (smallest).
+    @returns: `SparseEigResult` with (k,) eigenvalues ordered by `which` (the first is the
+        largest magnitude, largest or smallest) and unit-norm (n, k) eigenvector columns.
+    @throws ValueError: On a non-square matrix, k out of range, complex results, no
+        ARPACK convergence or any other ARPACK error.
+    """
+    size = matrix.shape[0]
+    if matrix.shape[1] != size:
+        raise ValueError("matrix must be square")
+    if not 1 <= k <= min(SPARSE_EIG_MAX_K, size):
+        raise ValueError(f"k must be between 1 and {min(SPARSE_EIG_MAX_K, size)}")
+
+    if size <= SPARSE_EIG_DENSE_MAX_SIZE:
+        dense = eig_decompose(matrix.toarray())
+        eigenvalues, eigenvectors, path = dense.eigenvalues, dense.eigenvectors, dense.path
+    else:
+        # Imported here: scipy.sparse.linalg (ARPACK) is only needed for sparse eigenproblems.
+        from scipy.sparse import linalg
+
+        start = np.random.default_rng(SPARSE_EIG_SEED).standard_normal(size)
+        try:
+            if (matrix != matrix.T).nnz == 0:
+                eigenvalues, eigenvectors = linalg.eigsh(matrix, k=k, which=which, v0=start)
+                path = "lanczos"
+            else:
+                eigenvalues, eigenvectors = linalg.eigs(
+                    matrix, k=k, which=_ARNOLDI_WHICH[which], v0=start
+                )
+                eigenvalues, eigenvectors = _real_eigenpairs(eigenvalues, eigenvectors)
+                path = "arnoldi"
+        except linalg.ArpackNoConvergence as exc:
+            raise ValueError(f"sparse eigensolver did not converge: {exc}") from exc
+        except linalg.ArpackError as exc:
+            # Any other ARPACK failure (e.g. a breakdown on this input) is about the matrix too.
+            raise ValueError(f"sparse eigensolver failed: {exc}") from exc
+
+    if which == "LM":
+        order = np.argsort(-np.abs(eigenvalues), kind="stable")
+    elif which == "LA":
+        order = np.argsort(-eigenvalues, kind="stable")
+    else:
+        order = np.argsort(eigenvalues, kind="stable")
+    order = order[:k]
+    return SparseEigResult(eigenvalues[order], eigenvectors[:, order], path)
+
+
+def _real_eigenpairs(
+    eigenvalues: np.ndarray, eigenvectors: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    scale = max(float(np.abs(eigenvalues).max(initial=0.0)), 1.0)
+    if np.abs(eigenvalues.imag).max(initial=0.0) > COMPLEX_TOLERANCE * scale:
+        raise ValueError(COMPLEX_EIGEN_MESSAGE)
+    # ARPACK returns real eigenvectors times an arbitrary complex phase; divide it out
+    # using each column's largest entry before dropping the imaginary part.
+    pivots = eigenvectors[np.abs(eigenvectors).argmax(axis=0), np.arange(eigenvectors.shape[1])]
+    eigenvectors = eigenvectors * (np.abs(pivots) / pivots)
+    if np.abs(eigenvectors.imag).max(initial=0.0) > COMPLEX_TOLERANCE:
+        raise ValueError(COMPLEX_EIGEN_MESSAGE)
+    return eigenvalues.real, eigenvectors.real
+
+
+def _sparse_shape(raw: object) -> tuple[int, int]:
+    shape = _float_array(raw)
+    if (
+        shape is None
+        or shape.shape[0] != 2
+        or not np.isfinite(shape).all()
+        or not (np.floor(shape) == shape).all()
+    ):
+        raise ValueError("matrix.shape must be [rows, columns]")
+    rows, columns = int(shape[0]), int(shape[1])
+    if not (1 <= rows <= MAX_SPARSE_DIMENSION and 1 <= columns <= MAX_SPARSE_DIMENSION):
+        raise ValueError(f"matrix.shape entries must be between 1 and {MAX_SPARSE_DIMENSION}")
+    return rows, columns
+
+
+def _value_array(raw: object) -> np.ndarray:
+    array = _float_array(raw)
+    if array is None:
+        raise ValueError("matrix.data must be an array of numbers")
+    if not np.isfinite(array).all():
+        raise ValueError("matrix.data entries must be finite numbers")
+    return array
+
+
+def _index_array(raw: object, name: str, upper: int) -> np.ndarray:
+    array = _float_array(raw)
+    if array is None or not (np.floor(array) == array).all():
+        raise ValueError(f"{name} must be an array of integers")
+    if array.shape[0] and (array.min() < 0 or array.max() >= upper):
+        raise ValueError(f"{name} entries must be between 0 and {upper - 1}")
+    return array.astype(np.int64)
+
+
+def _float_array(raw: object) -> np.ndarray | None:
+    if isinstance(raw, np.ndarray):
+        array = raw
+    elif not isinstance(raw, list):
+        return None
+    else:
+        try:
+            array = np.array(raw, dtype=np.float64)
+        except (TypeError, ValueError, OverflowError):
+            return None
+    return array if array.ndim == 1 else None
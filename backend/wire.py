@@ -0,0 +1,107 @@
+"""
+Compact binary framing for array-heavy API responses.
+
+Frame layout (all integers little-endian):
+  bytes 0..3   magic `LAF1`
+  bytes 4..7   uint32 header length H
+  next H bytes UTF-8 JSON header, space-padded so the data section starts 8-byte aligned
+  data section array blocks, each starting on an 8-byte boundary
+
+The header carries response metadata plus a `blocks` list describing each
+array (`name`, `dtype`, `shape`, `offset`, `byteLength`); offsets are relative
+to the start of the data section, so clients can wrap blocks in typed arrays
+without copying.
+
+A frame stream (`application/vnd.linalg.frame-stream`) is a plain
+concatenation of frames; each frame's length follows from its header, since
+the data section ends at the last block's end rounded up to 8 bytes.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from typing import Sequence
+
+import numpy as np
+
+FRAME_MEDIA_TYPE = "application/vnd.linalg.frame"
+FRAME_STREAM_MEDIA_TYPE = "application/vnd.linalg.frame-stream"
+FRAME_MAGIC = b"LAF1"
+FRAME_ALIGNMENT = 8
+
+
+def encode_frame(header: dict, blocks: Sequence[tuple[str, np.ndarray]]) -> bytes:
+    """
+    Encode metadata and arrays into a single binary frame.
+
+    Array buffers are joined directly into the output; no per-element Python
+    objects are created.
+
+    @param header: JSON-serializable metadata (must not contain `blocks`).
+    @param blocks: Named arrays in payload order.
+    @returns: Encoded frame bytes.
+    """
+    descriptors: list[dict] = []
+    buffers: list[memoryview | bytes] = []
+    offset = 0
+    for name, array in blocks:
+        # Force a contiguous little-endian buffer so clients can view it directly.
+        contiguous = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+        byte_length = int(contiguous.nbytes)
+        descriptors.append(
+            {
+                "name": name,
+                "dtype": contiguous.dtype.name,
+                "shape": list(contiguous.shape),
+                "offset": offset,
+                "byteLength": byte_length,
+            }
+        )
+        buffers.append(memoryview(contiguous).cast("B"))
+        padding = -byte_length % FRAME_ALIGNMENT
+        if padding:
+            buffers.append(b"\0" * padding)
+        offset += byte_length + padding
+
+    header_bytes = json.dumps(
+        {**header, "blocks": descriptors}, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+    header_bytes += b" " * (-(len(header_bytes) + 8) % FRAME_ALIGNMENT)
+    prefix = FRAME_MAGIC + struct.pack("<I", len(header_bytes))
+    return b"".join([prefix, header_bytes, *buffers])
+
+
+def accepts_frame(accept: str | None) -> bool:
+    """
+    Check whether an `Accept` header asks for the binary frame media type.
+
+    @param accept: Raw `Accept` header value.
+    @returns: True when the frame media type is listed with a non-zero quality.
+    """
+    return accepts_media_type(accept, FRAME_MEDIA_TYPE)
+
+
+def accepts_media_type(accept: str | None, expected: str) -> bool:
+    """
+    Check whether an `Accept` header explicitly lists a media type.
+
+    @param accept: Raw `Accept` header value.
+    @param expected: Lower-case media type to look for (wildcards are not matched).
+    @returns: True when `expected` is listed with a non-zero quality.
+    """
+    if not accept:
+        return False
+    for entry in accept.split(","):
+        media_type, *params = (part.strip() for part in entry.split(";"))
+        if media_type.lower() != expected:
+            continue
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
@@ -9,4 +9,11 @@ export { getApiBaseUrl };
 
 export const health = api.health!;
 export const matrixApply = api.matrixApply!;
+export const matrixApplyBatch = api.matrixApplyBatch!;
 export const eigen = api.eigen!;
+export const eigenBatch = api.eigenBatch!;
+export const eigenSparse = api.eigenSparse!;
+export const factorize = api.factorize!;
+export const factorSolve = api.factorSolve!;
+export const factorProject = api.factorProject!;
+export const matrixSession = api.matrixSession!;
@@ -1,5 +1,6 @@
 import { createApi, getApiBaseUrl } from "@shared/lib/api";
-import { buildError, fail, type Result } from "@shared/lib/result";
+import { readNdjson } from "@shared/lib/ndjson";
+import { buildError, fail, ok, type Result } from "@shared/lib/result";
 import {
   assert,
   isByteVec,
@@ -8,11 +9,15 @@ import {
   type DatasetId,
   type DatasetModality,
   type DatasetOptionApi,
+  type DatasetSampleApi,
+  type DatasetSampleStream,
+  type DatasetStreamHeader,
   type DatasetsResponse,
   type DatasetImageSampleApi,
   type DatasetSplit,
   type DatasetSamplesResponse,
   type DatasetTextSampleApi,
+  type DatasetVocabResponse,
   type WordCountApi,
 } from "./types";
 
@@ -92,6 +97,32 @@ function validateTextSample(data: any, vectorLength: number): DatasetTextSampleA
 }
 
 function validateDatasetSamples(data: any): DatasetSamplesResponse {
+  validateSampleMetadata(data);
+  assert(Array.isArray(data.samples), "Invalid dataset samples array");
+
+  if (data.modality === "image") {
+    const pixelCount = data.imageWidth * data.imageHeight;
+    data.samples.forEach((sample: any) => validateImageSample(sample, pixelCount));
+  } else {
+    // The vocab is omitted when requested with includeVocab=false.
+    if (data.vocab !== undefined) {
+      validateVocab(data.vocab, data.vectorLength);
+    }
+    data.samples.forEach((sample: any) => validateTextSample(sample, data.vectorLength));
+  }
+  return data as DatasetSamplesResponse;
+}
+
+function validateStreamHeader(data: any): DatasetStreamHeader {
+  validateSampleMetadata(data);
+  assert(isNonNegativeInt(data.seed), "Invalid stream header seed");
+  assert(isNonNegativeInt(data.offset), "Invalid stream header offset");
+  assert(isNonNegativeInt(data.count), "Invalid stream header count");
+  assert(data.nextCursor === null || isString(data.nextCursor), "Invalid stream header nextCursor");
+  return data as DatasetStreamHeader;
+}
+
+function validateSampleMetadata(data: any): void {
   assert(data && typeof data === "object", "Invalid dataset response");
   assert(isDatasetId(data.source), "Invalid dataset response source");
   assert(isString(data.displayName), "Invalid dataset response display name");
@@ -121,18 +152,25 @@ function validateDatasetSamples(data: any): DatasetSamplesResponse {
       data.totalCount > 0,
     "Invalid dataset total count"
   );
-  assert(Array.isArray(data.samples), "Invalid dataset samples array");
+  if (data.modality === "text") {
+    assert(isString(data.vocabVersion), "Invalid dataset vocabVersion");
+  }
+}
 
-  if (data.modality === "image") {
-    const pixelCount = data.imageWidth * data.imageHeight;
-    data.samples.forEach((sample: any) => validateImageSample(sample, pixelCount));
-  } else {
-    assert(Array.isArray(data.vocab), "Invalid dataset vocab");
-    data.vocab.forEach((entry: any) => assert(isString(entry), "Invalid dataset vocab entry"));
-    assert(data.vocab.length === data.vectorLength, "Invalid dataset vocab length");
-    data.samples.forEach((sample: any) => validateTextSample(sample, data.vectorLength));
+function validateVocab(vocab: any, vectorLength?: number): void {
+  assert(Array.isArray(vocab), "Invalid dataset vocab");
+  vocab.forEach((entry: any) => assert(isString(entry), "Invalid dataset vocab entry"));
+  if (vectorLength !== undefined) {
+    assert(vocab.length === vectorLength, "Invalid dataset vocab length");
   }
-  return data as DatasetSamplesResponse;
+}
+
+function validateDatasetVocab(data: any): DatasetVocabResponse {
+  assert(data && typeof data === "object", "Invalid vocab response");
+  assert(isDatasetId(data.source), "Invalid vocab response source");
+  assert(isString(data.vocabVersion), "Invalid vocab response vocabVersion");
+  validateVocab(data.vocab);
+  return data as DatasetVocabResponse;
 }
 
 /**
@@ -151,13 +189,15 @@ export async function listDatasets(): Promise<Result<DatasetsResponse>> {
  * @param count - Number of samples to request.
  * @param seed - Optional RNG seed for reproducible sampling.
  * @param split - Optional split selector ("train"|"test"|"all").
+ * @param includeVocab - Set false to receive only `vocabVersion` for text datasets.
  * @returns Result containing samples with metadata or an error.
  */
 export async function datasetSamples(
   dataset: DatasetId,
   count: number,
   seed?: number,
-  split?: "train" | "test" | "all"
+  split?: "train" | "test" | "all",
+  includeVocab = true
 ): Promise<Result<DatasetSamplesResponse>> {
   if (!isNonNegativeInt(count) || count <= 0) {
     return fail(buildError("count must be a positive integer", 0));
@@ -174,6 +214,9 @@ export async function datasetSamples(
     }
     params.set("seed", String(seed));
   }
+  if (!includeVocab) {
+    params.set("includeVocab", "false");
+  }
 
   return api.requestJson(
     `/api/v1/datasets/samples?${params.toString()}`,
@@ -181,3 +224,94 @@ export async function datasetSamples(
     validateDatasetSamples
   );
 }
+
+/**
+ * Fetch a text dataset vocabulary pinned to a content-hash version.
+ *
+ * Version-pinned responses are served as immutable, so the browser cache
+ * answers repeat requests without contacting the backend.
+ *
+ * @param dataset - Text dataset id.
+ * @param version - `vocabVersion` reported by the samples endpoint.
+ * @returns Result containing the vocabulary or an error.
+ */
+export async function datasetVocab(
+  dataset: DatasetId,
+  version: string
+): Promise<Result<DatasetVocabResponse>> {
+  const params = new URLSearchParams({ dataset, version });
+  return api.requestJson(
+    `/api/v1/datasets/vocab?${params.toString()}`,
+    { method: "GET" },
+    validateDatasetVocab
+  );
+}
+
+/**
+ * Stream one page of a seeded permutation of a dataset split (NDJSON).
+ *
+ * Samples are parsed and validated as they arrive, so large pages never need
+ * to be held in memory at once. Continue with `header.nextCursor`.
+ *
+ * @param dataset - Dataset id to stream from.
+ * @param options - `cursor` from a previous page, or `seed` for the first page;
+ *   `limit` rows per page (backend max 10000) and optional `split`.
+ * @returns Result containing the page header and an async sample iterator, or an error.
+ */
+export async function streamDatasetSamples(
+  dataset: DatasetId,
+  options: { cursor?: string; seed?: number; limit?: number; split?: DatasetSplit } = {}
+): Promise<Result<DatasetSampleStream>> {
+  const params = new URLSearchParams({ dataset });
+  if (options.cursor !== undefined) {
+    params.set("cursor", options.cursor);
+  } else if (options.seed !== undefined) {
+    if (!isNonNegativeInt(options.seed)) {
+      return fail(buildError("seed must be a non-negative integer", 0));
+    }
+    params.set("seed", String(options.seed));
+  }
+  if (options.limit !== undefined) {
+    if (!isNonNegativeInt(options.limit) || options.limit <= 0) {
+      return fail(buildError("limit must be a positive integer", 0));
+    }
+    params.set("limit", String(options.limit));
+  }
+  if (options.split !== undefined) {
+    params.set("split", options.split);
+  }
+
+  const url = `${api.baseUrl}/api/v1/datasets/samples/stream?${params.toString()}`;
+  let res: Response;
+  try {
+    res = await fetch(url, { method: "GET" });
+  } catch (error) {
+    const message = error instanceof Error ? error.message : String(error);
+    return fail(buildError(`Network error for ${url}: ${message}`, 0));
+  }
+  if (!res.ok || !res.body) {
+    return fail(buildError(`HTTP ${res.status} for ${url}`, res.status, await res.text()));
+  }
+
+  const records = readNdjson<any>(res.body);
+  let header: DatasetStreamHeader;
+  try {
+    const first = await records.next();
+    assert(!first.done, "Empty stream response");
+    header = validateStreamHeader(first.value);
+  } catch (error) {
+    const message = error instanceof Error ? error.message : String(error);
+    return fail(buildError(`Invalid response from ${url}: ${message}`, res.status));
+  }
+
+  async function* samples(): AsyncGenerator<DatasetSampleApi> {
+    const pixelCount = header.imageWidth * header.imageHeight;
+    for await (const record of records) {
+      yield header.modality === "image"
+        ? validateImageSample(record, pixelCount)
+        : validateTextSample(record, header.vectorLength);
+    }
+  }
+
+  return ok({ header, samples: samples() });
+}
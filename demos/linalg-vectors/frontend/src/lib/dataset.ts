@@ -1,5 +1,5 @@
-import { datasetSamples } from "./api";
-import { ok, type Result } from "@shared/lib/result";
+import { datasetSamples, datasetVocab } from "./api";
+import { buildError, fail, ok, type Result } from "@shared/lib/result";
 import {
   type DatasetId,
   type DatasetImageSampleApi,
@@ -56,6 +56,9 @@ export type DatasetSampleSet = {
 
 export const DATASET_SAMPLES_ENDPOINT = "/api/v1/datasets/samples";
 
+// Vocabularies keyed by `${dataset}:${vocabVersion}`; fetched once per version.
+const vocabCache = new Map<string, string[]>();
+
 /**
  * Load dataset samples from the backend API.
  *
@@ -69,11 +72,23 @@ export async function loadDatasetSamples(
   count: number,
   seed?: number
 ): Promise<Result<DatasetSampleSet>> {
-  const response = await datasetSamples(dataset, count, seed);
+  const response = await datasetSamples(dataset, count, seed, undefined, false);
   if (!response.ok) {
     return response;
   }
 
+  let vocab = response.value.vocab;
+  if (response.value.modality === "text" && vocab === undefined) {
+    const resolved = await resolveVocab(response.value.source, response.value.vocabVersion);
+    if (!resolved.ok) {
+      return resolved;
+    }
+    if (resolved.value.length !== response.value.vectorLength) {
+      return fail(buildError("Vocab length does not match dataset vector length", 0));
+    }
+    vocab = resolved.value;
+  }
+
   const meta: DatasetMeta = {
     source: response.value.source,
     displayName: response.value.displayName,
@@ -83,7 +98,7 @@ export async function loadDatasetSamples(
     imageHeight: response.value.imageHeight,
     vectorLength: response.value.vectorLength,
     totalCount: response.value.totalCount,
-    vocab: response.value.vocab ?? undefined,
+    vocab: vocab ?? undefined,
   };
   const samples = response.value.samples.map((sample) =>
     normalizeSample(sample, response.value.modality)
@@ -91,6 +106,26 @@ export async function loadDatasetSamples(
   return ok({ meta, samples });
 }
 
+async function resolveVocab(
+  dataset: DatasetId,
+  version: string | undefined
+): Promise<Result<string[]>> {
+  if (version === undefined) {
+    return fail(buildError("Text dataset response is missing vocabVersion", 0));
+  }
+  const key = `${dataset}:${version}`;
+  const cached = vocabCache.get(key);
+  if (cached) {
+    return ok(cached);
+  }
+  const response = await datasetVocab(dataset, version);
+  if (!response.ok) {
+    return response;
+  }
+  vocabCache.set(key, response.value.vocab);
+  return ok(response.value.vocab);
+}
+
 /**
  * Convert a sample into ImageData for canvas drawing.
  *
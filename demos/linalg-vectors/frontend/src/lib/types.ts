@@ -69,5 +69,25 @@ export interface DatasetSamplesResponse {
   vectorLength: number;
   totalCount: number;
   vocab?: string[];
+  vocabVersion?: string;
   samples: DatasetSampleApi[];
 }
+
+// Header line of a `/datasets/samples/stream` page.
+export interface DatasetStreamHeader extends Omit<DatasetSamplesResponse, "samples" | "vocab"> {
+  seed: number;
+  offset: number;
+  count: number;
+  nextCursor: string | null;
+}
+
+export interface DatasetSampleStream {
+  header: DatasetStreamHeader;
+  samples: AsyncGenerator<DatasetSampleApi>;
+}
+
+export interface DatasetVocabResponse {
+  source: DatasetId;
+  vocabVersion: string;
+  vocab: string[];
+}
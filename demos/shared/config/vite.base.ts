@@ -26,6 +26,8 @@ export function createDemoViteConfig(demoImportMetaUrl: string): UserConfig {
         "/api": {
           target: "http://localhost:8000",
           changeOrigin: true,
+          // Forward WebSocket upgrades too (/api/v1/matrix/session).
+          ws: true,
         },
         "/health": {
           target: "http://localhost:8000",
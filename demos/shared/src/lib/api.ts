@@ -1,14 +1,28 @@
 import {
   assert,
   isMat,
+  isNonNegativeInt,
+  isSparseMatrix,
   isVec,
+  type EigenBatchRequest,
+  type EigenBatchResponse,
   type EigenRequest,
   type EigenResponse,
+  type FactorizeRequest,
+  type FactorizeResponse,
+  type FactorSolveRequest,
+  type FactorSolveResponse,
   type HealthResponse,
+  type MatrixApplyBatchRequest,
+  type MatrixApplyBatchResponse,
   type MatrixApplyRequest,
   type MatrixApplyResponse,
+  type SparseEigenRequest,
+  type SparseEigenResponse,
 } from "./types";
 import { buildError, fail, ok, type Result } from "./result";
+import { decodeFrame, FRAME_MEDIA_TYPE, type DecodedFrame } from "./frame";
+import { openMatrixSession, type MatrixSession, type MatrixSessionHandlers } from "./matrixSession";
 
 export type ApiClient = {
   baseUrl: string;
@@ -17,20 +31,40 @@ export type ApiClient = {
     init: RequestInit,
     validate?: (data: any) => T
   ) => Promise<Result<T>>;
+  requestFrame: <T = DecodedFrame>(
+    path: string,
+    init: RequestInit,
+    validate?: (frame: DecodedFrame) => T
+  ) => Promise<Result<T>>;
 };
 
 export type ApiFeatures = {
   health?: boolean;
   matrixApply?: boolean;
+  matrixApplyBatch?: boolean;
   eigen?: boolean;
+  eigenBatch?: boolean;
+  eigenSparse?: boolean;
+  factorization?: boolean;
+  matrixSession?: boolean;
 };
 
 export type ApiService = ApiClient & {
   health?: () => Promise<Result<HealthResponse>>;
   matrixApply?: (req: MatrixApplyRequest) => Promise<Result<MatrixApplyResponse>>;
+  matrixApplyBatch?: (req: MatrixApplyBatchRequest) => Promise<Result<MatrixApplyBatchResponse>>;
   eigen?: (req: EigenRequest) => Promise<Result<EigenResponse>>;
+  eigenBatch?: (req: EigenBatchRequest) => Promise<Result<EigenBatchResponse>>;
+  eigenSparse?: (req: SparseEigenRequest) => Promise<Result<SparseEigenResponse>>;
+  factorize?: (req: FactorizeRequest) => Promise<Result<FactorizeResponse>>;
+  factorSolve?: (req: FactorSolveRequest) => Promise<Result<FactorSolveResponse>>;
+  factorProject?: (req: FactorSolveRequest) => Promise<Result<FactorSolveResponse>>;
+  matrixSession?: (handlers: MatrixSessionHandlers) => MatrixSession;
 };
 
+// Keep in sync with MAX_MATRIX_BATCH in backend/main.py.
+export const MAX_MATRIX_BATCH = 1024;
+
 function normalizeBaseUrl(url: string) {
   return url.replace(/\/+$/, "");
 }
@@ -99,11 +133,71 @@ function createRequestJson(baseUrl: string) {
   };
 }
 
+function createRequestFrame(baseUrl: string) {
+  /**
+   * Request a binary frame via `Accept` negotiation and decode it.
+   *
+   * Fails (without throwing) when the server answers with another content type,
+   * e.g. the JSON fallback for datasets that have no binary representation.
+   */
+  return async function requestFrame<T = DecodedFrame>(
+    path: string,
+    init: RequestInit,
+    validate?: (frame: DecodedFrame) => T
+  ): Promise<Result<T>> {
+    const url = `${baseUrl}${path.startsWith("/") ? "" : "/"}${path}`;
+
+    let res: Response;
+    try {
+      res = await fetch(url, {
+        ...init,
+        headers: {
+          Accept: FRAME_MEDIA_TYPE,
+          ...(init.headers || {}),
+        },
+      });
+    } catch (error) {
+      const message = error instanceof Error ? error.message : String(error);
+      return fail(buildError(`Network error for ${url}: ${message}`, 0));
+    }
+
+    if (!res.ok) {
+      return fail(buildError(`HTTP ${res.status} for ${url}`, res.status, await res.text()));
+    }
+    const contentType = res.headers.get("Content-Type") ?? "";
+    if (!contentType.startsWith(FRAME_MEDIA_TYPE)) {
+      return fail(
+        buildError(`Expected ${FRAME_MEDIA_TYPE} from ${url}, got '${contentType}'`, res.status)
+      );
+    }
+
+    let frame: DecodedFrame;
+    try {
+      frame = decodeFrame(await res.arrayBuffer());
+    } catch (error) {
+      const message = error instanceof Error ? error.message : String(error);
+      return fail(buildError(`Invalid frame from ${url}: ${message}`, res.status));
+    }
+
+    if (!validate) {
+      return ok(frame as T);
+    }
+
+    try {
+      return ok(validate(frame));
+    } catch (error) {
+      const message = error instanceof Error ? error.message : String(error);
+      return fail(buildError(`Invalid response from ${url}: ${message}`, res.status));
+    }
+  };
+}
+
 export function createApiClient(baseUrl?: string): ApiClient {
   const resolvedBase = normalizeBaseUrl(baseUrl ?? getApiBaseUrl());
   return {
     baseUrl: resolvedBase,
     requestJson: createRequestJson(resolvedBase),
+    requestFrame: createRequestFrame(resolvedBase),
   };
 }
 
@@ -117,6 +211,11 @@ function validateMatrixApply(data: any): MatrixApplyResponse {
   return data as MatrixApplyResponse;
 }
 
+function validateMatrixApplyBatch(data: any): MatrixApplyBatchResponse {
+  assert(data && isMat(data.results), "Invalid matrix/apply/batch response");
+  return data as MatrixApplyBatchResponse;
+}
+
 function validateEigen(data: any): EigenResponse {
   assert(data && Array.isArray(data.eigenvalues), "Invalid eig response: eigenvalues");
   assert(
@@ -124,9 +223,32 @@ function validateEigen(data: any): EigenResponse {
     "Invalid eig response: eigenvalues entries"
   );
   assert(isMat(data.eigenvectors), "Invalid eig response: eigenvectors matrix");
+  assert(typeof data.path === "string", "Invalid eig response: path");
   return data as EigenResponse;
 }
 
+function validateEigenBatch(data: any): EigenBatchResponse {
+  assert(data && isMat(data.eigenvalues), "Invalid eig/batch response: eigenvalues");
+  assert(
+    Array.isArray(data.eigenvectors) && data.eigenvectors.every(isMat),
+    "Invalid eig/batch response: eigenvectors"
+  );
+  assert(typeof data.path === "string", "Invalid eig/batch response: path");
+  return data as EigenBatchResponse;
+}
+
+function validateFactorize(data: any): FactorizeResponse {
+  assert(data && typeof data.handle === "string", "Invalid matrix/factorize response: handle");
+  assert(isVec(data.shape) && data.shape.length === 2, "Invalid matrix/factorize response: shape");
+  assert(isNonNegativeInt(data.rank), "Invalid matrix/factorize response: rank");
+  return data as FactorizeResponse;
+}
+
+function validateFactorSolve(data: any): FactorSolveResponse {
+  assert(data && (isVec(data.result) || isMat(data.results)), "Invalid factorization response");
+  return data as FactorSolveResponse;
+}
+
 /**
  * Create a typed API service. Feature flags allow demos to opt out of unused endpoints.
  */
@@ -139,7 +261,12 @@ export function createApi(options: {
   const features: Required<ApiFeatures> = {
     health: true,
     matrixApply: true,
+    matrixApplyBatch: true,
     eigen: true,
+    eigenBatch: true,
+    eigenSparse: true,
+    factorization: true,
+    matrixSession: true,
     ...options.features,
   };
 
@@ -150,8 +277,10 @@ export function createApi(options: {
   }
   if (features.matrixApply) {
     api.matrixApply = (req: MatrixApplyRequest) => {
-      if (!isMat(req.matrix)) {
-        return Promise.resolve(fail(buildError("matrix must be number[][]", 0)));
+      if (!isMat(req.matrix) && !isSparseMatrix(req.matrix)) {
+        return Promise.resolve(
+          fail(buildError("matrix must be number[][] or a coo/csr sparse matrix", 0))
+        );
       }
       if (!isVec(req.vector)) {
         return Promise.resolve(fail(buildError("vector must be number[]", 0)));
@@ -163,6 +292,30 @@ export function createApi(options: {
       );
     };
   }
+  if (features.matrixApplyBatch) {
+    api.matrixApplyBatch = (req: MatrixApplyBatchRequest) => {
+      if ("matrices" in req) {
+        if (!Array.isArray(req.matrices) || !req.matrices.every(isMat)) {
+          return Promise.resolve(fail(buildError("matrices must be number[][][]", 0)));
+        }
+      } else if (!isMat(req.matrix)) {
+        return Promise.resolve(fail(buildError("matrix must be number[][]", 0)));
+      }
+      if (!isMat(req.vectors)) {
+        return Promise.resolve(fail(buildError("vectors must be number[][]", 0)));
+      }
+      if (req.vectors.length > MAX_MATRIX_BATCH) {
+        return Promise.resolve(
+          fail(buildError(`vectors must contain at most ${MAX_MATRIX_BATCH} entries`, 0))
+        );
+      }
+      return client.requestJson(
+        "/api/v1/matrix/apply/batch",
+        { method: "POST", body: JSON.stringify(req) },
+        validateMatrixApplyBatch
+      );
+    };
+  }
   if (features.eigen) {
     api.eigen = (req: EigenRequest) => {
       if (!isMat(req.matrix)) {
@@ -175,6 +328,74 @@ export function createApi(options: {
       );
     };
   }
+  if (features.eigenBatch) {
+    api.eigenBatch = (req: EigenBatchRequest) => {
+      if (!Array.isArray(req.matrices) || !req.matrices.every(isMat)) {
+        return Promise.resolve(fail(buildError("matrices must be number[][][]", 0)));
+      }
+      if (req.matrices.length > MAX_MATRIX_BATCH) {
+        return Promise.resolve(
+          fail(buildError(`matrices must contain at most ${MAX_MATRIX_BATCH} entries`, 0))
+        );
+      }
+      return client.requestJson(
+        "/api/v1/matrix/eig/batch",
+        { method: "POST", body: JSON.stringify(req) },
+        validateEigenBatch
+      );
+    };
+  }
+
+  if (features.eigenSparse) {
+    api.eigenSparse = (req: SparseEigenRequest) => {
+      if (!isSparseMatrix(req.matrix)) {
+        return Promise.resolve(fail(buildError("matrix must be a coo/csr sparse matrix", 0)));
+      }
+      return client.requestJson(
+        "/api/v1/matrix/eig/sparse",
+        { method: "POST", body: JSON.stringify(req) },
+        validateEigen
+      );
+    };
+  }
+  if (features.factorization) {
+    api.factorize = (req: FactorizeRequest) => {
+      if (!isMat(req.matrix)) {
+        return Promise.resolve(fail(buildError("matrix must be number[][]", 0)));
+      }
+      return client.requestJson(
+        "/api/v1/matrix/factorize",
+        { method: "POST", body: JSON.stringify(req) },
+        validateFactorize
+      );
+    };
+    const factorRequest = (path: string) => (req: FactorSolveRequest) => {
+      if ("vectors" in req) {
+        if (!isMat(req.vectors)) {
+          return Promise.resolve(fail(buildError("vectors must be number[][]", 0)));
+        }
+        if (req.vectors.length > MAX_MATRIX_BATCH) {
+          return Promise.resolve(
+            fail(buildError(`vectors must contain at most ${MAX_MATRIX_BATCH} entries`, 0))
+          );
+        }
+      } else if (!isVec(req.vector)) {
+        return Promise.resolve(fail(buildError("vector must be number[]", 0)));
+      }
+      return client.requestJson<FactorSolveResponse>(
+        path,
+        { method: "POST", body: JSON.stringify(req) },
+        validateFactorSolve
+      );
+    };
+    api.factorSolve = factorRequest("/api/v1/matrix/solve");
+    api.factorProject = factorRequest("/api/v1/matrix/project");
+  }
+
+  if (features.matrixSession) {
+    api.matrixSession = (handlers: MatrixSessionHandlers) =>
+      openMatrixSession(client.baseUrl, handlers);
+  }
 
   return api;
 }
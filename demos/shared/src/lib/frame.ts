@@ -0,0 +1,170 @@
+/**
+ * Decoder for the backend's binary array frames (`application/vnd.linalg.frame`).
+ *
+ * Layout: 4-byte magic `LAF1`, little-endian uint32 header length, UTF-8 JSON
+ * header (padded so the data section is 8-byte aligned), then array blocks.
+ * Header `blocks` entries give each array's dtype, shape and offset relative to
+ * the data section, so blocks are exposed as typed-array views without copying.
+ *
+ * A frame stream (`application/vnd.linalg.frame-stream`) is frames back to back;
+ * each frame ends at its last block's end, rounded up to 8 bytes.
+ */
+
+export const FRAME_MEDIA_TYPE = "application/vnd.linalg.frame";
+export const FRAME_STREAM_MEDIA_TYPE = "application/vnd.linalg.frame-stream";
+
+const FRAME_MAGIC = "LAF1";
+const FRAME_PREFIX_BYTES = 8;
+const FRAME_ALIGNMENT = 8;
+
+export type FrameArray =
+  | Uint8Array
+  | Int8Array
+  | Uint16Array
+  | Int16Array
+  | Uint32Array
+  | Int32Array
+  | Float32Array
+  | Float64Array
+  | BigInt64Array
+  | BigUint64Array;
+
+export type FrameBlock = {
+  name: string;
+  dtype: string;
+  shape: number[];
+  data: FrameArray;
+};
+
+export type DecodedFrame = {
+  header: Record<string, any>;
+  blocks: Record<string, FrameBlock>;
+};
+
+// Typed arrays use platform byte order; every browser target is little-endian.
+const TYPED_ARRAYS: Record<
+  string,
+  new (buffer: ArrayBuffer, byteOffset: number, length: number) => FrameArray
+> = {
+  uint8: Uint8Array,
+  int8: Int8Array,
+  uint16: Uint16Array,
+  int16: Int16Array,
+  uint32: Uint32Array,
+  int32: Int32Array,
+  float32: Float32Array,
+  float64: Float64Array,
+  int64: BigInt64Array,
+  uint64: BigUint64Array,
+};
+
+/**
+ * Decode a binary frame into its JSON header and typed-array blocks.
+ *
+ * @param buffer - Complete frame bytes.
+ * @returns Header metadata and blocks keyed by name (views into `buffer`).
+ * @throws Error when the magic, header, or block bounds are invalid.
+ */
+export function decodeFrame(buffer: ArrayBuffer): DecodedFrame {
+  if (buffer.byteLength < FRAME_PREFIX_BYTES) {
+    throw new Error("frame is too short");
+  }
+  const magic = new TextDecoder().decode(new Uint8Array(buffer, 0, 4));
+  if (magic !== FRAME_MAGIC) {
+    throw new Error(`unexpected frame magic '${magic}'`);
+  }
+  const headerLength = new DataView(buffer).getUint32(4, true);
+  const dataStart = FRAME_PREFIX_BYTES + headerLength;
+  if (dataStart > buffer.byteLength) {
+    throw new Error("frame header exceeds payload");
+  }
+
+  const header = JSON.parse(
+    new TextDecoder().decode(new Uint8Array(buffer, FRAME_PREFIX_BYTES, headerLength))
+  );
+  if (!header || !Array.isArray(header.blocks)) {
+    throw new Error("frame header is missing blocks");
+  }
+
+  const blocks: Record<string, FrameBlock> = {};
+  for (const descriptor of header.blocks) {
+    const ArrayType = TYPED_ARRAYS[descriptor.dtype];
+    if (!ArrayType) {
+      throw new Error(`unsupported frame dtype '${descriptor.dtype}'`);
+    }
+    const byteOffset = dataStart + descriptor.offset;
+    if (byteOffset + descriptor.byteLength > buffer.byteLength) {
+      throw new Error(`frame block '${descriptor.name}' exceeds payload`);
+    }
+    const bytesPerElement = (ArrayType as unknown as { BYTES_PER_ELEMENT: number }).BYTES_PER_ELEMENT;
+    blocks[descriptor.name] = {
+      name: descriptor.name,
+      dtype: descriptor.dtype,
+      shape: descriptor.shape,
+      data: new ArrayType(buffer, byteOffset, descriptor.byteLength / bytesPerElement),
+    };
+  }
+  return { header, blocks };
+}
+
+/**
+ * Decode frames from a frame-stream body as they arrive.
+ *
+ * Each yielded frame owns a copy of its bytes, so earlier chunks can be released.
+ *
+ * @param body - Response body stream (`application/vnd.linalg.frame-stream`).
+ * @returns Async iterator of decoded frames in stream order.
+ * @throws Error when the stream ends mid-frame or a frame is invalid.
+ */
+export async function* readFrameStream(
+  body: ReadableStream<Uint8Array>
+): AsyncGenerator<DecodedFrame> {
+  const reader = body.getReader();
+  let pending = new Uint8Array(0);
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (value) {
+      const merged = new Uint8Array(pending.length + value.length);
+      merged.set(pending);
+      merged.set(value, pending.length);
+      pending = merged;
+    }
+
+    let length = frameByteLength(pending);
+    while (length !== null && length <= pending.length) {
+      yield decodeFrame(pending.slice(0, length).buffer);
+      pending = pending.slice(length);
+      length = frameByteLength(pending);
+    }
+
+    if (done) {
+      if (pending.length) {
+        throw new Error("frame stream ended mid-frame");
+      }
+      return;
+    }
+  }
+}
+
+/**
+ * Total byte length of the frame at the start of `bytes`, or null if its header is incomplete.
+ */
+function frameByteLength(bytes: Uint8Array): number | null {
+  if (bytes.length < FRAME_PREFIX_BYTES) {
+    return null;
+  }
+  const headerLength = new DataView(bytes.buffer, bytes.byteOffset, 8).getUint32(4, true);
+  const dataStart = FRAME_PREFIX_BYTES + headerLength;
+  if (bytes.length < dataStart) {
+    return null;
+  }
+  const header = JSON.parse(
+    new TextDecoder().decode(bytes.subarray(FRAME_PREFIX_BYTES, dataStart))
+  );
+  let dataLength = 0;
+  for (const descriptor of header.blocks ?? []) {
+    dataLength = Math.max(dataLength, descriptor.offset + descriptor.byteLength);
+  }
+  dataLength += (FRAME_ALIGNMENT - (dataLength % FRAME_ALIGNMENT)) % FRAME_ALIGNMENT;
+  return dataStart + dataLength;
+}
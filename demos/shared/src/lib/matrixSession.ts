@@ -0,0 +1,106 @@
+/**
+ * Client for the `/api/v1/matrix/session` WebSocket used by interactive matrix demos.
+ */
+
+import {
+  assert,
+  isMat,
+  isVec,
+  type MatrixSessionError,
+  type MatrixSessionResult,
+  type MatrixSessionUpdate,
+} from "./types";
+
+export const MATRIX_SESSION_PATH = "/api/v1/matrix/session";
+
+export type MatrixSessionHandlers = {
+  onResult: (result: MatrixSessionResult) => void;
+  onError?: (error: MatrixSessionError) => void;
+  onClose?: (event: CloseEvent) => void;
+};
+
+export type MatrixSession = {
+  /**
+   * Send an update (send on every input event; the server computes only the newest
+   * state). Returns its sequence number, echoed as `seq` in results and errors.
+   */
+  update: (update: MatrixSessionUpdate) => number;
+  close: () => void;
+};
+
+/**
+ * Resolve the WebSocket URL for an API base URL ("" means same origin).
+ */
+export function matrixSessionUrl(baseUrl: string): string {
+  if (!baseUrl) {
+    const scheme = window.location.protocol === "https:" ? "wss:" : "ws:";
+    return `${scheme}//${window.location.host}${MATRIX_SESSION_PATH}`;
+  }
+  return `${baseUrl.replace(/^http/, "ws")}${MATRIX_SESSION_PATH}`;
+}
+
+function validateSessionResult(data: any): MatrixSessionResult {
+  assert(typeof data.coalesced === "number", "Invalid session result: coalesced");
+  assert(data.apply === undefined || isVec(data.apply), "Invalid session result: apply");
+  assert(
+    data.eig === undefined ||
+      (isMat(data.eig.eigenvectors) && isVec(data.eig.eigenvalues)),
+    "Invalid session result: eig"
+  );
+  return data as MatrixSessionResult;
+}
+
+/**
+ * Open a matrix session.
+ *
+ * Updates made before the socket opens are merged and sent as one message once
+ * it does. Malformed server messages are reported through `onError` with status 0.
+ */
+export function openMatrixSession(
+  baseUrl: string,
+  handlers: MatrixSessionHandlers
+): MatrixSession {
+  const socket = new WebSocket(matrixSessionUrl(baseUrl));
+  let seq = 0;
+  let queued: (MatrixSessionUpdate & { seq: number }) | null = null;
+
+  socket.addEventListener("open", () => {
+    if (queued) {
+      socket.send(JSON.stringify(queued));
+      queued = null;
+    }
+  });
+  socket.addEventListener("message", (event) => {
+    let data: any;
+    try {
+      data = JSON.parse(String(event.data));
+      if (data?.type === "error") {
+        handlers.onError?.(data as MatrixSessionError);
+        return;
+      }
+      assert(data?.type === "result", "Unknown session message type");
+      handlers.onResult(validateSessionResult(data));
+    } catch (error) {
+      const detail = error instanceof Error ? error.message : String(error);
+      handlers.onError?.({ seq: data?.seq ?? null, status: 0, detail });
+    }
+  });
+  if (handlers.onClose) {
+    socket.addEventListener("close", handlers.onClose);
+  }
+
+  return {
+    update(update: MatrixSessionUpdate) {
+      seq += 1;
+      if (socket.readyState === WebSocket.CONNECTING) {
+        queued = { ...queued, ...update, seq };
+      } else if (socket.readyState === WebSocket.OPEN) {
+        socket.send(JSON.stringify({ ...update, seq }));
+      }
+      return seq;
+    },
+    close() {
+      socket.close();
+    },
+  };
+}
@@ -0,0 +1,36 @@
+/**
+ * Incremental reader for newline-delimited JSON (`application/x-ndjson`) bodies.
+ */
+
+export const NDJSON_MEDIA_TYPE = "application/x-ndjson";
+
+/**
+ * Parse NDJSON records from a response body as they arrive.
+ *
+ * @param body - Response body stream.
+ * @returns Async iterator of parsed records (blank lines are skipped).
+ * @throws Error when a line is not valid JSON.
+ */
+export async function* readNdjson<T = unknown>(
+  body: ReadableStream<Uint8Array>
+): AsyncGenerator<T> {
+  const reader = body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = "";
+  for (;;) {
+    const { done, value } = await reader.read();
+    buffered += decoder.decode(value, { stream: !done });
+
+    const lines = buffered.split("\n");
+    buffered = done ? "" : lines.pop() ?? "";
+    for (const line of lines) {
+      if (line.trim()) {
+        yield JSON.parse(line) as T;
+      }
+    }
+
+    if (done) {
+      return;
+    }
+  }
+}
@@ -3,13 +3,88 @@ export type Mat = number[][];
 
 export interface HealthResponse { status: string; }
 
-export interface MatrixApplyRequest { matrix: Mat; vector: Vec; }
+// Sparse matrices use scipy's array names (backend/sparse_matrices.py); COO duplicates are summed.
+export type SparseMatrix =
+  | { format: "coo"; shape: [number, number]; row: number[]; col: number[]; data: Vec }
+  | { format: "csr"; shape: [number, number]; indptr: number[]; indices: number[]; data: Vec };
+
+export interface MatrixApplyRequest { matrix: Mat | SparseMatrix; vector: Vec; }
 export interface MatrixApplyResponse { result: Vec; }
 
+// One matrix for every vector, or one matrix per vector (same shapes).
+export type MatrixApplyBatchRequest =
+  | { matrix: Mat; vectors: Vec[] }
+  | { matrices: Mat[]; vectors: Vec[] };
+export interface MatrixApplyBatchResponse { results: Vec[]; }
+
+// Solver the backend dispatched to (see backend/matrices.py).
+export type EigenPath = "diagonal" | "closed-form" | "symmetric" | "triangular" | "general";
+
 export interface EigenRequest { matrix: Mat; }
 export interface EigenResponse {
   eigenvalues: number[];
   eigenvectors: Mat; // columns are eigenvectors
+  path: EigenPath;
+}
+
+// `which`: LM = largest magnitude (default), LA = largest, SA = smallest eigenvalues.
+export interface SparseEigenRequest {
+  matrix: SparseMatrix;
+  k?: number; // 1..32, default 6
+  which?: "LM" | "LA" | "SA";
+}
+// `path` is "lanczos" (symmetric) or "arnoldi", or a dense path for small matrices.
+export interface SparseEigenResponse {
+  eigenvalues: number[];
+  eigenvectors: Mat; // columns are eigenvectors
+  path: "lanczos" | "arnoldi" | EigenPath;
+}
+
+export interface EigenBatchRequest { matrices: Mat[]; }
+export interface EigenBatchResponse {
+  eigenvalues: Mat; // row i belongs to matrices[i]
+  eigenvectors: Mat[];
+  path: EigenPath;
+}
+
+// Factorize once, then solve/project many vectors against the returned handle.
+// Handles expire `expiresInSeconds` after their last use (HTTP 404 afterwards).
+export type FactorizationKind = "lu" | "qr" | "svd";
+export interface FactorizeRequest {
+  matrix: Mat;
+  kind: FactorizationKind;
+  includeFactors?: boolean; // default true
+}
+export interface FactorizeResponse {
+  handle: string;
+  kind: FactorizationKind;
+  shape: [number, number];
+  rank: number;
+  expiresInSeconds: number;
+  // lu: l, u, permutation (A[permutation] = L U); qr: q, r; svd: u, s, vt.
+  factors?: Record<string, Mat | Vec>;
+}
+// Vectors have the factorized matrix's row count.
+export type FactorSolveRequest =
+  | { handle: string; vector: Vec }
+  | { handle: string; vectors: Vec[] };
+export type FactorSolveResponse = MatrixApplyResponse | MatrixApplyBatchResponse;
+
+// Messages of the /api/v1/matrix/session WebSocket. Updates replace the session's
+// matrix/vector/ops; results cover the newest state (`coalesced` updates).
+export type MatrixSessionOp = "apply" | "eig";
+export interface MatrixSessionUpdate { matrix?: Mat; vector?: Vec; ops?: MatrixSessionOp[]; }
+export interface MatrixSessionResult {
+  seq: number | null;
+  coalesced: number;
+  apply?: Vec;
+  eig?: EigenResponse;
+}
+export interface MatrixSessionError {
+  seq: number | null;
+  status: number;
+  detail: string;
+  retryAfter?: number;
 }
 
 export function isFiniteNumber(x: unknown): x is number {
@@ -21,6 +96,13 @@ export function isVec(x: unknown): x is Vec {
 export function isMat(x: unknown): x is Mat {
   return Array.isArray(x) && x.every(r => Array.isArray(r) && r.every(isFiniteNumber));
 }
+export function isSparseMatrix(x: unknown): x is SparseMatrix {
+  const m = x as SparseMatrix | null;
+  return (
+    typeof m === "object" && m !== null && (m.format === "coo" || m.format === "csr") &&
+    Array.isArray(m.shape) && m.shape.length === 2 && isVec(m.data)
+  );
+}
 export function isNonNegativeInt(x: unknown): x is number {
   return typeof x === "number" && Number.isInteger(x) && x >= 0;
 }